@@ -0,0 +1,35 @@
+import sys
+
+# Machine code for the per-frame kernels. MicroPython compiles functions
+# decorated @micropython.native (or @micropython.viper) to machine code. Its
+# compiler takes the decorators, so they are written out in full, and a
+# module using them fails to compile on a port without a native emitter.
+# Kernels come in two modules - the same functions with and without the
+# decorators - and load_kernels() picks the native one where it compiles:
+#   kernels = load_kernels("games.duel.kernels_native", "games.duel.kernels_python")
+# The native module imports micropython from here - off MicroPython the
+# decorators leave the functions as they are
+MICROPYTHON = sys.implementation.name == "micropython"
+
+if MICROPYTHON:
+    import micropython
+else:
+
+    class micropython:
+        @staticmethod
+        def native(func):
+            return func
+
+        @staticmethod
+        def viper(func):
+            return func
+
+
+def load_kernels(native_name: str, python_name: str):
+    if MICROPYTHON:
+        try:
+            return __import__(native_name, None, None, ["*"])
+        except SyntaxError as e:
+            # Built without the native emitter
+            print("native kernels unavailable:", e)
+    return __import__(python_name, None, None, ["*"])
@@ -0,0 +1,133 @@
+try:
+    # MicroPython
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+if hasattr(asyncio, "sleep_ms"):
+    sleep_ms = asyncio.sleep_ms
+else:
+
+    def sleep_ms(ms):
+        return asyncio.sleep(ms / 1000)
+
+
+class AsyncGameLoop:
+    # Runs a game as concurrent (u)asyncio tasks instead of one loop - the
+    # logic task runs the frames, the display task flushes them while the
+    # logic waits for its next frame and backends add their own input and
+    # audio tasks. Games are unchanged: display.show() only hands the frame
+    # over to the display task
+    def __init__(self, logic, display, time, fps: int, profiler=None) -> None:
+        self.logic = logic
+        self.display = display
+        self.time = time
+        self.frame_ms = 1000 // fps
+        self.profiler = profiler
+        # Put back once the loop is done - see restore_display()
+        self.flush_display = display.show
+        self.send_bands = display.show_bands
+        self.start_scroll = display.scroll
+        display.show = self.request_show
+        # Frames are flushed whole - partial updates are too
+        display.show_bands = self.request_show_bands
+        display.scroll = self.request_scroll
+        self.frame_ready = asyncio.Event()
+        # Cleared to drop a flush under way - see flush_now()
+        self.flushing = False
+        self.running = False
+        # Frames replaced by a newer one before the display task got to them
+        self.dropped_frames = 0
+
+    def request_show(self):
+        if self.frame_ready.is_set():
+            self.dropped_frames += 1
+        self.frame_ready.set()
+
+    def request_show_bands(self, dirty_x0, dirty_x1):
+        self.request_show()
+
+    def request_scroll(self, *args):
+        # Hardware scrolling moves the display memory - the frame it starts
+        # from has to be sent whole first
+        self.flush_now()
+        return self.start_scroll(*args)
+
+    def flush_now(self):
+        # Sends the latest frame right away. A stepped flush under way stops
+        # at its next step - it would carry on over what comes next
+        if self.frame_ready.is_set() or self.flushing:
+            self.frame_ready.clear()
+            self.flushing = False
+            self.flush_display()
+
+    async def flush_frame(self):
+        # Runs while the logic waits, so the frame buffer holds the latest
+        # whole frame. Backends flushing in steps (yielding) copy it first -
+        # the logic may draw the next frame in between
+        self.flush_display()
+
+    async def logic_task(self):
+        time = self.time
+        logic = self.logic
+        profiler = self.profiler
+        if profiler is not None:
+            # When the next frame is due - how late the other tasks let it
+            # start is the loop's jitter
+            due_us = time.ticks_us()
+        while self.running:
+            frame_start_ms = time.ticks_ms()
+            if profiler is not None:
+                profiler.frame_started(time.ticks_diff(time.ticks_us(), due_us))
+            logic.run_frame()
+            if profiler is not None:
+                # The flush's allocations land in the next frame's count
+                profiler.frame_done(logic.phase)
+            if logic.exit_requested:
+                # Back to the launcher - the other tasks stop with the loop
+                self.running = False
+                return
+            wait_ms = self.frame_ms - time.ticks_diff(time.ticks_ms(), frame_start_ms)
+            wait_ms = max(wait_ms, logic.idle_ms())
+            if profiler is not None and wait_ms > 0:
+                collect_start_ms = time.ticks_ms()
+                if profiler.collect_if_idle(logic, wait_ms * 1000):
+                    # Collected in the wait - what is left of it
+                    wait_ms -= time.ticks_diff(time.ticks_ms(), collect_start_ms)
+            wait_ms = max(0, wait_ms)
+            if profiler is not None:
+                due_us = time.ticks_add(time.ticks_us(), wait_ms * 1000)
+            # Always yield - a late frame still lets the other tasks run
+            await sleep_ms(wait_ms)
+
+    async def display_task(self):
+        while self.running:
+            await self.frame_ready.wait()
+            self.frame_ready.clear()
+            self.flushing = True
+            await self.flush_frame()
+            self.flushing = False
+
+    async def main(self, tasks):
+        self.running = True
+        background = [asyncio.create_task(self.display_task())]
+        for task in tasks:
+            background.append(asyncio.create_task(task))
+        # The game runs until a task clears running or the game exits
+        try:
+            await self.logic_task()
+        finally:
+            self.running = False
+            for task in background:
+                task.cancel()
+            self.restore_display()
+
+    def restore_display(self):
+        # The next loop on the display takes over from the originals
+        display = self.display
+        display.show = self.flush_display
+        display.show_bands = self.send_bands
+        display.scroll = self.start_scroll
+
+    def run(self, *tasks):
+        asyncio.run(self.main(tasks))
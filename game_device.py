@@ -1,5 +1,9 @@
 b_whitespace = b"\x20\x09\x0a\x0b\x0c\x0d"
 
+# GameDisplay.scroll directions
+SCROLL_RIGHT = 0
+SCROLL_LEFT = 1
+
 
 def load_sprite_bytes(filename: str) -> bytearray:
     with open(filename, "rb", buffering=0) as f:
@@ -99,12 +103,56 @@ def flip_sprite_bytes(
 
 
 class GameDisplay:
+    # Static background layer - a game draws its unchanging chrome once,
+    # saves it, and starts later frames with a single copy of it:
+    #   if not display.draw_background(BACKGROUND_MENU):
+    #       display.fill(0)
+    #       ...draw the chrome...
+    #       display.save_background(BACKGROUND_MENU)
+    # One background is kept - saving another key replaces it, and
+    # clear_background() drops it when its chrome changes
+    def save_background(self, key: int):
+        pass
+
+    def draw_background(self, key: int) -> bool:
+        # False when the key's background is not saved - draw it then
+        return False
+
+    def clear_background(self):
+        pass
+
+    # Hardware scrolling - the display moves what it shows by itself, one
+    # column every `frames` display refreshes (2, 3, 4, 5, 25, 64, 128 or
+    # 256), so nothing is sent while it runs. Pages (bands of 8 rows)
+    # start_page..end_page move sideways and wrap around; a vertical_offset
+    # also rolls the whole screen up by that many rows each step. Nothing
+    # may be shown while scrolling, and the device's display memory is moved
+    # by it - show a whole frame after stop_scroll(). False when the display
+    # can't scroll - the frame shown stays still then
+    def scroll(
+        self,
+        direction: int,
+        start_page: int,
+        end_page: int,
+        frames: int = 5,
+        vertical_offset: int = 0,
+    ) -> bool:
+        return False
+
+    def stop_scroll(self):
+        pass
+
     def contrast(self, contrast: int):
         pass
 
     def show(self):
         pass
 
+    def show_bands(self, dirty_x0, dirty_x1):
+        # Sends columns dirty_x0[band]..dirty_x1[band] of each band of 8 rows
+        # (none when x0 > x1) - the rest of the screen is unchanged
+        self.show()
+
     def fill(self, col):
         pass
 
@@ -153,6 +201,10 @@ class GameTime:
     def ticks_diff(self, a, b):
         pass
 
+    def ticks_add(self, a, b):
+        # MicroPython's time.ticks_add - the mock clocks never wrap around
+        return a + b
+
     def tick(self, fps):
         pass
 
@@ -164,6 +216,10 @@ class GameButton:
     def value(self):
         pass
 
+    def changed_at_ms(self):
+        # ticks_ms of the last level change - None when not tracked
+        return None
+
 
 class GameSound:
     def __init__(self) -> None:
@@ -177,12 +233,16 @@ class GameAudio:
     def set_mute(self, mute: bool) -> None:
         pass
 
-    def play(self, sound_id, interruptable):
+    def play(self, sound_id, interruptable=True):
         pass
 
     def load_melody(self, melody):
         pass
 
+    def unload_melodies(self):
+        # Drops every loaded melody - their ids start over
+        pass
+
     def note_to_freq(self, octave: int, note_idx: int) -> int:
         if octave == 0:
             return 0
@@ -1,12 +1,134 @@
 from game_device import GameDevice
 
+# Task entries - [generator, wake at (ticks_ms), blocks game_tick]
+TASK_GEN = 0
+TASK_WAKE_AT = 1
+TASK_BLOCKING = 2
+
+# The longest an engine idles in one go - keeps it responsive to quitting
+MAX_IDLE_MS = 250
+
+
+def sleep(ms: int):
+    # What a task yields to be resumed after ms - yielding None resumes it
+    # on the next frame. A plain int, so waiting allocates nothing
+    return ms
+
+
+def call_later_task(ms: int, callback):
+    yield sleep(ms)
+    callback()
+
 
 class BaseGameLogic:
+    # Games implement load() and game_tick(). Engines call run_frame() once
+    # per frame, which first resumes the due tasks - generators yielding
+    # sleep(ms) - and then calls game_tick() unless a blocking task is
+    # running, so a game can wait without a "waiting" state of its own:
+    #   def show_message(self, text):
+    #       self.device.display.text(text, 0, 0, 1)
+    #       self.device.display.show()
+    #       yield sleep(1000)
+    #       self.state = STATE_MENU
+    #   self.start_task(self.show_message("CORRECT"))
     def __init__(self, device: GameDevice) -> None:
         self.device = device
+        self.tasks = []
+        self.blocking_tasks = 0
+        # Engines return from run() once set - back to the launcher
+        self.exit_requested = False
+        # Holding the button this long exits - set by the launcher, 0 never.
+        # Not while the phase is "play", nor a press held since then
+        self.exit_hold_ms = 0
+        self.play_press_ms = None
+        # What the game is doing - the engine's memory monitor counts the
+        # allocations of each frame under it. Games name "play" the phases
+        # in which holding the button is a move
+        self.phase = "game"
 
     def load(self):
         pass
 
     def game_tick(self):
         pass
+
+    def run_frame(self):
+        if self.exit_hold_ms and self.exit_button_held():
+            self.exit_requested = True
+            return
+        if self.tasks:
+            self.run_tasks()
+        if self.blocking_tasks == 0:
+            self.game_tick()
+
+    def exit_button_held(self):
+        button = self.device.button
+        if button.value() != 0:
+            return False
+        changed_at = button.changed_at_ms()
+        if changed_at is None:
+            return False
+        if self.phase == "play":
+            # A move - and still one when held past the phase's end
+            self.play_press_ms = changed_at
+            return False
+        if changed_at == self.play_press_ms:
+            return False
+        time = self.device.time
+        return time.ticks_diff(time.ticks_ms(), changed_at) >= self.exit_hold_ms
+
+    def start_task(self, gen, blocking: bool = True):
+        # Runs the task up to its first yield right away. A blocking task
+        # pauses game_tick() until it returns
+        task = [gen, 0, blocking]
+        if blocking:
+            self.blocking_tasks += 1
+        self.tasks.append(task)
+        self.step_task(task, self.device.time.ticks_ms())
+
+    def call_later(self, ms: int, callback):
+        # Non blocking - game_tick() keeps running in the meantime
+        self.start_task(call_later_task(ms, callback), False)
+
+    def cancel_tasks(self):
+        self.tasks.clear()
+        self.blocking_tasks = 0
+
+    def run_tasks(self):
+        time = self.device.time
+        now = time.ticks_ms()
+        # Tasks started by a resumed task are appended - they already ran
+        # their first step, so only the ones present now are resumed
+        for task in self.tasks[:]:
+            if time.ticks_diff(now, task[TASK_WAKE_AT]) >= 0:
+                self.step_task(task, now)
+
+    def step_task(self, task, now: int):
+        try:
+            delay_ms = next(task[TASK_GEN])
+        except StopIteration:
+            # A cancelled task may have been removed already
+            if task in self.tasks:
+                self.tasks.remove(task)
+                if task[TASK_BLOCKING]:
+                    self.blocking_tasks -= 1
+            return
+        task[TASK_WAKE_AT] = self.device.time.ticks_add(now, delay_ms or 0)
+
+    def gc_allowed(self):
+        # Whether a garbage collection would go unnoticed now - engines run
+        # one in the frame's slack rather than have it land mid-action. Only
+        # while a blocking task waits by default
+        return self.blocking_tasks > 0
+
+    def idle_ms(self):
+        # How long the engine can idle before the next frame matters - only
+        # while a blocking task waits, as game_tick() polls the input
+        if self.blocking_tasks == 0:
+            return 0
+        time = self.device.time
+        now = time.ticks_ms()
+        idle_ms = MAX_IDLE_MS
+        for task in self.tasks:
+            idle_ms = min(idle_ms, time.ticks_diff(task[TASK_WAKE_AT], now))
+        return max(0, idle_ms)
@@ -1,3 +1,6 @@
+from games.duel.fixed import FP_SHIFT, FP_ONE
+from scene import Sprite, SPRITE_RECT
+
 BAR_FILL_DIRECTION_TTB = 1
 BAR_FILL_DIRECTION_BTT = -1
 
@@ -9,6 +12,7 @@ class ProgressBar:
         fill_direction: int,  # 1 with orientation -1 again
         rect,  # bounds of the bar
         show_max_line: bool = False,
+        z: int = 0,
     ):
         self.display = display
         self.fill_direction = fill_direction
@@ -21,39 +25,42 @@ class ProgressBar:
             rect_y1 if fill_direction == BAR_FILL_DIRECTION_TTB else rect_y1 + rect_h
         )
         self.show_max_line = show_max_line
+        self.view = Sprite(SPRITE_RECT, z, None, rect_w, 0)
+        self.max_line_view = Sprite(SPRITE_RECT, z, None, rect_w, 1)
         if show_max_line:
             self.set_max_height(self.max_height)
 
     def set_max_height(self, new_max_height):
         self.max_height = new_max_height
-        self.max_line_y = int(
+        self.max_line_y = (
             self.start_y + self.max_height - 1
             if self.fill_direction == BAR_FILL_DIRECTION_TTB
             else self.start_y - self.max_height + 1
         )
 
-    def draw(self, fill):
+    def add_views(self, scene):
+        scene.add(self.view)
+        scene.add(self.max_line_view)
+
+    def hide(self):
+        self.view.visible = False
+        self.max_line_view.visible = False
+
+    def update_views(self, fill):
         fill_height = fill
-        self.display.fill_rect(
+        view = self.view
+        view.h = fill_height
+        view.show_at(
             self.start_x,
             (
                 self.start_y
                 if self.fill_direction == BAR_FILL_DIRECTION_TTB
                 else self.start_y - fill_height
             ),
-            self.width,
-            fill_height,
-            1,
         )
 
         if self.show_max_line:
-            self.display.line(
-                self.start_x,
-                self.max_line_y,
-                self.start_x + self.width - 1,
-                self.max_line_y,
-                1,
-            )
+            self.max_line_view.show_at(self.start_x, self.max_line_y)
 
 
 class ChargeBar(ProgressBar):
@@ -62,22 +69,26 @@ class ChargeBar(ProgressBar):
         display,
         fill_direction: int,
         rect,
+        z: int = 0,
     ):
-        super().__init__(display, fill_direction, rect, True)
-        self.full_charge_pct = 1
+        super().__init__(display, fill_direction, rect, True, z)
+        self.full_charge_pct = FP_ONE
 
+    # Percentages are fixed point - FP_ONE is 100%
     def set_full_charge_pct(self, max_charge_pct):
         self.full_charge_pct = max_charge_pct
-        super().set_max_height(self.height * self.full_charge_pct)
+        super().set_max_height((self.height * self.full_charge_pct) >> FP_SHIFT)
 
-    def draw(self, pct):
-        super().draw(int(self.height * pct * self.full_charge_pct))
+    def update_views(self, pct):
+        super().update_views(
+            (self.height * pct * self.full_charge_pct) >> (FP_SHIFT * 2)
+        )
 
 
 class PowerBar(ProgressBar):
-    def __init__(self, display, fill_direction: int, rect, max_power: int):
+    def __init__(self, display, fill_direction: int, rect, max_power: int, z: int = 0):
         self.max_power = max_power
-        super().__init__(display, fill_direction, rect, False)
+        super().__init__(display, fill_direction, rect, False, z)
 
-    def draw(self, power):
-        super().draw(int(self.height * power / self.max_power))
+    def update_views(self, power):
+        super().update_views(self.height * power // self.max_power)
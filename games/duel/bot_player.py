@@ -1,6 +1,9 @@
-from games.duel.missile import BASE_MISSILE_SPEED, DEFAULT_MISSILE_BLAST_RADIUS
-from games.duel.player import PST_STOPPED, Player
+from games.duel.missile import DEFAULT_MISSILE_BLAST_RADIUS
+from games.duel.player import Player
 from games.duel.ufos import Ufo, UfoTypes, UFO_TYPES_COUNT
+from games.duel.targeting import TargetingSolver
+from games.duel.config import config
+from games.duel.skill import BotSkillLevels, BOT_SKILL_LEVEL_NAMES, MAX_BOT_SKILL_LEVEL
 
 _STATE_IDLE = 0
 _STATE_SHOOTING = 1
@@ -9,34 +12,6 @@ _STATE_EVADING = 2
 _MAX_IDLE_TIME_MS = 2500
 
 
-class BotSkillLevels:
-    JOKE = 0
-    EASY = 1
-    NORMAL = 2
-    HARD = 3
-    INSANE = 4
-
-
-BOT_SKILL_LEVEL_NAMES = {
-    0: "Joke",
-    1: "Easy",
-    2: "Normal",
-    3: "Hard",
-    4: "Insane",
-}
-
-MAX_BOT_SKILL_LEVEL = BotSkillLevels.INSANE
-
-_SKILL_LEVELS = [
-    # vision inaccuracy (pixel offset), response time (ms until changing to a state), ufo_perplexity (1 - none, 3 - max)
-    (10, 1200, 3),  # easy
-    (10, 500, 2),  # ok
-    (2, 300, 1),  # medium
-    (2, 200, 1),  # hard
-    (0, 0, 1),  # insane
-]
-
-
 class ComputerController:
     def __init__(
         self,
@@ -57,29 +32,22 @@ class ComputerController:
         self.state_start_time_ms = self.player.time.ticks_ms()
         self.next_state_after_response_time = None
         self.response_time_started_at = _STATE_IDLE
-        vision_inaccuracy, response_time, ufo_perplexity = _SKILL_LEVELS[level]
+        (
+            vision_inaccuracy,
+            response_time,
+            ufo_perplexity,
+            anticipation,
+        ) = config.skill_levels[level]
         self.vision_inaccuracy = vision_inaccuracy
         self.response_time = response_time
         self.base_ufo_perplexity = ufo_perplexity
         self.current_ufo_perplexity_offset = ufo_perplexity - 1
-
-    def check_on_target(self, target_x, target_y, target_velocity, precision=2):
-        self_player = self.player
-        field_width = self.field_width
-        height_to_target_y = abs(target_y - self_player.y)
-        missile_flight_time = (
-            height_to_target_y / BASE_MISSILE_SPEED  # missile travel speed
-        )
-        charge_time = self_player.charge_time_ticks
-        target_x_at_hit_time = (
-            target_x
-            + (target_velocity) * (missile_flight_time + charge_time)
-            + field_width
-            + self.vision_inaccuracy
-        ) % field_width
-        if abs(self_player.x - target_x_at_hit_time) < precision:
-            return True
-        return False
+        self.anticipation = anticipation
+        # Game ticks played - drives the cached trajectory predictions
+        self.ticks = 0
+        self.last_play_time_ms = None
+        self.response_ticks = 0
+        self.targeting = TargetingSolver(player, other_player)
 
     def update_dynamic_skills(self):
         # setup a new perplexity offset upcoming detections
@@ -97,8 +65,19 @@ class ComputerController:
             == (to_type + self.current_ufo_perplexity_offset) % UFO_TYPES_COUNT
         )
 
+    def update_response_ticks(self, current_time):
+        # Response time in ticks - based on the observed tick length
+        if self.last_play_time_ms is not None:
+            tick_ms = self.time.ticks_diff(current_time, self.last_play_time_ms)
+            if tick_ms > 0:
+                self.response_ticks = self.response_time // tick_ms
+        self.last_play_time_ms = current_time
+
     def play(self, ufos: list[Ufo]):
         current_time = self.player.time.ticks_ms()
+        self.ticks += 1
+        if self.anticipation:
+            self.update_response_ticks(current_time)
         self_player = self.player
         self_x = self_player.x
         self_half_hit_width = (
@@ -124,25 +103,25 @@ class ComputerController:
                     > _MAX_IDLE_TIME_MS
                 ):
                     next_state = _STATE_SHOOTING
-                elif self.check_on_target(
-                    other_player.x - other_player.player_width // 2,
-                    other_player.y,
-                    0 if other_player.play_state == PST_STOPPED else other_player.vx,
-                    precision=6,
-                ):
-                    next_state = _STATE_SHOOTING
                 else:
-                    for ufo in ufos:
-                        if (
-                            self.is_ufo_type(ufo.type, UfoTypes.POWER)
-                            or self.is_ufo_type(ufo.type, UfoTypes.RAPID_FIRE)
-                            or self.is_ufo_type(ufo.type, UfoTypes.SHIELD)
-                        ):
-                            if self.check_on_target(
-                                ufo.x, ufo.y, ufo.speed * ufo.direction_x
+                    targeting = self.targeting
+                    targeting.prepare_shot(self.ticks, self.response_ticks)
+                    if targeting.on_target_player(
+                        other_player, self.vision_inaccuracy, precision=6
+                    ):
+                        next_state = _STATE_SHOOTING
+                    else:
+                        for ufo in ufos:
+                            if (
+                                self.is_ufo_type(ufo.type, UfoTypes.POWER)
+                                or self.is_ufo_type(ufo.type, UfoTypes.RAPID_FIRE)
+                                or self.is_ufo_type(ufo.type, UfoTypes.SHIELD)
                             ):
-                                next_state = _STATE_SHOOTING
-                                break
+                                if targeting.on_target_ufo(
+                                    ufo, self.vision_inaccuracy, precision=2
+                                ):
+                                    next_state = _STATE_SHOOTING
+                                    break
 
             elif current_state == _STATE_SHOOTING:
                 if self_player.missile:  # after a shot - release
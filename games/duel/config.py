@@ -0,0 +1,42 @@
+# Game balance constants in one place. The game reads them through the shared
+# `config` object whenever they are used (a new round, a shot, a spawn), so
+# tools can override any of them before starting a round:
+#   config.update(ufo_spawn_chance=0.1)
+
+
+class DuelConfig:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # Charging ticks per power point until a shot is fired
+        self.charge_to_fire_wait_per_power_game_ticks = 1.2
+        # Player movement (px per tick)
+        self.player_initial_speed_px_f = 4
+        # Missile movement (px per tick) - doubled with rapid fire
+        self.base_missile_speed = 3
+        # UFO spawning
+        self.ufo_spawn_chance = 0.05  # 5%
+        self.ufo_min_time_between_spawns_ms = 4000
+        self.skill_levels = [
+            # vision inaccuracy (pixel offset), response time (ms until changing to a state), ufo_perplexity (1 - none, 3 - max)
+            # anticipation (aim for where it will be once done reacting - 0 / 1)
+            (10, 1200, 3, 0),  # easy
+            (10, 500, 2, 0),  # ok
+            (2, 300, 1, 0),  # medium
+            (2, 200, 1, 1),  # hard
+            (0, 0, 1, 1),  # insane
+        ]
+
+    def update(self, **overrides):
+        for name, value in overrides.items():
+            # Catch typos - an unknown name would silently change nothing
+            if not hasattr(self, name):
+                raise AttributeError(name)
+            setattr(self, name, value)
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+
+config = DuelConfig()
@@ -0,0 +1,21 @@
+from math import sin, pi
+
+# Fixed point helpers - values are stored as integers scaled by FP_ONE
+# so per-tick math stays integer (the ESP32 float path is slow)
+FP_SHIFT = 8
+FP_ONE = 1 << FP_SHIFT
+FP_HALF = FP_ONE >> 1
+
+
+def to_fp(value) -> int:
+    return int(round(value * FP_ONE))
+
+
+def from_fp(value: int) -> int:
+    return value >> FP_SHIFT
+
+
+# One full sine period scaled by FP_ONE. Sized FP_ONE entries so a sub-pixel
+# value divided by the period (in px) directly indexes the table
+SINE_LUT_SIZE = FP_ONE
+SINE_LUT = [to_fp(sin(i / SINE_LUT_SIZE * pi * 2)) for i in range(SINE_LUT_SIZE)]
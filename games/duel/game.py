@@ -1,8 +1,9 @@
 from math import pi, sin
 from random import random
 
-from game_device import GameDevice
+from game_device import SCROLL_LEFT, GameDevice
 from game_logic import BaseGameLogic
+from scene import Scene, Sprite, SPRITE_TEXT
 from games.duel.env import GAME_ROOT_DIR
 from games.duel.sound import (
     Sound,
@@ -12,18 +13,16 @@ from games.duel.sound import (
     CAPTURE_UFO_MELODY,
     SHOOT_MELODY,
 )
-from games.duel.ufos import Ufo, UfoTypes, get_random_ufo_type
-from games.duel.player import (
-    Player,
-    PLAYER_POSITION_TOP,
-    PLAYER_POSITION_BOTTOM,
-)
-from games.duel.bot_player import (
-    BotSkillLevels,
-    BOT_SKILL_LEVEL_NAMES,
-    MAX_BOT_SKILL_LEVEL,
-    ComputerController,
-)
+from games.duel.pool import EntityPool
+from games.duel.config import config
+from games.duel.skill import BotSkillLevels, BOT_SKILL_LEVEL_NAMES, MAX_BOT_SKILL_LEVEL
+
+# The round's modules (ships, UFOs, the bot and what they import) are
+# imported with the round's assets by import_round_modules() - the banner is
+# up before they load rather than after
+Player = PLAYER_POSITION_TOP = PLAYER_POSITION_BOTTOM = None
+Ufo = UfoTypes = get_random_ufo_type = None
+ComputerController = None
 
 
 FIELD_WIDTH = 116
@@ -36,12 +35,49 @@ GST_ROUND_PRE_RUN = 1
 GST_ROUND_RUN = 2
 GST_ROUND_ENDED = 3
 BANNER_SHOW_TIME_MS = 3500
+# Display frames per pixel the banner scrolls by (display.scroll)
+BANNER_SCROLL_FRAMES = 3
 
 GST_ROUNDED_ENDED_DELAY_MS = 1700
 
+# What the states do (logic.phase) - the memory monitor counts allocations
+# under it
+STATE_PHASES = {
+    GST_INIT: "intro",
+    GST_PRELOADER: "intro",
+    GST_DEMO_MODE: "round init",
+    GST_ROUND_INIT: "round init",
+    GST_ROUND_PRE_RUN: "intro",
+    GST_ROUND_RUN: "play",
+    GST_ROUND_ENDED: "round end",
+}
+
+# Static backgrounds (display.save_background keys)
+BACKGROUND_ROUND_INTRO = 0
+# Scene z order of the round's end messages - on top of everything
+Z_MESSAGE = 20
+
 MAX_UFOS_IN_GAME = 2
-UFO_MIN_TIME_BETWEEN_SPAWNS_MS = 4000
-UFO_SPAWN_CHANCE = 0.05  # 5%
+# In play UFOs plus one captured UFO held by each player
+UFO_POOL_SIZE = MAX_UFOS_IN_GAME + 2
+
+
+def import_round_modules():
+    global Player, PLAYER_POSITION_TOP, PLAYER_POSITION_BOTTOM
+    global Ufo, UfoTypes, get_random_ufo_type, ComputerController
+    if Player is not None:
+        return
+    from games.duel.player import Player, PLAYER_POSITION_TOP, PLAYER_POSITION_BOTTOM
+    from games.duel.ufos import Ufo, UfoTypes, get_random_ufo_type
+    from games.duel.bot_player import ComputerController
+
+
+def unload():
+    # Called by the launcher when the game exits - the sprite caches are
+    # shared by every ship and UFO, not held by the game
+    if Player is not None:
+        Player.unload_display_assets()
+        Ufo.unload_display_assets()
 
 
 class GameLogic(BaseGameLogic):
@@ -69,10 +105,23 @@ class GameLogic(BaseGameLogic):
         self.game_state = GST_INIT
         self.bot_skill_level = BotSkillLevels.JOKE
         self.demo_mode = False
+        # Pressed on the round's intro screen - see play()
+        self.start_pressed = False
+        self.ufo_pool = None
+
+        # The rounds are drawn by the scene - only what changed between frames
+        self.scene = Scene(self.device.display)
+        # Whether the screen currently shows the scene
+        self.scene_drawn = False
+        self.screen_inverted = False
+        # The banner is sent once - the display scrolls it while it shows
+        self.banner_shown = False
+        self.message_views = [Sprite(SPRITE_TEXT, Z_MESSAGE) for _ in range(2)]
 
         print("game loading done")
 
     def preload_assets(self):
+        import_round_modules()
         self.shoot_sound = Sound(
             self.device.audio, self.device.audio.load_melody(SHOOT_MELODY)
         )
@@ -86,16 +135,21 @@ class GameLogic(BaseGameLogic):
             self.device.audio, self.device.audio.load_melody(CAPTURE_UFO_MELODY)
         )
 
-        # Crate a ship and a UFO to force them to load assets
-        # for the first time
+        # Crate a ship to force it to load assets for the first time
         Player(self.device, 0, 1, 0, 1)
-        Ufo(self.device, 0, 1, 0)
-        # No need to storem them since they are not part of the game
+        # No need to store it since it is not part of the game
+
+        # UFOs are recycled across spawns and rounds - creating the pool
+        # also loads their assets for the first time
+        if self.ufo_pool is None:
+            self.ufo_pool = EntityPool(lambda: Ufo(self.device, 0, 1, 0), UFO_POOL_SIZE)
 
     def initialize_round(self):
         print("round init")
         self.round_won = False
         self.count_down_to_invert = 0
+        # UFOs from the previous round are no longer referenced
+        self.ufo_pool.release_all()
         self.bot_player = Player(
             self.device,
             self.field_start,
@@ -103,6 +157,7 @@ class GameLogic(BaseGameLogic):
             self.field_end,  # bezel
             self.device.display.width,  # bezel
             position=PLAYER_POSITION_TOP,
+            ufo_pool=self.ufo_pool,
         )
         self.human_player = Player(
             self.device,
@@ -112,6 +167,7 @@ class GameLogic(BaseGameLogic):
             self.field_start,  # bezel
             position=PLAYER_POSITION_BOTTOM,
             shoot_sound=self.shoot_sound,
+            ufo_pool=self.ufo_pool,
         )
 
         if self.demo_mode:
@@ -140,6 +196,15 @@ class GameLogic(BaseGameLogic):
         self.ufos: list[Ufo] = []
         self.last_ufo_spawn_time_ms = 0
 
+        scene = self.scene
+        scene.clear()
+        self.bot_player.add_views(scene)
+        self.human_player.add_views(scene)
+        for ufo in self.ufo_pool.entities:
+            scene.add(ufo.view)
+        for view in self.message_views:
+            scene.add(view)
+
     def spawn_ufos(self):
         curr_ufo_count = len(self.ufos)
         if curr_ufo_count < MAX_UFOS_IN_GAME:
@@ -148,25 +213,27 @@ class GameLogic(BaseGameLogic):
                 time.ticks_ms(), self.last_ufo_spawn_time_ms
             )
             if (
-                time_since_last_spawn > UFO_MIN_TIME_BETWEEN_SPAWNS_MS
+                time_since_last_spawn > config.ufo_min_time_between_spawns_ms
                 or self.last_ufo_spawn_time_ms == 0
             ):
                 # prob is exp decreasing as UFOs are spawned
-                ufo_spawn_prob = pow(UFO_SPAWN_CHANCE, curr_ufo_count + 1)
+                ufo_spawn_prob = pow(config.ufo_spawn_chance, curr_ufo_count + 1)
                 if random() < ufo_spawn_prob:  # spawn chance
                     self.last_ufo_spawn_time_ms = time.ticks_ms()
                     ufo_type = get_random_ufo_type()
                     ufo_direction = 1 if random() < 0.5 else -1
-                    self.ufos.append(
-                        Ufo(
-                            self.device,
-                            self.field_start,
-                            self.field_end,
-                            self.screen_height // 2,
-                            ufo_type,
-                            ufo_direction,
-                        )
+                    ufo = self.ufo_pool.acquire()
+                    if ufo.view not in self.scene.sprites:
+                        # The pool grew this round
+                        self.scene.add(ufo.view)
+                    ufo.reset(
+                        self.field_start,
+                        self.field_end,
+                        self.screen_height // 2,
+                        ufo_type,
+                        ufo_direction,
                     )
+                    self.ufos.append(ufo)
 
     def play(self):
         time = self.device.time
@@ -184,10 +251,15 @@ class GameLogic(BaseGameLogic):
 
         elif curr_state == GST_ROUND_INIT:
             self.demo_mode = False
+            self.start_pressed = False
             next_state = GST_ROUND_PRE_RUN
 
         elif curr_state == GST_ROUND_PRE_RUN:
+            # Started once the press is released - holding it here exits
+            # the game instead (BaseGameLogic.exit_hold_ms)
             if button_pressed:
+                self.start_pressed = True
+            elif self.start_pressed:
                 next_state = GST_ROUND_RUN
             elif time.ticks_diff(now, self.game_state_start) > 15000:
                 next_state = GST_DEMO_MODE
@@ -217,6 +289,7 @@ class GameLogic(BaseGameLogic):
         if next_state != curr_state:
             self.game_state_start = now
             self.game_state = curr_state = next_state
+            self.phase = STATE_PHASES[curr_state]
 
         # Act
         if curr_state == GST_PRELOADER:
@@ -226,6 +299,8 @@ class GameLogic(BaseGameLogic):
         elif curr_state == GST_ROUND_INIT:
             self.preload_assets()
             self.initialize_round()
+            # The intro screen shows the new level
+            self.device.display.clear_background()
 
         elif curr_state == GST_ROUND_ENDED:
             if self.demo_mode:
@@ -272,66 +347,141 @@ class GameLogic(BaseGameLogic):
                         ufo.dead = True
 
             # Remove captured/dead UFOs - managed by players moving fwd if captured
-            self.ufos = [
-                ufo for ufo in self.ufos if not ufo.is_cpatured() and not ufo.dead
-            ]
+            # Compact in place (swap with last) - order of live UFOs does not matter
+            ufos = self.ufos
+            i = 0
+            while i < len(ufos):
+                ufo = ufos[i]
+                if ufo.is_cpatured() or ufo.dead:
+                    if not ufo.is_cpatured():
+                        self.ufo_pool.release(ufo)
+                    ufos[i] = ufos[-1]
+                    ufos.pop()
+                else:
+                    i += 1
+
+    def gc_allowed(self):
+        # The end of round delay and the intro wait on the player - unlike
+        # a round, a collection there goes unnoticed
+        return (
+            self.game_state == GST_ROUND_ENDED or self.game_state == GST_ROUND_PRE_RUN
+        )
 
     def draw(self):
         time = self.device.time
         display = self.device.display
 
-        # Set default contrast
-        display.contrast(255)
-
         if self.game_state == GST_PRELOADER or self.game_state == GST_ROUND_INIT:
             # Only show the banner on the first round
-            if self.bot_skill_level == BotSkillLevels.JOKE:
-                display.blit(self.banner_sprite.buffer, 0, 0)
+            show_banner = self.bot_skill_level == BotSkillLevels.JOKE
         elif self.game_state == GST_ROUND_PRE_RUN:
             time_since_banner_shown = time.ticks_diff(
                 time.ticks_ms(), self.banner_splash_start_time_ms
             )
-            if time_since_banner_shown < BANNER_SHOW_TIME_MS:
-                display.blit(self.banner_sprite.buffer, 0, 0)
-                pass
-            else:
+            show_banner = time_since_banner_shown < BANNER_SHOW_TIME_MS
+        else:
+            show_banner = False
+        if show_banner:
+            self.draw_banner()
+            return
+        if self.banner_shown:
+            self.banner_shown = False
+            display.stop_scroll()
+
+        # Set default contrast
+        display.contrast(255)
+
+        if self.game_state == GST_ROUND_PRE_RUN:
+            if not display.draw_background(BACKGROUND_ROUND_INTRO):
                 display.fill(0)
                 display.center_text(
-                    f"Level: {BOT_SKILL_LEVEL_NAMES[self.bot_skill_level]}", None, 20, 1
+                    f"Level: {BOT_SKILL_LEVEL_NAMES[self.bot_skill_level]}",
+                    None,
+                    20,
+                    1,
                 )
                 display.center_text("Press Start", None, 32, 1)
-                display.contrast(135 + int(sin(time.ticks_ms() / 500 * pi) * 12) * 10)
-        else:
-            display.fill(0)
-            self.bot_player.draw()
-            self.human_player.draw()
+                display.save_background(BACKGROUND_ROUND_INTRO)
+            display.contrast(135 + int(sin(time.ticks_ms() / 500 * pi) * 12) * 10)
+        elif self.game_state != GST_PRELOADER and self.game_state != GST_ROUND_INIT:
+            self.draw_scene()
+            return
 
-            if self.game_state == GST_ROUND_ENDED:
-                if not self.demo_mode:
-                    if self.round_won:
-                        display.center_text("Victory!", None, 20, 1)
-                        display.center_text("Next Up...", None, 32, 1)
-                    else:
-                        display.center_text("Boooo", None, None, 1)
-            else:
-                # move UFOs
-                for ufo in self.ufos:
-                    if ufo:
-                        ufo.draw()
-
-            if self.count_down_to_invert > 0:
-                if self.game_state == GST_ROUND_ENDED:
-                    self.count_down_to_invert = 0
-                    display.invert(0)
-                else:
-                    display.invert(1)
-                    self.count_down_to_invert -= 1
-                    if self.count_down_to_invert == 0:
-                        display.invert(0)
+        self.scene_drawn = False
+        display.show()
 
+    def draw_banner(self):
+        if self.banner_shown:
+            return
+        self.banner_shown = True
+        display = self.device.display
+        display.contrast(255)
+        display.blit(self.banner_sprite.buffer, 0, 0)
         display.show()
+        self.scene_drawn = False
+        # The display moves it by itself from here on - nothing is sent
+        # while it shows
+        display.scroll(
+            SCROLL_LEFT, 0, self.screen_height // 8 - 1, BANNER_SCROLL_FRAMES
+        )
 
-    def hit_player(self, shooter: Player, target: Player):
+    def draw_scene(self):
+        scene = self.scene
+        if not self.scene_drawn:
+            # The screen was drawn outside the scene
+            scene.invalidate()
+            self.scene_drawn = True
+
+        # Free UFOs show up again below - captured ones with their captor
+        for ufo in self.ufo_pool.entities:
+            ufo.view.visible = False
+        self.bot_player.update_views()
+        self.human_player.update_views()
+
+        message_views = self.message_views
+        for view in message_views:
+            view.visible = False
+        if self.game_state == GST_ROUND_ENDED:
+            if not self.demo_mode:
+                if self.round_won:
+                    self.show_message(0, "Victory!", 20)
+                    self.show_message(1, "Next Up...", 32)
+                else:
+                    self.show_message(0, "Boooo", None)
+        else:
+            for ufo in self.ufos:
+                if ufo:
+                    ufo.update_view()
+
+        if self.count_down_to_invert > 0:
+            if self.game_state == GST_ROUND_ENDED:
+                self.count_down_to_invert = 0
+                self.set_inverted(False)
+            else:
+                self.set_inverted(True)
+                self.count_down_to_invert -= 1
+                if self.count_down_to_invert == 0:
+                    self.set_inverted(False)
+
+        # Shows the changed parts of the screen - nothing when nothing changed
+        scene.render()
+
+    def show_message(self, line: int, text: str, y: int):
+        # Centered like display.center_text
+        view = self.message_views[line]
+        view.set_text(text)
+        if y is None:
+            y = (self.screen_height - 8) // 2
+        view.show_at((self.screen_width - view.w) // 2, y)
+
+    def set_inverted(self, inverted: bool):
+        if inverted != self.screen_inverted:
+            self.screen_inverted = inverted
+            self.device.display.invert(1 if inverted else 0)
+            # The emulator applies it when showing - make sure a frame is
+            self.scene.invalidate()
+
+    def hit_player(self, shooter: "Player", target: "Player"):
         if shooter.missile:
             proj_rect = shooter.missile.get_hit_rect()
             if target.check_hit(proj_rect):
@@ -340,10 +490,10 @@ class GameLogic(BaseGameLogic):
                     self.hit_other_sound.play()
                 else:
                     self.hit_sound.play()
-                shooter.missile = None  # Can't hit again!
+                shooter.drop_missile()  # Can't hit again!
                 self.count_down_to_invert = 5
 
-    def hit_ufo(self, shooter: Player, target: Ufo):
+    def hit_ufo(self, shooter: "Player", target: "Ufo"):
         if shooter.missile and not target.is_cpatured():
             proj_rect = shooter.missile.get_hit_rect()
             if target.check_hit(proj_rect):
@@ -361,7 +511,7 @@ class GameLogic(BaseGameLogic):
                     shooter.capture_ufo(target)
                     self.capture_ufo_sound.play()
 
-                shooter.missile = None  # Can't hit again!
+                shooter.drop_missile()  # Can't hit again!
 
     def game_tick(self):
         self.play()
@@ -0,0 +1,8 @@
+# duel's per-frame kernels - machine code where MicroPython compiles it, the
+# same functions as plain Python otherwise (see accel.py)
+from accel import load_kernels
+
+kernels = load_kernels("games.duel.kernels_native", "games.duel.kernels_python")
+ufo_move = kernels.ufo_move
+ufo_check_hit = kernels.ufo_check_hit
+rect_hit = kernels.rect_hit
@@ -0,0 +1,44 @@
+# duel's per-frame kernels as plain Python - what runs where the native ones
+# of kernels_native.py can't be compiled (see accel.py). The two are the
+# same functions, tools/bench_kernels.py checks they agree
+from games.duel.fixed import FP_SHIFT, FP_HALF, SINE_LUT, SINE_LUT_SIZE
+
+
+def ufo_move(ufo):
+    # Ufo.move
+    if ufo.captured:
+        time = ufo.time
+        capture_time_ms = time.ticks_diff(time.ticks_ms(), ufo.captured_at_ticks_ms)
+        if capture_time_ms > ufo.time_to_live_ms:
+            ufo.dead = True
+    elif not ufo.dead:
+        fx = ufo.fx + ufo.fvx
+        ufo.fx = fx
+        ufo.x = fx >> FP_SHIFT
+
+        # Add a wobble effect around main trajectory
+        wobble = SINE_LUT[(fx // ufo.wobble_period) % SINE_LUT_SIZE]
+        ufo.y = ufo.base_y + ((ufo.wobble_amplitude * wobble + FP_HALF) >> FP_SHIFT)
+
+
+def ufo_check_hit(ufo, hit_rect):
+    # Ufo.check_hit
+    if not ufo.dead:
+        x1, y1, x2, y2 = hit_rect
+        ufo_y1 = ufo.y
+        # Why the ugly nested if? To save on calcs
+        if y2 >= ufo_y1:
+            ufo_y2 = ufo_y1 + ufo.height
+            if y1 <= ufo_y2:
+                ufo_x = ufo.x
+                half_w = ufo.half_w
+                if x2 >= ufo_x - half_w:
+                    if x1 <= ufo_x + half_w:
+                        return True
+    return False
+
+
+def rect_hit(x1, y1, x2, y2, hit_rect):
+    # Whether the rects overlap - edges included
+    hit_x1, hit_y1, hit_x2, hit_y2 = hit_rect
+    return hit_y2 >= y1 and hit_y1 <= y2 and hit_x2 >= x1 and hit_x1 <= x2
@@ -1,37 +1,66 @@
+from games.duel.fixed import FP_SHIFT, to_fp
+from games.duel.config import config
+
 DEFAULT_MISSILE_BLAST_RADIUS = 2
-BASE_MISSILE_SPEED = 3
 
 
 class Missile:
+    __slots__ = (
+        "display",
+        "x",
+        "y",
+        "fy",
+        "fvy",
+        "direction_y",
+        "speed",
+        "blast_radius",
+        "hit_rect",
+        "in_pool",
+    )
+
     def __init__(
         self,
         display,
+        x=0,
+        y=0,
+        direction_y=0,
+        speed=None,
+        blast_radius=DEFAULT_MISSILE_BLAST_RADIUS,
+    ):
+        self.display = display
+        # Reused on every hit test rather than allocating a new tuple per tick
+        self.hit_rect = [0, 0, 0, 0]
+        self.in_pool = False
+        self.reset(x, y, direction_y, speed, blast_radius)
+
+    def reset(
+        self,
         x,
         y,
         direction_y,
-        speed=BASE_MISSILE_SPEED,
+        speed=None,
         blast_radius=DEFAULT_MISSILE_BLAST_RADIUS,
     ):
-        self.display = display
         self.x = x
         self.y = y
         self.direction_y = direction_y
+        if speed is None:
+            speed = config.base_missile_speed
         self.speed = speed
         self.blast_radius = blast_radius
+        # Sub-pixel vertical position and velocity - y is the whole pixel
+        self.fy = y << FP_SHIFT
+        self.fvy = to_fp(speed) * direction_y
 
     def move(self):
-        if self.direction_y != 0:
-            self.y += self.direction_y * self.speed
-
-    def draw(self):
-        base_x = int(self.x)
-        base_y = int(self.y)
-        self.display.line(base_x - 1, base_y, base_x, base_y, 1)
+        if self.fvy != 0:
+            self.fy += self.fvy
+            self.y = self.fy >> FP_SHIFT
 
     def get_hit_rect(self):
-        return (
-            self.x - self.blast_radius,
-            self.y - self.blast_radius,
-            self.x + self.blast_radius,
-            self.y + self.blast_radius,
-        )
+        hit_rect = self.hit_rect
+        hit_rect[0] = self.x - self.blast_radius
+        hit_rect[1] = self.y - self.blast_radius
+        hit_rect[2] = self.x + self.blast_radius
+        hit_rect[3] = self.y + self.blast_radius
+        return hit_rect
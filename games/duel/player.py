@@ -1,6 +1,6 @@
 from games.duel.env import GAME_ROOT_DIR
 from games.duel.sound import Sound
-from games.duel.missile import BASE_MISSILE_SPEED, Missile
+from games.duel.missile import Missile
 from game_device import GameDevice, GameDisplayAsset
 from games.duel.bars import (
     ChargeBar,
@@ -9,6 +9,11 @@ from games.duel.bars import (
     BAR_FILL_DIRECTION_TTB,
 )
 from games.duel.ufos import Ufo, UfoTypes
+from games.duel.pool import EntityPool
+from games.duel.fixed import FP_SHIFT, FP_ONE, to_fp
+from games.duel.kernels import rect_hit
+from games.duel.config import config
+from scene import Sprite, SPRITE_BLIT, SPRITE_RECT
 
 PLAYER_POSITION_TOP = 0
 PLAYER_POSITION_BOTTOM = 1
@@ -20,8 +25,6 @@ PST_CHARGING = 2
 PST_FIRING = 3
 PST_EXPLODED = 4
 
-CHARGE_TO_FIRE_WAIT_PER_POWER_GAME_TICKS = 1.2
-PLAYER_INITIAL_SPEED_PX_F = 4
 PLAYER_BASE_POWER_POINTS = 10
 PLAYER_BASE_LENGTH_PX = 40
 PLAYER_MIN_BASE_LENGTH_PX = 12
@@ -34,6 +37,12 @@ SHIP_SPRITE_WING_EXT = 3
 SHIP_SPRITES_TTB = []
 SHIP_SPRITES_BTT = []
 
+# Scene z order - captured UFOs (ufos.Z_UFO) draw on top
+Z_BARS = 0
+Z_SHIP = 1
+Z_SHIELD = 2
+Z_MISSILE = 3
+
 
 class Player:
     def __init__(
@@ -45,8 +54,9 @@ class Player:
         bezel_end: int,
         power_points: int = PLAYER_BASE_POWER_POINTS,
         position: int = PLAYER_POSITION_TOP,
-        initialSpeed: int = PLAYER_INITIAL_SPEED_PX_F,
+        initialSpeed: int = None,
         shoot_sound: Sound = None,
+        ufo_pool: EntityPool = None,
     ):
         # Game access
         self.device = device
@@ -69,6 +79,8 @@ class Player:
         self.position = position
         self.direction = 1 - self.position * 2  # 1 or -1
         self.x = self.field_width // 2
+        # Sub-pixel position - x is the whole pixel derived from it
+        self.fx = self.x << FP_SHIFT
         self.y = 0 if position == PLAYER_POSITION_TOP else self.display.height - 1
 
         # State initialization
@@ -78,10 +90,16 @@ class Player:
         self.power_points = power_points
         self.state_ticks = 0
 
-        # players go in diff directions initially
-        self.vx = initialSpeed * self.direction
+        # players go in diff directions initially (sub-pixel per tick)
+        if initialSpeed is None:
+            initialSpeed = config.player_initial_speed_px_f
+        self.fvx = to_fp(initialSpeed) * self.direction
         self.missile = None
+        # Only a single missile can be in flight - recycle it shot after shot
+        self.missile_pool = EntityPool(lambda: Missile(self.display), 1)
         self.ufo: Ufo = None
+        # Captured UFOs are returned here once released
+        self.ufo_pool = ufo_pool
         self.charge_pct = 0
 
         # Display assets setup
@@ -115,14 +133,21 @@ class Player:
             self.display,
             bar_direction,
             bar_rect,
+            Z_BARS,
         )
         self.power_bar = PowerBar(
             self.display,
             bar_direction,
             bar_rect,
             power_points,
+            Z_BARS,
         )
 
+        # Scene views - updated every frame by update_views
+        self.ship_view = Sprite(SPRITE_BLIT, Z_SHIP)
+        self.shield_view = Sprite(SPRITE_RECT, Z_SHIELD, None, 0, 1)
+        self.missile_view = Sprite(SPRITE_RECT, Z_MISSILE, None, 2, 1)
+
         self.ufo_prison_start_x = self.bezel_start
         self.ufo_prison_end_x = self.bezel_end
         self.ufo_prison_start_y = bar_height if position == PLAYER_POSITION_TOP else 0
@@ -132,6 +157,12 @@ class Player:
 
         self.update_power(0)
 
+    @staticmethod
+    def unload_display_assets():
+        # Loaded again by the next ship
+        SHIP_SPRITES_TTB.clear()
+        SHIP_SPRITES_BTT.clear()
+
     def load_display_assets(self):
         global SHIP_SPRITES_TTB
         global SHIP_SPRITES_BTT
@@ -185,7 +216,7 @@ class Player:
         right_wingtip_sprite = self.ship_wingtip_right_sprite
         wing_ext_sprite = self.ship_wing_ext_sprite
 
-        target_w = int(self.player_width)
+        target_w = self.player_width
         middle_w = target_w // 2
         target_h = self.ship_hull_sprite.h
         full_ship_buffer = display.get_buffer(
@@ -257,11 +288,14 @@ class Player:
                         next_state = PST_CHARGING
                 elif curr_state == PST_CHARGING:
                     next_state = PST_CHARGING
-                    charge_time = self.charge_time_ticks
+                    charge_time = self.charge_time_fp
                     if self.has_ufo_type(UfoTypes.RAPID_FIRE):
-                        charge_time = self.charge_time_ticks / 3
-                    self.charge_pct = self.state_ticks / float(charge_time)
-                    if self.charge_pct >= 1:
+                        charge_time = self.charge_time_fp // 3
+                    # Fixed point percentage - FP_ONE is fully charged
+                    self.charge_pct = (
+                        self.state_ticks << (FP_SHIFT * 2)
+                    ) // charge_time
+                    if self.charge_pct >= FP_ONE:
                         next_state = PST_FIRING
         else:
             self.moved_after_shot = True
@@ -277,17 +311,19 @@ class Player:
                 self.shoot_sound.play()
 
             self.moved_after_shot = False
-            self.missile = Missile(
-                self.display,
+            self.drop_missile()
+            missile = self.missile_pool.acquire()
+            missile.reset(
                 self.x,
                 self.y,
                 direction_y=self.direction,
                 speed=(
-                    BASE_MISSILE_SPEED * 2
+                    config.base_missile_speed * 2
                     if self.has_ufo_type(UfoTypes.RAPID_FIRE)
-                    else BASE_MISSILE_SPEED
+                    else config.base_missile_speed
                 ),
             )
+            self.missile = missile
 
         # Keep only live captured UFOs
         if self.ufo is not None and self.ufo.dead:
@@ -303,27 +339,21 @@ class Player:
         if self.has_ufo_type(UfoTypes.SHIELD):
             return False
 
-        x1, y1, x2, y2 = hit_rect
-        player_y1 = (
-            self.y
-            if self.position == PLAYER_POSITION_TOP
-            else self.y - self.player_height
+        y = self.y
+        if self.position == PLAYER_POSITION_TOP:
+            player_y1 = y
+            player_y2 = y + self.player_height
+        else:
+            player_y1 = y - self.player_height
+            player_y2 = y
+        player_half_width = self.player_width // 2
+        return rect_hit(
+            self.x - player_half_width,
+            player_y1,
+            self.x + player_half_width,
+            player_y2,
+            hit_rect,
         )
-        # Why the ugly nested if? To save on calcs
-        if y2 >= player_y1:
-            player_y2 = (
-                self.y + self.player_height
-                if self.position == PLAYER_POSITION_TOP
-                else self.y
-            )
-            if y1 <= player_y2:
-                player_half_width = self.player_width // 2
-                player_x1 = self.x - player_half_width
-                if x2 >= player_x1:
-                    player_x2 = self.x + player_half_width
-                    if x1 <= player_x2:
-                        return True
-        return False
 
     def check_exploded(self):
         return self.play_state == PST_EXPLODED
@@ -332,14 +362,14 @@ class Player:
         self.power_points += power_diff
         self.player_width = max(
             PLAYER_MIN_BASE_LENGTH_PX,
-            PLAYER_BASE_LENGTH_PX * (self.power_points / PLAYER_BASE_POWER_POINTS),
+            PLAYER_BASE_LENGTH_PX * self.power_points // PLAYER_BASE_POWER_POINTS,
         )
         self.player_height = self.ship_hull_sprite.h
-        self.charge_time_ticks = (
-            self.power_points * CHARGE_TO_FIRE_WAIT_PER_POWER_GAME_TICKS
+        self.charge_time_fp = self.power_points * to_fp(
+            config.charge_to_fire_wait_per_power_game_ticks
         )
         self.charge_bar.set_full_charge_pct(
-            self.power_points / PLAYER_BASE_POWER_POINTS
+            (self.power_points << FP_SHIFT) // PLAYER_BASE_POWER_POINTS
         )
         self.build_ship_display_asset()
 
@@ -354,12 +384,19 @@ class Player:
             self.ufo = ufo
 
     def release_ufo(self):
+        if self.ufo is not None and self.ufo_pool is not None:
+            self.ufo_pool.release(self.ufo)
         self.ufo = None
 
+    def drop_missile(self):
+        if self.missile:
+            self.missile_pool.release(self.missile)
+            self.missile = None
+
     def move(self):
         player_half_width = self.player_width // 2
-        limit_x_start = self.field_start + player_half_width
-        limit_x_end = self.field_end - player_half_width
+        limit_fx_start = (self.field_start + player_half_width) << FP_SHIFT
+        limit_fx_end = (self.field_end - player_half_width) << FP_SHIFT
         height = self.display.height
         curr_state = self.play_state
 
@@ -368,56 +405,70 @@ class Player:
 
         if curr_state == PST_DEFENSIVE:
             # Normal defensive movement logic
-            speed = self.vx
+            speed = self.fvx
             if self.has_ufo_type(UfoTypes.SLOW):
-                speed = speed * 0.25
-            self.x += speed
-            if self.x <= limit_x_start:
-                self.x = limit_x_start
-                self.vx *= -1
-            elif self.x >= limit_x_end:
-                self.x = limit_x_end
-                self.vx *= -1
+                speed = speed >> 2  # quarter speed
+            self.fx += speed
+            if self.fx <= limit_fx_start:
+                self.fx = limit_fx_start
+                self.fvx = -self.fvx
+            elif self.fx >= limit_fx_end:
+                self.fx = limit_fx_end
+                self.fvx = -self.fvx
+            self.x = self.fx >> FP_SHIFT
 
         # Move projectile if it exists
         if self.missile:
             self.missile.move()
             if self.missile.y <= 0 or self.missile.y >= height:
-                self.missile = None  # Remove projectile when it leaves the screen
+                self.drop_missile()  # Remove projectile when it leaves the screen
 
         # Move any captured UFO
         if self.ufo:
             self.ufo.move()
 
-    def draw(self):
+    def add_views(self, scene):
+        scene.add(self.ship_view)
+        scene.add(self.shield_view)
+        scene.add(self.missile_view)
+        self.charge_bar.add_views(scene)
+        self.power_bar.add_views(scene)
+
+    def update_views(self):
         curr_state = self.play_state
-        display = self.display
+        ship_view = self.ship_view
+        shield_view = self.shield_view
 
         # player bar
         if curr_state != PST_EXPLODED:
             ship_sprite = self.ship_sprite
             ship_helf_width = ship_sprite.w // 2
             dh = ship_sprite.h
-            draw_y = (
-                self.y if self.position == PLAYER_POSITION_TOP else int(self.y) - dh + 1
-            )
-            draw_start_x = int(self.x) - ship_helf_width
-            display.blit(ship_sprite.buffer, draw_start_x, draw_y)
+            draw_y = self.y if self.position == PLAYER_POSITION_TOP else self.y - dh + 1
+            draw_start_x = self.x - ship_helf_width
+            ship_view.set_asset(ship_sprite)
+            ship_view.show_at(draw_start_x, draw_y)
             if self.has_ufo_type(UfoTypes.SHIELD):
                 shield_y = (
                     dh + 2 if self.position == PLAYER_POSITION_TOP else draw_y - 2
                 )
-                display.line(
-                    draw_start_x, shield_y, draw_start_x + ship_sprite.w, shield_y, 1
-                )
+                shield_view.w = ship_sprite.w + 1
+                shield_view.show_at(draw_start_x, shield_y)
+            else:
+                shield_view.visible = False
+        else:
+            ship_view.visible = False
+            shield_view.visible = False
 
-        # Draw the missile
+        # The missile
         if self.missile:
-            self.missile.draw()
+            self.missile_view.show_at(self.missile.x - 1, self.missile.y)
+        else:
+            self.missile_view.visible = False
 
-        # Draw any cpatured ufos
+        # Any cpatured ufo
         if self.ufo:
-            self.ufo.draw(
+            self.ufo.update_view(
                 self.ufo_prison_start_x,
                 self.ufo_prison_start_y,
                 self.ufo_prison_end_x,
@@ -425,8 +476,10 @@ class Player:
             )
 
         if curr_state == PST_CHARGING:
-            # Draw Charging progress
-            self.charge_bar.draw(self.charge_pct)
+            # Charging progress
+            self.power_bar.hide()
+            self.charge_bar.update_views(self.charge_pct)
         else:
-            # Draw power
-            self.power_bar.draw(self.power_points)
+            # Power
+            self.charge_bar.hide()
+            self.power_bar.update_views(self.power_points)
@@ -0,0 +1,39 @@
+class EntityPool:
+    # Keeps a fixed set of entities around and recycles them instead of
+    # allocating new ones during play - allocation churn triggers GC pauses
+    # on the device which show up as frame hitches
+    def __init__(self, factory, capacity: int):
+        self.factory = factory
+        self.entities = []
+        self.free = []
+        # Entities created after the initial fill - should stay 0 in steady state
+        self.allocations = 0
+        for _ in range(capacity):
+            self.free.append(self.create())
+
+    def create(self):
+        entity = self.factory()
+        entity.in_pool = True
+        self.entities.append(entity)
+        return entity
+
+    def acquire(self):
+        if len(self.free) > 0:
+            entity = self.free.pop()
+        else:
+            # Pool exhausted - grow it (once) rather than fail
+            self.allocations += 1
+            entity = self.create()
+        entity.in_pool = False
+        return entity
+
+    def release(self, entity):
+        # Guard against double release - it would hand the same entity out twice
+        if entity.in_pool:
+            return
+        entity.in_pool = True
+        self.free.append(entity)
+
+    def release_all(self):
+        for entity in self.entities:
+            self.release(entity)
@@ -0,0 +1,87 @@
+from hardware.headless.game_engine import GameEngine
+from games.duel.game import GameLogic, GST_ROUND_RUN, GST_ROUND_ENDED
+from games.duel.bot_player import BotSkillLevels, ComputerController
+from games.duel.ufos import UFO_TYPES_COUNT
+
+
+# Helpers for driving duel rounds without a human - used by the
+# headless tools (benchmarks, bot tournaments)
+def start_bot_round(
+    logic: GameLogic,
+    top_level: int = BotSkillLevels.INSANE,
+    bottom_level: int = BotSkillLevels.INSANE,
+):
+    # Skip the banner/menu states and go straight into a demo round
+    logic.preload_assets()
+    logic.demo_mode = True
+    logic.initialize_round()
+    logic.npc = ComputerController(
+        logic.field_start,
+        logic.field_end,
+        logic.bot_player,
+        logic.human_player,
+        level=top_level,
+    )
+    logic.demo_npc = ComputerController(
+        logic.field_start,
+        logic.field_end,
+        logic.human_player,
+        logic.bot_player,
+        level=bottom_level,
+    )
+    logic.game_state = GST_ROUND_RUN
+    logic.game_state_start = logic.device.time.ticks_ms()
+    logic.start_game_tick = logic.game_state_start
+
+
+def is_round_over(logic: GameLogic):
+    return logic.game_state == GST_ROUND_ENDED
+
+
+ROUND_WINNER_NONE = 0
+ROUND_WINNER_TOP = 1
+ROUND_WINNER_BOTTOM = 2
+
+
+class RecordingGameLogic(GameLogic):
+    # Counts UFOs hit by each side - per UFO type
+    def initialize_round(self):
+        super().initialize_round()
+        self.top_ufo_hits = [0] * UFO_TYPES_COUNT
+        self.bottom_ufo_hits = [0] * UFO_TYPES_COUNT
+
+    def hit_ufo(self, shooter, target):
+        had_missile = shooter.missile is not None
+        super().hit_ufo(shooter, target)
+        # A hit always consumes the missile
+        if had_missile and shooter.missile is None:
+            if shooter == self.bot_player:
+                self.top_ufo_hits[target.type] += 1
+            else:
+                self.bottom_ufo_hits[target.type] += 1
+
+
+def run_bot_round(top_level: int, bottom_level: int, max_ticks: int):
+    # Plays a single fast-forwarded round (no drawing) on a headless device.
+    # Seed `random` beforehand for a reproducible round.
+    # Returns (winner, ticks played, top UFO hits, bottom UFO hits)
+    engine = GameEngine()
+    engine.load(RecordingGameLogic)
+    logic = engine.logic
+    start_bot_round(logic, top_level, bottom_level)
+
+    ticks = 0
+    while ticks < max_ticks and not is_round_over(logic):
+        logic.play()
+        logic.move()
+        engine.time.tick(engine.fps)
+        ticks += 1
+
+    top_exploded = logic.bot_player.check_exploded()
+    bottom_exploded = logic.human_player.check_exploded()
+    winner = ROUND_WINNER_NONE
+    if top_exploded and not bottom_exploded:
+        winner = ROUND_WINNER_BOTTOM
+    elif bottom_exploded and not top_exploded:
+        winner = ROUND_WINNER_TOP
+    return (winner, ticks, logic.top_ufo_hits, logic.bottom_ufo_hits)
@@ -0,0 +1,19 @@
+# Apart from the bot itself - the game shows and counts levels before the
+# round's modules are loaded
+class BotSkillLevels:
+    JOKE = 0
+    EASY = 1
+    NORMAL = 2
+    HARD = 3
+    INSANE = 4
+
+
+BOT_SKILL_LEVEL_NAMES = {
+    0: "Joke",
+    1: "Easy",
+    2: "Normal",
+    3: "Hard",
+    4: "Insane",
+}
+
+MAX_BOT_SKILL_LEVEL = BotSkillLevels.INSANE
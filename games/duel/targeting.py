@@ -0,0 +1,157 @@
+from games.duel.fixed import FP_SHIFT, FP_ONE
+from games.duel.config import config
+from games.duel.player import PST_DEFENSIVE, Player
+from games.duel.ufos import Ufo, UfoTypes
+
+# How far ahead (in ticks) a player's trajectory is simulated
+TRAJECTORY_TABLE_SIZE = 128
+# Ticks from pressing until charging starts - stop, then start charging
+SHOT_SETUP_TICKS = 2
+
+# Flight time tables shared by all controllers - keyed by missile speed
+_FLIGHT_TICKS_TABLES = {}
+
+
+def get_flight_ticks_table(missile_speed: int, max_distance: int):
+    # Ticks for a missile to cover a vertical distance (index, in px)
+    key = (missile_speed, max_distance)
+    table = _FLIGHT_TICKS_TABLES.get(key)
+    if table is None:
+        table = [
+            (distance + missile_speed - 1) // missile_speed
+            for distance in range(max_distance + 1)
+        ]
+        _FLIGHT_TICKS_TABLES[key] = table
+    return table
+
+
+class Trajectory:
+    # Future sub-pixel x positions of a player simulated the way Player.move
+    # does it - including the bounce at the field edges. Simulated lazily, only
+    # as far ahead as asked for, and kept for as long as the player keeps
+    # moving as predicted
+    def __init__(self, player: Player):
+        self.player = player
+        self.fx_table = [0] * TRAJECTORY_TABLE_SIZE
+        self.anchor_tick = 0
+        # Entries of fx_table simulated so far - 0 means no prediction
+        self.simulated = 0
+        self.play_state = None
+        # Simulation state to continue from
+        self.next_fx = 0
+        self.next_fvx = 0
+        self.moving = False
+        self.slow = False
+        self.player_width = 0
+        self.limit_fx_start = 0
+        self.limit_fx_end = 0
+
+    def restart(self, tick):
+        player = self.player
+        self.anchor_tick = tick
+        self.simulated = 0
+        self.play_state = player.play_state
+        self.next_fx = player.fx
+        self.next_fvx = player.fvx
+        self.moving = player.play_state == PST_DEFENSIVE
+        self.slow = bool(player.has_ufo_type(UfoTypes.SLOW))
+        self.player_width = player.player_width
+        player_half_width = player.player_width // 2
+        self.limit_fx_start = (player.field_start + player_half_width) << FP_SHIFT
+        self.limit_fx_end = (player.field_end - player_half_width) << FP_SHIFT
+
+    def simulate(self, count):
+        fx = self.next_fx
+        fvx = self.next_fvx
+        moving = self.moving
+        slow = self.slow
+        limit_fx_start = self.limit_fx_start
+        limit_fx_end = self.limit_fx_end
+        fx_table = self.fx_table
+        for i in range(self.simulated, count):
+            fx_table[i] = fx
+            if moving:
+                fx += fvx >> 2 if slow else fvx
+                if fx <= limit_fx_start:
+                    fx = limit_fx_start
+                    fvx = -fvx
+                elif fx >= limit_fx_end:
+                    fx = limit_fx_end
+                    fvx = -fvx
+        self.next_fx = fx
+        self.next_fvx = fvx
+        self.simulated = count
+
+    def x_at(self, tick, ticks_ahead):
+        player = self.player
+        offset = tick - self.anchor_tick
+        ahead_offset = offset + ticks_ahead
+        # Any deviation from the simulated path (velocity, width or a SLOW
+        # UFO changed) means the prediction is stale
+        if (
+            offset >= self.simulated
+            or ahead_offset >= TRAJECTORY_TABLE_SIZE
+            or self.fx_table[offset] != player.fx
+            or self.play_state != player.play_state
+            or self.player_width != player.player_width
+            or self.slow != bool(player.has_ufo_type(UfoTypes.SLOW))
+        ):
+            self.restart(tick)
+            ahead_offset = min(ticks_ahead, TRAJECTORY_TABLE_SIZE - 1)
+        if ahead_offset >= self.simulated:
+            self.simulate(ahead_offset + 1)
+        return self.fx_table[ahead_offset] >> FP_SHIFT
+
+
+class TargetingSolver:
+    # Predicts where the shooter and its targets will be when a missile
+    # fired now (after reacting, stopping and charging) arrives
+    def __init__(self, player: Player, other_player: Player):
+        self.player = player
+        max_distance = player.display.height
+        self.max_distance = max_distance
+        missile_speed = config.base_missile_speed
+        self.normal_flight_ticks = get_flight_ticks_table(missile_speed, max_distance)
+        self.rapid_fire_flight_ticks = get_flight_ticks_table(
+            missile_speed * 2, max_distance
+        )
+        self.trajectory = Trajectory(player)
+        self.other_trajectory = Trajectory(other_player)
+        # Per shot parameters - shared by every target checked in a tick
+        self.tick = 0
+        self.shot_x = 0
+        self.fire_ticks = 0
+        self.flight_ticks = self.normal_flight_ticks
+
+    def prepare_shot(self, tick, response_ticks):
+        player = self.player
+        self.tick = tick
+        # The shooter keeps moving until it reacts and stops
+        if response_ticks > 0:
+            self.shot_x = self.trajectory.x_at(tick, response_ticks)
+        else:
+            self.shot_x = player.x
+        charge_time = player.charge_time_fp
+        if player.has_ufo_type(UfoTypes.RAPID_FIRE):
+            charge_time = charge_time // 3
+            self.flight_ticks = self.rapid_fire_flight_ticks
+        else:
+            self.flight_ticks = self.normal_flight_ticks
+        charge_ticks = (charge_time + FP_ONE - 1) >> FP_SHIFT
+        self.fire_ticks = response_ticks + SHOT_SETUP_TICKS + charge_ticks
+
+    def on_target_player(self, other_player: Player, vision_inaccuracy, precision):
+        distance = min(abs(other_player.y - self.player.y), self.max_distance)
+        hit_ticks = self.fire_ticks + self.flight_ticks[distance]
+        target_x = self.other_trajectory.x_at(self.tick, hit_ticks) + vision_inaccuracy
+        return abs(self.shot_x - target_x) < precision
+
+    def on_target_ufo(self, ufo: Ufo, vision_inaccuracy, precision):
+        player = self.player
+        distance = min(abs(ufo.y - player.y), self.max_distance)
+        hit_ticks = self.fire_ticks + self.flight_ticks[distance]
+        # UFOs fly straight and are gone once they leave the field
+        target_x = (ufo.fx + ufo.fvx * hit_ticks) >> FP_SHIFT
+        if target_x < player.field_start or target_x > player.field_end - ufo.width:
+            return False
+        return abs(self.shot_x - (target_x + vision_inaccuracy)) < precision
@@ -1,8 +1,10 @@
 from random import random
-from math import sin, pi
 
 from games.duel.env import GAME_ROOT_DIR
+from games.duel.fixed import FP_SHIFT, SINE_LUT, SINE_LUT_SIZE, to_fp
+from games.duel.kernels import ufo_move, ufo_check_hit
 from game_device import GameDevice
+from scene import Sprite, SPRITE_BLIT
 
 
 class UfoTypes:
@@ -19,13 +21,15 @@ UFO_TYPES_COUNT = 5
 UFO_CONFIG_PROB = 0
 UFO_CONFIG_SPEED = 1
 UFO_CONFIG_TTL = 2
+UFO_CONFIG_WOBBLE_AMPLITUDE = 3
+UFO_CONFIG_WOBBLE_PERIOD = 4
 UFO_TYPES_CONFIG = [
-    # prob, speed, ttl
-    (1, 0.6, 4000),  # shield
-    (4, 1.2, 3000),  # rapid fire
-    (3, 0.7, 0),  # power
-    (4, 0.4, 3000),  # slow
-    (2, 0.4, 0),  # damage
+    # prob, speed, ttl, wobble amplitude (px), wobble period (px)
+    (1, 0.6, 4000, 5, 20),  # shield
+    (4, 1.2, 3000, 5, 20),  # rapid fire
+    (3, 0.7, 0, 5, 20),  # power
+    (4, 0.4, 3000, 5, 20),  # slow
+    (2, 0.4, 0, 5, 20),  # damage
 ]
 
 UFO_TOTAL_PROBS = sum(tc[UFO_CONFIG_PROB] for tc in UFO_TYPES_CONFIG)
@@ -45,10 +49,49 @@ def get_random_ufo_type():
             return tp[0]
 
 
+# The wobble of all UFO types - a sub-pixel x divided by the type's period
+# indexes it
+WOBBLE_LUT_SIZE = SINE_LUT_SIZE
+WOBBLE_LUT = SINE_LUT
+
 UFO_TYPES_SPRITES = []
 
+# Scene z order - above the ships and missiles
+Z_UFO = 10
+
 
 class Ufo:
+    __slots__ = (
+        "device",
+        "display",
+        "time",
+        "x",
+        "y",
+        "fx",
+        "fvx",
+        "type",
+        "direction_x",
+        "speed",
+        "wobble_amplitude",
+        "wobble_period",
+        "base_y",
+        "width",
+        "height",
+        "half_w",
+        "half_h",
+        "captured",
+        "captured_at_ticks_ms",
+        "time_to_live_ms",
+        "dead",
+        "sprite",
+        "view",
+        "in_pool",
+    )
+
+    # Run every frame - native code on the device (see kernels.py)
+    move = ufo_move
+    check_hit = ufo_check_hit
+
     def __init__(
         self,
         device: GameDevice,
@@ -61,23 +104,47 @@ class Ufo:
         self.device = device
         self.display = device.display
         self.time = device.time
-        self.y = y
-        self.type = type
-        self.direction_x = direction_x
-        self.speed = UFO_TYPES_CONFIG[type][UFO_CONFIG_SPEED]
-        self.base_y = self.y
         self.width = 8
         self.height = 8
         self.half_w = self.width // 2
         self.half_h = self.height // 2
+        self.in_pool = False
+        self.view = Sprite(SPRITE_BLIT, Z_UFO)
+
+        self.initialize_display_assets()
+        self.reset(field_start_x, field_end_x, y, type, direction_x)
+
+    def reset(
+        self,
+        field_start_x,
+        field_end_x,
+        y,
+        type: int = UfoTypes.SHIELD,
+        direction_x=0,
+    ):
+        self.y = y
+        self.type = type
+        self.direction_x = direction_x
+        type_config = UFO_TYPES_CONFIG[type]
+        self.speed = type_config[UFO_CONFIG_SPEED]
+        self.wobble_amplitude = type_config[UFO_CONFIG_WOBBLE_AMPLITUDE]
+        self.wobble_period = type_config[UFO_CONFIG_WOBBLE_PERIOD]
+        self.base_y = self.y
         self.x = field_start_x if direction_x == 1 else field_end_x - self.width
+        # Sub-pixel position and velocity - x/y are whole pixels derived from them
+        self.fx = self.x << FP_SHIFT
+        self.fvx = to_fp(self.speed) * direction_x
         self.captured = False
         self.captured_at_ticks_ms: int = 0
-        self.time_to_live_ms: int = UFO_TYPES_CONFIG[type][UFO_CONFIG_TTL]
+        self.time_to_live_ms: int = type_config[UFO_CONFIG_TTL]
         self.dead = False
-
-        self.initialize_display_assets()
         self.sprite = UFO_TYPES_SPRITES[type]
+        self.view.set_asset(self.sprite)
+
+    @staticmethod
+    def unload_display_assets():
+        # Loaded again by the next UFO
+        UFO_TYPES_SPRITES.clear()
 
     def initialize_display_assets(self):
         global UFO_TYPES_SPRITES
@@ -102,20 +169,7 @@ class Ufo:
             )
             print("done.")
 
-    def move(self):
-        if self.captured:
-            capture_time_ms = self.time.ticks_diff(
-                self.time.ticks_ms(), self.captured_at_ticks_ms
-            )
-            if capture_time_ms > self.time_to_live_ms:
-                self.dead = True
-        elif not self.dead:
-            self.x += self.direction_x * self.speed
-
-            # Add a wobble effect around main trajectory
-            self.y = self.base_y + sin(self.x / 20 * pi * 2) * 5
-
-    def draw(
+    def update_view(
         self,
         prison_start_x: int = None,
         prison_start_y: int = None,
@@ -124,30 +178,13 @@ class Ufo:
     ):
         center_x = self.x
         center_y = self.y
-        if not self.dead:
+        if self.dead:
+            self.view.visible = False
+        else:
             if self.captured:
                 center_x = (prison_end_x + prison_start_x) // 2
                 center_y = (prison_end_y + prison_start_y) // 2
-            self.display.blit(
-                self.sprite.buffer,
-                int(center_x) - self.half_w,
-                int(center_y) - self.half_h,
-            )
-
-    def check_hit(self, hit_rect):
-        if not self.dead:
-            x1, y1, x2, y2 = hit_rect
-            ufo_y1 = self.y
-            # Why the ugly nested if? To save on calcs
-            if y2 >= ufo_y1:
-                ufo_y2 = self.y + self.height
-                if y1 <= ufo_y2:
-                    ufo_x1 = self.x - self.half_w
-                    if x2 >= ufo_x1:
-                        ufo_x2 = self.x + self.half_w
-                        if x1 <= ufo_x2:
-                            return True
-        return False
+            self.view.show_at(center_x - self.half_w, center_y - self.half_h)
 
     def set_captured(self):
         self.captured_at_ticks_ms = self.time.ticks_ms()
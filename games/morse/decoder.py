@@ -0,0 +1,143 @@
+SHORT_SYMBOL = "."
+LONG_SYMBOL = "-"
+
+DIGIT_CODES = {
+    "0": "-----",
+    "1": ".----",
+    "2": "..---",
+    "3": "...--",
+    "4": "....-",
+    "5": ".....",
+    "6": "-....",
+    "7": "--...",
+    "8": "---..",
+    "9": "----.",
+}
+PUNCTUATION_CODES = {
+    ".": ".-.-.-",
+    ",": "--..--",
+    "?": "..--..",
+    "'": ".----.",
+    "!": "-.-.--",
+    "/": "-..-.",
+    "(": "-.--.",
+    ")": "-.--.-",
+    "&": ".-...",
+    ":": "---...",
+    ";": "-.-.-.",
+    "=": "-...-",
+    "+": ".-.-.",
+    "-": "-....-",
+    "_": "..--.-",
+    '"': ".-..-.",
+    "$": "...-..-",
+    "@": ".--.-.",
+}
+
+# Decoded when the keyed sequence matches no character
+UNKNOWN_CHAR = "?"
+# Dead end in the trie - stays there until the character ends
+NO_NODE = -1
+
+
+class MorseTrie:
+    # Binary trie of morse codes - a dot goes to the first child and a dash
+    # to the second. Nodes are indices into flat lists so walking it is a
+    # single list lookup per symbol
+    def __init__(self, *code_tables):
+        self.children = [NO_NODE, NO_NODE]
+        self.chars = [None]
+        for codes in code_tables:
+            for char, code in codes.items():
+                self.add(char, code)
+
+    def add(self, char, code):
+        node = 0
+        for symbol in code:
+            child_idx = node * 2 + (symbol == LONG_SYMBOL)
+            child = self.children[child_idx]
+            if child == NO_NODE:
+                child = len(self.chars)
+                self.chars.append(None)
+                self.children.append(NO_NODE)
+                self.children.append(NO_NODE)
+                self.children[child_idx] = child
+            node = child
+        self.chars[node] = char
+
+    def step(self, node, symbol):
+        if node == NO_NODE:
+            return NO_NODE
+        return self.children[node * 2 + (symbol == LONG_SYMBOL)]
+
+    def char_at(self, node):
+        if node == NO_NODE:
+            return None
+        return self.chars[node]
+
+
+class WordIndex:
+    # Prefix -> suggested words, built once so a lookup is a single dict get
+    def __init__(self, words, max_suggestions: int = 3):
+        self.suggestions = {}
+        for word in words:
+            word = word.lower()
+            for end in range(1, len(word) + 1):
+                prefix = word[:end]
+                prefix_words = self.suggestions.get(prefix)
+                if prefix_words is None:
+                    self.suggestions[prefix] = [word]
+                elif len(prefix_words) < max_suggestions and word not in prefix_words:
+                    prefix_words.append(word)
+
+    def lookup(self, prefix):
+        return self.suggestions.get(prefix.lower(), ())
+
+
+class MorseDecoder:
+    # Decodes a live stream of symbols into text - one trie step per symbol
+    def __init__(self, trie: MorseTrie, max_text_len: int = 14):
+        self.trie = trie
+        self.max_text_len = max_text_len
+        self.reset()
+
+    def reset(self):
+        self.node = 0
+        # Symbols keyed for the current character
+        self.symbols = ""
+        # Decoded text - only the tail that fits on screen is kept
+        self.text = ""
+        # Characters of the word being keyed - drives the suggestions
+        self.word = ""
+
+    def push_symbol(self, symbol):
+        self.node = self.trie.step(self.node, symbol)
+        self.symbols += symbol
+
+    def current_char(self):
+        # What the symbols keyed so far decode to - None if nothing yet
+        if not self.symbols:
+            return None
+        char = self.trie.char_at(self.node)
+        return char if char is not None else UNKNOWN_CHAR
+
+    def end_char(self):
+        char = self.current_char()
+        if char is not None:
+            self.append_text(char)
+            self.word += char
+            self.node = 0
+            self.symbols = ""
+        return char
+
+    def end_word(self):
+        self.end_char()
+        if self.word:
+            self.append_text(" ")
+            self.word = ""
+
+    def append_text(self, char):
+        text = self.text + char
+        if len(text) > self.max_text_len:
+            text = text[-self.max_text_len :]
+        self.text = text
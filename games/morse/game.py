@@ -1,34 +1,78 @@
-import random
-from game_device import GameDevice
-from game_logic import BaseGameLogic
+from game_device import SCROLL_LEFT, GameDevice
+from game_logic import BaseGameLogic, sleep
+from games.morse.decoder import (
+    SHORT_SYMBOL,
+    LONG_SYMBOL,
+    DIGIT_CODES,
+    PUNCTUATION_CODES,
+    MorseDecoder,
+    MorseTrie,
+    WordIndex,
+)
+from games.morse.words import WordBank
+from games.morse.timing import SHORT_CLICK_THR_MS, MorseTiming
 
 REFRESH_RATE_MS = 33
 
-SHORT_CLICK_THR_MS = 220
-SPACE_THR_MS = 1250
-SEQUENCE_END_THR_MS = 2500
+# Game states - indices into GameLogic.state_handlers
+GST_INIT_MENU = 0
+GST_MENU_PENDING = 1
+GST_MENU_SELECTED = 2
+GST_INIT_FREE = 3
+GST_FREE_ACTIVE = 4
+GST_INIT_LEVEL = 5
+GST_LEVEL_ACTIVE = 6
+
+# Static backgrounds (display.save_background keys)
+BACKGROUND_MENU = 0
+BACKGROUND_LEVEL = 1
+BACKGROUND_FREE = 2
 
 MENU_CLICK_SHORT_THR_MS = 200
 MENU_CLICK_LONG_THR_MS = 990  # based on the refresh rate to allow 1x pixel per frame
 MAIN_MENU_TEXT_PAD = 10
+# The untouched menu scrolls its items by itself (display.scroll) - nothing
+# is drawn or sent then until the button is pressed
+MENU_SCROLL_AFTER_MS = 10000
+MENU_SCROLL_FRAMES = 5
 
 MENU_PROGRESS_BAR_WIDTH = 40
 MENU_ITEM_EASY = "Easy"
 MENU_ITEM_HARD = "Hard"
+MENU_ITEM_FREE = "Free"
 MENU_ITEM_HOW_TO = "How To"
 PROGRESS_BAR_HEIGHT = 5
 
 SOUND_TEXT_ON = "on"
 SOUND_TEXT_OFF = "off"
 
-SHORT_SYMBOL = "."
-LONG_SYMBOL = "-"
 SPACE_SYMBOL = " "
 
+# Pixels taken by each symbol in the code row - drawn width plus the gap
+SYMBOL_PIXEL_WIDTHS = {SHORT_SYMBOL: 4, LONG_SYMBOL: 7, SPACE_SYMBOL: 3}
+# Drawn width of each symbol - a space is only a gap
+SYMBOL_DRAW_WIDTHS = {SHORT_SYMBOL: 3, LONG_SYMBOL: 6, SPACE_SYMBOL: 0}
+WORD_CHAR_PIXEL_WIDTH = 10
+# The code row keeps at least this far from the screen edges
+MIN_CODE_X_POS = 5
+
+WORD_BANK_FILE = "./games/morse/assets/words.txt"
+
 GAME_TIMER_S = 45
 EASY_WRONG_POINTS_REDUCTION = 3
 HARD_WRONG_POINTS_REDUCTION = 5
 
+# Free keying mode returns to the menu after this long without input
+FREE_MODE_EXIT_MS = 15000
+FREE_MODE_TEXT_LEN = 14
+
+
+def measure_code(code):
+    x = 0
+    for c in code:
+        x += SYMBOL_PIXEL_WIDTHS.get(c, 0)
+    return x
+
 
 class GameRules:
     letters_dict = {
@@ -90,53 +134,71 @@ class GameRules:
 
     captured_sequence = []
     cur_char_idx = 0
-
-    def __init__(self, difficulty):
+    # Layout of the current word - built once per word
+    code_layout = []
+    code_pixel_width = 0
+    word_pixel_width = 0
+    # Kept up to date on every input rather than re-walking the sequence
+    captured_pixel_width = 0
+
+    def __init__(self, difficulty, word_bank: WordBank):
+        self.word_bank = word_bank
         self.wrong_code = False
         self.code_complete = False
         self.timer_expired = False
         self.points = 0
         self.captured_sequence = []
         self.cur_char_idx = 0
+        self.captured_pixel_width = 0
         self.difficulty = difficulty
 
     def gen_new_word(self):
-
-        if self.difficulty == MENU_ITEM_EASY:
-            self.word = random.choice(self.easy_words)
-        else:
-            self.word = random.choice(self.hard_words)
-
-        self.code = self.translate_to_morse(self.word)
+        # Only words whose code fits the screen are in the bank
+        picked = self.word_bank.pick(self.difficulty)
+        if picked is None:
+            # Not even a built-in word fits - the narrowest one is drawn
+            # clipped rather than no level at all
+            word = min(
+                self.easy_words,
+                key=lambda word: measure_code(self.translate_to_morse(word)),
+            )
+            picked = (word, self.translate_to_morse(word))
+        self.word, self.code = picked
+        self.build_layout()
         self.wrong_code = False
         self.code_complete = False
         self.timer_expired = False
         self.captured_sequence = []
         self.cur_char_idx = 0
+        self.captured_pixel_width = 0
 
-    def translate_to_morse(self, word):
+    @staticmethod
+    def translate_to_morse(word):
         code = []
         for c in word:
-            code.append(self.letters_dict.get(c.upper()))
+            code.append(GameRules.letters_dict.get(c.upper()))
             code.append(SPACE_SYMBOL)
 
         return "".join(str(x) for x in code)
 
-    def calculate_code_pixel_count(self, captured):
+    def build_layout(self):
+        # (x offset, width) of every drawn symbol of the code row
+        layout = []
         x = 0
-        if captured:
-            code = self.captured_sequence
-        else:
-            code = self.code
-        for c in code:
-            if c == SHORT_SYMBOL:
-                x += 4
-            elif c == LONG_SYMBOL:
-                x += 7
-            elif c == SPACE_SYMBOL:
-                x += 3
+        for c in self.code:
+            draw_width = SYMBOL_DRAW_WIDTHS.get(c, 0)
+            if draw_width > 0:
+                layout.append((x, draw_width))
+            x += SYMBOL_PIXEL_WIDTHS.get(c, 0)
 
-        return x
+        self.code_layout = layout
+        self.code_pixel_width = x
+        self.word_pixel_width = len(self.word) * WORD_CHAR_PIXEL_WIDTH
+
+    def calculate_code_pixel_count(self, captured):
+        if captured:
+            return self.captured_pixel_width
+        return self.code_pixel_width
 
     def is_code_input_started(self):
         if len(self.captured_sequence) > 0:
@@ -154,6 +216,7 @@ class GameRules:
 
     def register_code_input(self, symbol):
         self.captured_sequence.append(symbol)
+        self.captured_pixel_width += SYMBOL_PIXEL_WIDTHS.get(symbol, 0)
         print(self.captured_sequence)
 
         if self.code[self.cur_char_idx] == symbol:
@@ -218,175 +281,303 @@ class GameLogic(BaseGameLogic):
     def load(self):
         print("game loaded")
         self.start_game_tick = self.device.time.ticks_ms()
-        self.state = "init_menu"
+        self.state = GST_INIT_MENU
+        # Indexed by the state IDs
+        self.state_handlers = [
+            self.init_menu,
+            self.menu_pending_tick,
+            self.menu_selected,
+            self.init_free,
+            self.free_tick,
+            self.init_level,
+            self.level_tick,
+        ]
+        # Free keying mode lookups - built the first time the mode is played
+        self.morse_trie = None
+        self.word_index = None
+        # Words for the levels - loaded the first time a level is played
+        self.word_bank = None
+        # Learns the player's keying speed - kept across levels and modes
+        self.timing = MorseTiming()
 
     def game_tick(self):
-        device = self.device
-        display = device.display
-        time = device.time
-        button = device.button
-
-        if self.state == "wait_until":
-            if time.ticks_ms() > self.wait_until_tick:
-                self.wait_until_tick = None
-                self.state = self.state_after_wait
-            return
+        self.state_handlers[self.state]()
 
-        if self.state == "init_menu":
-            self.menu_state = MenuState()
-            menu_state = self.menu_state
-            menu_state.game_sound = True
-            # items = ["Easy", "Hard", "How to", "Sound"]
-            menu_state.items = [MENU_ITEM_EASY, MENU_ITEM_HARD, MENU_ITEM_HOW_TO]
-            menu_state.selector_index = 0
-            menu_state.menu_selection_fill_width = 0
-            menu_state.start_click = False
-            menu_state.start_click_tick = 0
-            self.state = "menu_pending"
+    def show_message(self, text, wait_ms, next_state):
+        # Shown over the last frame - the game waits (idles) until it is read
+        display = self.device.display
+        display.text(text, 30, 10, 1)
+        display.show()
+        yield sleep(wait_ms)
+        self.state = next_state
+
+    def init_menu(self):
+        self.menu_state = MenuState()
+        menu_state = self.menu_state
+        menu_state.game_sound = True
+        # items = ["Easy", "Hard", "How to", "Sound"]
+        menu_state.items = [
+            MENU_ITEM_EASY,
+            MENU_ITEM_HARD,
+            MENU_ITEM_FREE,
+            MENU_ITEM_HOW_TO,
+        ]
+        menu_state.selector_index = 0
+        menu_state.menu_selection_fill_width = 0
+        menu_state.start_click = False
+        menu_state.start_click_tick = 0
+        menu_state.last_input_ms = self.device.time.ticks_ms()
+        menu_state.scrolling = False
+        # Set by the press stopping the scrolling - it selects nothing
+        menu_state.ignore_press = False
+        self.state = GST_MENU_PENDING
+
+    def menu_pending_tick(self):
+        time = self.device.time
+        button = self.device.button
+        menu_state = self.menu_state
+        if menu_state.menu_selection_fill_width > MENU_PROGRESS_BAR_WIDTH:
+            self.state = GST_MENU_SELECTED
             return
 
-        if self.state == "menu_pending":
-            menu_state = self.menu_state
-            if menu_state.menu_selection_fill_width > MENU_PROGRESS_BAR_WIDTH:
-                self.state = "menu_selected"
+        if menu_state.scrolling:
+            if button.value() != 0:
                 return
+            # Shown whole again below
+            self.device.display.stop_scroll()
+            menu_state.scrolling = False
+            menu_state.ignore_press = True
+
+        menu_y_pos = 20
+        self.draw_main_menu(
+            int(self.screen_width / 2 - 20),
+            menu_y_pos,
+            menu_state.items,
+            menu_state.selector_index,
+            menu_state.menu_selection_fill_width,
+            menu_state.game_sound,
+        )
 
-            self.draw_main_menu(
-                int(self.screen_width / 2 - 20),
-                20,
-                menu_state.items,
-                menu_state.selector_index,
-                menu_state.menu_selection_fill_width,
-                menu_state.game_sound,
-            )
-
-            if button.value() == 0:
-                # check if the button is clicked from previous tick
-                if menu_state.start_click:
-                    # calculate for how long it was clicked to mark selection in the ui
-                    delta = time.ticks_diff(
-                        time.ticks_ms(), menu_state.start_click_tick
-                    )
-                    if delta > SHORT_CLICK_THR_MS:
-                        menu_state.menu_selection_fill_width += (
-                            MENU_PROGRESS_BAR_WIDTH
-                            / (MENU_CLICK_LONG_THR_MS / REFRESH_RATE_MS)
-                        ) * 2
-
-                # check if button was actually pressed on this tick
-                if not menu_state.start_click:
-                    menu_state.start_click_tick = time.ticks_ms()
-                    menu_state.start_click = True
-            else:
-                # check if button was released on this tick and calculate duration
-                if menu_state.start_click:
-                    delta = time.ticks_diff(
-                        time.ticks_ms(), menu_state.start_click_tick
-                    )
-                    if delta <= SHORT_CLICK_THR_MS:
-                        menu_state.selector_index += 1
-                        if menu_state.selector_index > len(menu_state.items) - 1:
-                            menu_state.selector_index = 0
-
-                    menu_state.start_click = False
-                    menu_state.menu_selection_fill_width = 0
-
-            return
+        if button.value() == 0:
+            menu_state.last_input_ms = time.ticks_ms()
+            if menu_state.ignore_press:
+                return
+            # check if the button is clicked from previous tick
+            if menu_state.start_click:
+                # calculate for how long it was clicked to mark selection in the ui
+                delta = time.ticks_diff(time.ticks_ms(), menu_state.start_click_tick)
+                if delta > SHORT_CLICK_THR_MS:
+                    menu_state.menu_selection_fill_width += (
+                        MENU_PROGRESS_BAR_WIDTH
+                        / (MENU_CLICK_LONG_THR_MS / REFRESH_RATE_MS)
+                    ) * 2
 
-        if self.state == "menu_selected":
-            menu_state = self.menu_state
-            print(menu_state.items[menu_state.selector_index] + " selected")
-            difficulty = menu_state.selector_index
-            self.rules = GameRules(difficulty)
-            self.state = "init_level"
+            # check if button was actually pressed on this tick
+            if not menu_state.start_click:
+                menu_state.start_click_tick = time.ticks_ms()
+                menu_state.start_click = True
+        else:
+            # check if button was released on this tick and calculate duration
+            if menu_state.start_click:
+                delta = time.ticks_diff(time.ticks_ms(), menu_state.start_click_tick)
+                if delta <= SHORT_CLICK_THR_MS:
+                    menu_state.selector_index += 1
+                    if menu_state.selector_index > len(menu_state.items) - 1:
+                        menu_state.selector_index = 0
+
+                menu_state.start_click = False
+                menu_state.menu_selection_fill_width = 0
+            menu_state.ignore_press = False
+
+            idle_ms = time.ticks_diff(time.ticks_ms(), menu_state.last_input_ms)
+            if idle_ms > MENU_SCROLL_AFTER_MS:
+                menu_state.scrolling = True
+                self.device.display.scroll(
+                    SCROLL_LEFT,
+                    menu_y_pos // 8,
+                    self.screen_height // 8 - 1,
+                    MENU_SCROLL_FRAMES,
+                )
+
+    def menu_selected(self):
+        menu_state = self.menu_state
+        print(menu_state.items[menu_state.selector_index] + " selected")
+        if menu_state.items[menu_state.selector_index] == MENU_ITEM_FREE:
+            self.state = GST_INIT_FREE
             return
-
-        ge = self.rules
-
-        if self.state == "init_level":
-            ge = self.rules
-            ge.gen_new_word()
-            self.state = "level_active"
-            self.level_state = LevelState()
-
-            self.level_state.start_click = False
-            self.level_state.start_click_tick = 0
-            self.level_state.end_click_tick = 0
-            self.level_state.code_pixel_width = ge.calculate_code_pixel_count(False)
-            self.level_state.code_x_pos = int(
-                (self.screen_width - self.level_state.code_pixel_width) / 2
+        difficulty = MENU_ITEM_HARD
+        if menu_state.items[menu_state.selector_index] == MENU_ITEM_EASY:
+            difficulty = MENU_ITEM_EASY
+        if self.word_bank is None:
+            self.word_bank = self.load_word_bank()
+        self.rules = GameRules(difficulty, self.word_bank)
+        self.state = GST_INIT_LEVEL
+
+    def init_free(self):
+        if self.morse_trie is None:
+            self.morse_trie = MorseTrie(
+                GameRules.letters_dict, DIGIT_CODES, PUNCTUATION_CODES
             )
-            if self.level_state.code_x_pos < 5:
-                print(ge.word + " code is too long!! regen...")
-                self.state = "init_level"
-            return
+            self.word_index = WordIndex(GameRules.easy_words + GameRules.hard_words)
+        self.level_state = LevelState()
+        self.level_state.decoder = MorseDecoder(self.morse_trie, FREE_MODE_TEXT_LEN)
+        self.level_state.start_click = False
+        self.level_state.start_click_tick = 0
+        self.level_state.end_click_tick = self.device.time.ticks_ms()
+        # The long press selecting the mode is still held - not a symbol
+        self.level_state.armed = self.device.button.value() != 0
+        self.state = GST_FREE_ACTIVE
+
+    def init_level(self):
+        ge = self.rules
+        ge.gen_new_word()
+        # Has the previous word drawn in
+        self.device.display.clear_background()
+        self.state = GST_LEVEL_ACTIVE
+        self.level_state = LevelState()
+
+        self.level_state.start_click = False
+        self.level_state.start_click_tick = 0
+        self.level_state.end_click_tick = 0
+        self.level_state.code_pixel_width = ge.calculate_code_pixel_count(False)
+        self.level_state.code_x_pos = int(
+            (self.screen_width - self.level_state.code_pixel_width) / 2
+        )
+        self.level_state.word_x_pos = int((self.screen_width - ge.word_pixel_width) / 2)
 
+    def level_tick(self):
+        time = self.device.time
+        button = self.device.button
+        ge = self.rules
         level_state = self.level_state
 
         elapsed_sec = int(time.ticks_diff(time.ticks_ms(), self.start_game_tick) / 1000)
         # first, we draw the screen
         self.draw_screen(
-            ge, level_state.code_x_pos, level_state.code_pixel_width, elapsed_sec
+            ge,
+            level_state.code_x_pos,
+            level_state.code_pixel_width,
+            level_state.word_x_pos,
+            elapsed_sec,
         )
 
         # check if we completed the code sequence
         if ge.is_code_completed():
-            display.text("CORRECT", 30, 10, 1)
-            display.show()
-            self.state = "wait_until"
-            self.wait_until_tick = time.ticks_ms() + 1000
-            self.state_after_wait = "init_level"
+            self.start_task(self.show_message("CORRECT", 1000, GST_INIT_LEVEL))
             return
 
         # check if the game timer expired
         if elapsed_sec > GAME_TIMER_S:
-            display.text("TIME OUT", 30, 10, 1)
-            display.show()
-            self.state = "wait_until"
-            self.wait_until_tick = time.ticks_ms() + 2000
-            self.state_after_wait = "init_menu"
             # should kill the game
+            self.start_task(self.show_message("TIME OUT", 2000, GST_INIT_MENU))
             return
 
         if ge.is_code_wrong():
-            display.text("WRONG", 30, 10, 1)
-            display.show()
-            self.state = "wait_until"
-            self.wait_until_tick = time.ticks_ms() + 1000
-            self.state_after_wait = "init_level"
             # TODO Here we kill the game OR we reduce points and keep playing until timer ends
+            self.start_task(self.show_message("WRONG", 1000, GST_INIT_LEVEL))
             return
 
         # now, we handle button inputs
+        timing = self.timing
         if button.value() == 0:
             # check if button was actually pressed on this tick
             if not level_state.start_click:
-                level_state.start_click_tick = time.ticks_ms()
+                level_state.start_click_tick = self.button_changed_at()
                 level_state.start_click = True
         else:
             # check if button was released on this tick and calculate duration
             if level_state.start_click:
-                delta = time.ticks_diff(time.ticks_ms(), level_state.start_click_tick)
-                if delta <= SHORT_CLICK_THR_MS:
-                    ge.register_code_input(SHORT_SYMBOL)
-                else:
-                    ge.register_code_input(LONG_SYMBOL)
+                level_state.end_click_tick = self.button_changed_at()
+                delta = time.ticks_diff(
+                    level_state.end_click_tick, level_state.start_click_tick
+                )
+                ge.register_code_input(timing.classify_press(delta))
 
                 level_state.start_click = False
-                level_state.end_click_tick = time.ticks_ms()
             # else, button is still unpressed from last tick
             else:
                 delta = time.ticks_diff(time.ticks_ms(), level_state.end_click_tick)
-                if delta > SPACE_THR_MS:
+                if timing.is_char_gap(delta):
                     if ge.is_code_input_started() and not ge.is_last_symbol_space():
                         ge.register_code_input(SPACE_SYMBOL)
 
-                if delta > SEQUENCE_END_THR_MS:
+                if timing.is_sequence_end(delta):
                     if ge.is_code_input_started():
                         ge.register_input_timeout()
                         # print('game over - timeout!')
                         # TODO game over here!
-        return
+
+    def load_word_bank(self):
+        print("Loading word bank...")
+        word_bank = WordBank(
+            GameRules.letters_dict,
+            GameRules.translate_to_morse,
+            measure_code,
+            self.screen_width - MIN_CODE_X_POS * 2,
+        )
+        word_bank.load_file(WORD_BANK_FILE, MENU_ITEM_EASY, MENU_ITEM_HARD)
+        word_bank.build()
+        # The built-in words for a difficulty the file has no word of that
+        # fits the screen - or no file at all
+        for difficulty, words in (
+            (MENU_ITEM_EASY, GameRules.easy_words),
+            (MENU_ITEM_HARD, GameRules.hard_words),
+        ):
+            if word_bank.word_count(difficulty) == 0:
+                word_bank.add_words(words, difficulty)
+        word_bank.build()
+        print(
+            "done - {} easy, {} hard".format(
+                word_bank.word_count(MENU_ITEM_EASY),
+                word_bank.word_count(MENU_ITEM_HARD),
+            )
+        )
+        return word_bank
+
+    def free_tick(self):
+        # Free keying - decode whatever is keyed, no target word
+        device = self.device
+        time = device.time
+        level_state = self.level_state
+        decoder = level_state.decoder
+
+        current_char = decoder.current_char()
+        suggestions = self.word_index.lookup(decoder.word + (current_char or ""))
+        self.draw_free_screen(decoder, current_char, suggestions, self.timing.wpm())
+
+        timing = self.timing
+        if device.button.value() == 0:
+            if not level_state.start_click and level_state.armed:
+                level_state.start_click_tick = self.button_changed_at()
+                level_state.start_click = True
+        else:
+            level_state.armed = True
+            if level_state.start_click:
+                level_state.end_click_tick = self.button_changed_at()
+                delta = time.ticks_diff(
+                    level_state.end_click_tick, level_state.start_click_tick
+                )
+                decoder.push_symbol(timing.classify_press(delta))
+
+                level_state.start_click = False
+            else:
+                delta = time.ticks_diff(time.ticks_ms(), level_state.end_click_tick)
+                if timing.is_char_gap(delta) and decoder.symbols:
+                    decoder.end_char()
+
+                if timing.is_sequence_end(delta) and decoder.word:
+                    decoder.end_word()
+
+                if delta > FREE_MODE_EXIT_MS:
+                    self.state = GST_INIT_MENU
+
+    def button_changed_at(self):
+        # When the button changed level - more precise than the frame time
+        # when the button keeps an edge timestamp
+        changed_at = self.device.button.changed_at_ms()
+        if changed_at is None:
+            return self.device.time.ticks_ms()
+        return changed_at
 
     def draw_main_menu(
         self, x_pos, y_pos, items, selector_index, menu_selection_fill_width, sound
@@ -396,17 +587,19 @@ class GameLogic(BaseGameLogic):
         sound_text = SOUND_TEXT_ON
         if not sound:
             sound_text = SOUND_TEXT_OFF
-        display.fill(0)
-        self.draw_frame()
+        if not display.draw_background(BACKGROUND_MENU):
+            display.fill(0)
+            self.draw_frame()
 
-        y = y_pos
-        for item in items:
-            display.text(item, x_pos, y, 1)
-            y += MAIN_MENU_TEXT_PAD
+            y = y_pos
+            for item in items:
+                display.text(item, x_pos, y, 1)
+                y += MAIN_MENU_TEXT_PAD
 
-        self.draw_menu_selector(x_pos, y_pos, selector_index)
+            display.rect(x_pos, 10, MENU_PROGRESS_BAR_WIDTH, 5, 1)
+            display.save_background(BACKGROUND_MENU)
 
-        display.rect(x_pos, 10, MENU_PROGRESS_BAR_WIDTH, 5, 1)
+        self.draw_menu_selector(x_pos, y_pos, selector_index)
         display.fill_rect(x_pos, 10, int(menu_selection_fill_width), 5, 1)
 
         display.show()
@@ -421,22 +614,52 @@ class GameLogic(BaseGameLogic):
         display.line(x, y, x, y + 4, 1)
         display.line(x, y + 4, x + 4, y + 2, 1)
 
-    def draw_screen(self, ge, code_x_pos, code_pixel_width, elapsed_sec):
+    def draw_screen(self, ge, code_x_pos, code_pixel_width, word_x_pos, elapsed_sec):
         device = self.device
         display = device.display
         ge = self.rules
-        display.fill(0)
-        self.draw_frame()
+        progress_bar_x = code_x_pos - 1
+        progress_bar_y = int(self.screen_height / 2) + 15
+        # The word and its code stay the same for the whole level
+        if not display.draw_background(BACKGROUND_LEVEL):
+            display.fill(0)
+            self.draw_frame()
+            self.draw_word(ge, word_x_pos, int(self.screen_height / 2 - 10))
+            self.draw_code_pixels(ge, code_x_pos, int(self.screen_height / 2))
+            self.draw_progress_bar_frame(
+                progress_bar_x, progress_bar_y, code_pixel_width - 3
+            )
+            display.save_background(BACKGROUND_LEVEL)
         self.draw_points(ge)
         self.draw_timer(elapsed_sec)
-        self.draw_word(ge, int(self.screen_height / 2 - 10))
-        self.draw_code_pixels(ge, code_x_pos, int(self.screen_height / 2))
-        self.draw_progress_bar(
-            ge, code_x_pos - 1, int(self.screen_height / 2) + 15, code_pixel_width - 3
-        )
+        self.draw_progress_bar_fill(ge, progress_bar_x, progress_bar_y)
         # display.text(seq_string, 30, 10, 1)
         display.show()
 
+    def draw_free_screen(self, decoder, current_char, suggestions, wpm):
+        device = self.device
+        display = device.display
+        if not display.draw_background(BACKGROUND_FREE):
+            display.fill(0)
+            self.draw_frame()
+            display.save_background(BACKGROUND_FREE)
+
+        text = decoder.text
+        if current_char is not None:
+            text += current_char
+        display.text(text[-FREE_MODE_TEXT_LEN:], 8, 12, 1)
+
+        # Symbols of the character being keyed
+        x = 8
+        for c in decoder.symbols:
+            width = SYMBOL_DRAW_WIDTHS[c]
+            display.fill_rect(x, 28, width, 3, 1)
+            x += SYMBOL_PIXEL_WIDTHS[c]
+        display.text("{}wpm".format(wpm), self.screen_width - 56, 26, 1)
+
+        display.text(" ".join(suggestions)[:FREE_MODE_TEXT_LEN], 8, 44, 1)
+        display.show()
+
     def draw_frame(self):
         device = self.device
         display = device.display
@@ -462,11 +685,10 @@ class GameLogic(BaseGameLogic):
             "T:{}".format(str(GAME_TIMER_S - elapsed_sec)), self.screen_width - 40, 8, 1
         )
 
-    def draw_word(self, ge, y_pos):
+    def draw_word(self, ge, x_pos, y_pos):
         device = self.device
         display = device.display
         ge = self.rules
-        x_pos = int((self.screen_width - len(ge.word) * 10) / 2)
         word_height = 12
         frame_pad = 5
         display.text(ge.word, x_pos, y_pos, 1)
@@ -480,24 +702,20 @@ class GameLogic(BaseGameLogic):
         device = self.device
         display = device.display
         ge = self.rules
-        for c in ge.code:
-            if c == SHORT_SYMBOL:
-                display.fill_rect(x, y + 4, 3, 3, 1)
-                x += 4
-            elif c == LONG_SYMBOL:
-                display.fill_rect(x, y + 4, 6, 3, 1)
-                x += 7
-            elif c == SPACE_SYMBOL:
-                x += 3
-
-    def draw_progress_bar(self, ge, x, y, width):
+        for offset, width in ge.code_layout:
+            display.fill_rect(x + offset, y + 4, width, 3, 1)
+
+    def draw_progress_bar_frame(self, x, y, width):
         device = self.device
         display = device.display
-        ge = self.rules
         display.line(x, y, x + width, y, 1)
         display.line(x, y, x, y + PROGRESS_BAR_HEIGHT, 1)
         display.line(x + width, y, x + width, y + PROGRESS_BAR_HEIGHT, 1)
         display.line(x, y + PROGRESS_BAR_HEIGHT, x + width, y + PROGRESS_BAR_HEIGHT, 1)
 
+    def draw_progress_bar_fill(self, ge, x, y):
+        device = self.device
+        display = device.display
+        ge = self.rules
         fill_width = ge.calculate_code_pixel_count(True)
         display.fill_rect(x + 1, y, fill_width, PROGRESS_BAR_HEIGHT, 1)
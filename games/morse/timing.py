@@ -0,0 +1,66 @@
+from games.morse.decoder import SHORT_SYMBOL, LONG_SYMBOL
+
+# The fixed thresholds the estimate starts from - a 110ms dot
+SHORT_CLICK_THR_MS = 220
+SPACE_THR_MS = 1250
+SEQUENCE_END_THR_MS = 2500
+INITIAL_DOT_MS = SHORT_CLICK_THR_MS // 2
+
+# Keep the estimate sane - a few stray presses must not run away with it
+MIN_DOT_MS = 40
+MAX_DOT_MS = 400
+# Estimate smoothing - each press moves it 1/2^N of the way. Dashes keyed
+# faster than the current threshold are read as dots and push the estimate
+# up, so it comes down fast and goes up slowly to recover from that
+DOT_EWMA_DOWN_SHIFT = 1
+DOT_EWMA_UP_SHIFT = 3
+# A dash is 3 dots long
+DASH_DOTS = 3
+# PARIS - a standard word is 50 dot lengths long
+WPM_DOT_MS = 60000 // 50
+
+
+class MorseTiming:
+    # Learns the keyer's dot length from the press durations (EWMA) and
+    # scales every threshold with it - constant work and memory per press.
+    # Starts out exactly at the fixed thresholds above
+    def __init__(self, dot_ms: int = INITIAL_DOT_MS):
+        self.reset(dot_ms)
+
+    def reset(self, dot_ms: int = INITIAL_DOT_MS):
+        self.dot_ms = dot_ms
+        self.update_thresholds()
+
+    def update_thresholds(self):
+        dot_ms = self.dot_ms
+        # Half way between a dot and a dash on the 110ms default
+        self.short_click_thr_ms = dot_ms * SHORT_CLICK_THR_MS // INITIAL_DOT_MS
+        self.space_thr_ms = dot_ms * SPACE_THR_MS // INITIAL_DOT_MS
+        self.sequence_end_thr_ms = dot_ms * SEQUENCE_END_THR_MS // INITIAL_DOT_MS
+
+    def classify_press(self, duration_ms: int):
+        # Returns the symbol and learns from it
+        if duration_ms <= self.short_click_thr_ms:
+            symbol = SHORT_SYMBOL
+            sample_ms = duration_ms
+        else:
+            symbol = LONG_SYMBOL
+            sample_ms = duration_ms // DASH_DOTS
+
+        error_ms = sample_ms - self.dot_ms
+        if error_ms < 0:
+            dot_ms = self.dot_ms + (error_ms >> DOT_EWMA_DOWN_SHIFT)
+        else:
+            dot_ms = self.dot_ms + (error_ms >> DOT_EWMA_UP_SHIFT)
+        self.dot_ms = min(MAX_DOT_MS, max(MIN_DOT_MS, dot_ms))
+        self.update_thresholds()
+        return symbol
+
+    def is_char_gap(self, gap_ms: int):
+        return gap_ms > self.space_thr_ms
+
+    def is_sequence_end(self, gap_ms: int):
+        return gap_ms > self.sequence_end_thr_ms
+
+    def wpm(self):
+        return WPM_DOT_MS // self.dot_ms
@@ -0,0 +1,90 @@
+import random
+
+# Longer words are hard ones
+EASY_MAX_WORD_LEN = 3
+
+
+class WordBank:
+    # Words with their morse code worked out once at load time. Each
+    # difficulty keeps its words sorted by code width, with a count of the
+    # words fitting every width, so a word fitting the screen is picked with
+    # a single random index - no retries
+    def __init__(self, letters_dict, translate, measure, max_code_width: int):
+        # translate(word) -> code, measure(code) -> pixel width
+        self.letters_dict = letters_dict
+        self.translate = translate
+        self.measure = measure
+        self.max_code_width = max_code_width
+        self.pending = {}
+        # difficulty -> [(word, code), ...] sorted by code width
+        self.words = {}
+        # difficulty -> words fitting in each code width (index)
+        self.fit_counts = {}
+
+    def add_word(self, word, difficulty):
+        for c in word:
+            if c.upper() not in self.letters_dict:
+                return False
+        code = self.translate(word)
+        width = self.measure(code)
+        if width > self.max_code_width:
+            return False
+        words = self.pending.get(difficulty)
+        if words is None:
+            words = []
+            self.pending[difficulty] = words
+        words.append((width, word, code))
+        return True
+
+    def add_words(self, words, difficulty):
+        for word in words:
+            self.add_word(word, difficulty)
+
+    def load_file(self, filename, easy_difficulty, hard_difficulty):
+        # One word per line - "#" starts a comment line. Returns how many
+        # were added - the ones not fitting the screen are not
+        added = 0
+        try:
+            with open(filename) as f:
+                for line in f:
+                    word = line.strip()
+                    if not word or word[0] == "#":
+                        continue
+                    if len(word) <= EASY_MAX_WORD_LEN:
+                        difficulty = easy_difficulty
+                    else:
+                        difficulty = hard_difficulty
+                    if self.add_word(word, difficulty):
+                        added += 1
+        except OSError:
+            print("no word bank at " + filename)
+        return added
+
+    def build(self):
+        for difficulty, words in self.pending.items():
+            words.sort(key=lambda entry: entry[0])
+            fit_counts = [0] * (self.max_code_width + 1)
+            count = 0
+            for width in range(self.max_code_width + 1):
+                while count < len(words) and words[count][0] <= width:
+                    count += 1
+                fit_counts[width] = count
+            self.words[difficulty] = [(word, code) for _, word, code in words]
+            self.fit_counts[difficulty] = fit_counts
+        self.pending = {}
+
+    def word_count(self, difficulty):
+        return len(self.words.get(difficulty, ()))
+
+    def pick(self, difficulty, max_code_width: int = None):
+        # A random (word, code) of the difficulty no wider than max_code_width
+        # - None when there is none
+        if max_code_width is None or max_code_width > self.max_code_width:
+            max_code_width = self.max_code_width
+        fit_counts = self.fit_counts.get(difficulty)
+        if fit_counts is None:
+            return None
+        count = fit_counts[max_code_width]
+        if count == 0:
+            return None
+        return self.words[difficulty][random.randrange(count)]
@@ -0,0 +1,105 @@
+import time
+
+from async_loop import AsyncGameLoop, sleep_ms
+from game_device import GameButton, GameDevice
+from hardware.esp32 import game_engine
+from hardware.esp32.game_engine import (
+    AUDIO_BPM,
+    GameEngine,
+    PwmGameAudio,
+    init_hardware,
+    stop_audio_timer,
+    target_fps,
+    tim_cb,
+)
+from profiler import FrameProfiler, MemoryMonitor
+
+# Pages written per flush step - the other tasks run between the steps
+FLUSH_PAGES_PER_STEP = 2
+INPUT_POLL_MS = 5
+# One melody step per beat - what the audio timer runs at
+AUDIO_STEP_MS = 60_000 // AUDIO_BPM
+
+
+class PolledButton(GameButton):
+    # Sampled by the input task - changes are stamped to within a poll
+    def __init__(self, pin):
+        self.pin = pin
+        self._value = pin.value()
+        self.changed_at = time.ticks_ms()
+
+    def poll(self):
+        value = self.pin.value()
+        if value != self._value:
+            self._value = value
+            self.changed_at = time.ticks_ms()
+
+    def value(self):
+        return self._value
+
+    def changed_at_ms(self):
+        return self.changed_at
+
+
+class PanelGameLoop(AsyncGameLoop):
+    def __init__(self, logic, display, time, fps: int, profiler=None) -> None:
+        super().__init__(logic, display, time, fps, profiler)
+        self.frame_buffer = bytearray(len(display.buffer))
+        self.frame_view = memoryview(self.frame_buffer)
+
+    async def flush_frame(self):
+        display = self.display
+        self.frame_buffer[:] = display.buffer
+        # Each step sends its own window - the panel drivers address their
+        # memory differently
+        view = self.frame_view
+        last_col = display.width - 1
+        pages = display.pages
+        for page in range(0, pages, FLUSH_PAGES_PER_STEP):
+            last_page = min(page + FLUSH_PAGES_PER_STEP, pages) - 1
+            display.show_window(0, last_col, page, last_page, view)
+            await sleep_ms(0)
+            if not self.flushing:
+                return
+
+
+class AsyncGameEngine(GameEngine):
+    # GameEngine on uasyncio (see async_loop.py) - the display flush, button
+    # polling, melody sequencing and the game logic are separate tasks:
+    #   engine = AsyncGameEngine()
+    #   engine.load(Game.GameLogic)
+    #   engine.run()
+    def __init__(self) -> None:
+        init_hardware()
+        self.device = GameDevice(
+            time,
+            game_engine.display,
+            PolledButton(game_engine.button),
+            PwmGameAudio(timer=False),
+        )
+        self.memory = MemoryMonitor(time)
+
+    async def input_task(self):
+        button = self.device.button
+        while self.loop.running:
+            button.poll()
+            await sleep_ms(INPUT_POLL_MS)
+
+    async def audio_task(self):
+        while self.loop.running:
+            # Nothing to step before the first melody starts the speaker
+            if game_engine.speaker_pwm is not None:
+                tim_cb(None)
+            await sleep_ms(AUDIO_STEP_MS)
+
+    def run(self):
+        # The audio task takes over from the timer
+        stop_audio_timer()
+        self.loop = PanelGameLoop(
+            self.logic,
+            self.device.display,
+            time,
+            target_fps,
+            FrameProfiler(time, memory=self.memory),
+        )
+        self.loop.run(self.input_task(), self.audio_task())
@@ -1,17 +1,68 @@
 import time
 from machine import Pin, SoftI2C, PWM, Timer
-from hardware.esp32 import ssd1306
 
-from game_device import GameAudio, GameDevice
+from accel import micropython
+from game_device import GameAudio, GameButton, GameDevice
+from profiler import FrameProfiler, MemoryMonitor
+
+# The panel fitted - units with another one carry a display.cfg naming its
+# driver and size, e.g. "sh1106 128 64" or "ssd1306 128 32"
+DISPLAY_CONFIG_FILE = "display.cfg"
+DISPLAY_SSD1306 = "ssd1306"
+DISPLAY_SH1106 = "sh1106"
+DISPLAY_DRIVERS = (DISPLAY_SSD1306, DISPLAY_SH1106)
+# Without a display.cfg - or with one that can't be used
+DEFAULT_DISPLAY_CONFIG = (DISPLAY_SSD1306, 128, 64)
+
+
+def read_display_config():
+    # A bad file is reported rather than stop the unit from starting
+    try:
+        with open(DISPLAY_CONFIG_FILE) as f:
+            driver, width, height = f.read().split()
+        width = int(width)
+        height = int(height)
+    except OSError:
+        return DEFAULT_DISPLAY_CONFIG
+    except ValueError as e:
+        print("{} not used - {}".format(DISPLAY_CONFIG_FILE, e))
+        return DEFAULT_DISPLAY_CONFIG
+    if driver not in DISPLAY_DRIVERS:
+        print("{} not used - unknown driver {}".format(DISPLAY_CONFIG_FILE, driver))
+        return DEFAULT_DISPLAY_CONFIG
+    return driver, width, height
+
+
+def make_display(i2c):
+    driver, width, height = read_display_config()
+    print("display: {} {}x{}".format(driver, width, height))
+    # Only the driver used is loaded
+    if driver == DISPLAY_SH1106:
+        from hardware.esp32 import sh1106
+
+        return sh1106.SH1106_I2C(width, height, i2c)
+    from hardware.esp32 import ssd1306
+
+    return ssd1306.SSD1306_I2C(width, height, i2c)
+
+
+# Set up by the first GameEngine (init_hardware) rather than on import - the
+# speaker and the melody timer wait for the first melody played (start_audio)
+i2c = None
+display = None  # display object
+button = None
+speaker_pwm = None
+tim0 = None
 
-i2c = SoftI2C(scl=Pin(22), sda=Pin(21), freq=4000000)
-display = ssd1306.SSD1306_I2C(128, 64, i2c)  # display object
-button = Pin(4, Pin.IN, Pin.PULL_UP)
 target_fps = 24
 target_tick_length_us = 1_000_000 // target_fps
+# What to do when frames run late - catch up by running the missed frames
+# back to back (keeps the game's pace) or skip them (keeps frames on the
+# deadlines' grid). Catching up gives up after MAX_CATCH_UP_FRAMES
+PACING_CATCH_UP = 0
+PACING_SKIP = 1
+MAX_CATCH_UP_FRAMES = 3
 
-speaker_pwm = PWM(Pin(23))
-speaker_pwm.deinit()
 AUDIO_BPM = 480
 
 pwm_max_duty = 2**16 - 1
@@ -20,6 +71,9 @@ pwm_off_duty = 0
 melodies_queue = []
 
 
+# Runs on every beat, interrupting the game - native code (the ESP32 port
+# always has the emitter, see accel.py)
+@micropython.native
 def tim_cb(t):
     global melodies_queue
 
@@ -74,15 +128,58 @@ def tim_cb(t):
             pass
 
 
-tim0 = Timer(0)
-tim0.init(freq=int(AUDIO_BPM / 60), mode=Timer.PERIODIC, callback=tim_cb)
+def init_hardware():
+    global i2c, display, button
+    if display is not None:
+        return
+    i2c = SoftI2C(scl=Pin(22), sda=Pin(21), freq=4000000)
+    display = make_display(i2c)
+    button = Pin(4, Pin.IN, Pin.PULL_UP)
+
+
+def start_audio(timer: bool = True):
+    # Without the timer whoever plays the melodies calls tim_cb each beat
+    global speaker_pwm, tim0
+    if speaker_pwm is None:
+        speaker_pwm = PWM(Pin(23))
+        speaker_pwm.deinit()
+    if timer and tim0 is None:
+        tim0 = Timer(0)
+        tim0.init(freq=int(AUDIO_BPM / 60), mode=Timer.PERIODIC, callback=tim_cb)
+
+
+def stop_audio_timer():
+    global tim0
+    if tim0 is not None:
+        tim0.deinit()
+        tim0 = None
+
+
+class IrqButton(GameButton):
+    # Stamps every level change from the pin interrupt - precise press and
+    # release times rather than the frame they were noticed in
+    def __init__(self, pin):
+        self.pin = pin
+        self.changed_at = time.ticks_ms()
+        pin.irq(handler=self.on_change, trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING)
+
+    def on_change(self, pin):
+        self.changed_at = time.ticks_ms()
+
+    def value(self):
+        return self.pin.value()
+
+    def changed_at_ms(self):
+        return self.changed_at
 
 
 class PwmGameAudio(GameAudio):
-    def __init__(self, mute=False):
+    def __init__(self, mute=False, timer=True):
         self.melodies = []
         self.play_request_id = 0
         self.mute = mute
+        # Whether the melodies are stepped by the audio timer
+        self.timer = timer
 
     def set_mute(self, mute):
         self.mute = mute
@@ -93,11 +190,17 @@ class PwmGameAudio(GameAudio):
         self.melodies.append((freqs, durations))
         return len(self.melodies) - 1
 
+    def unload_melodies(self):
+        melodies_queue.clear()
+        self.melodies.clear()
+
     def play(self, melody_id, interruptable=True):
         global melodies_queue
 
         if self.mute:
             return
+        if speaker_pwm is None:
+            start_audio(self.timer)
 
         self.play_request_id += 1
         freqs, durations = self.melodies[melody_id]
@@ -117,37 +220,71 @@ class PwmGameAudio(GameAudio):
 
 
 class GameEngine:
-    def __init__(self) -> None:
-        self.device = GameDevice(time, display, button, PwmGameAudio())
+    def __init__(self, pacing: int = PACING_CATCH_UP) -> None:
+        init_hardware()
+        self.device = GameDevice(time, display, IrqButton(button), PwmGameAudio())
+        self.pacing = pacing
+        self.memory = MemoryMonitor(time)
 
     def load(self, logic_gen):
         # if button is pressed - mute the sound
         if self.device.button.value() == 0:
             self.device.audio.set_mute(True)
+        memory = self.memory
+        memory.reset_phases()
+        memory.resync()
         self.logic = logic_gen(self.device)
         self.logic.load()
+        memory.sample("load")
 
     def run(self):
         self.running = True
         device_time = self.device.time
+        max_late_us = target_tick_length_us * MAX_CATCH_UP_FRAMES
 
-        elapsed_time_anchor_us = device_time.ticks_us()
-        elapsed_frame_count = 0
+        # Reports fps, GC collections (frame hitches), allocations and frame
+        # start jitter periodically
+        profiler = FrameProfiler(device_time, memory=self.memory)
+        # Frames are paced by absolute deadlines - the time spent sleeping,
+        # profiling and reporting never adds up into drift
+        deadline_us = device_time.ticks_us()
         while self.running:
-            tick_start_us = device_time.ticks_us()
-            self.logic.game_tick()
-            tick_length_us = device_time.ticks_diff(
-                device_time.ticks_us(), tick_start_us
+            profiler.frame_started(
+                device_time.ticks_diff(device_time.ticks_us(), deadline_us)
             )
-            ticks_until_next_frame = target_tick_length_us - tick_length_us
-            if ticks_until_next_frame > 0:
-                device_time.sleep_us(ticks_until_next_frame)
-
-            elapsed_frame_count += 1
-            if elapsed_frame_count % 200 == 0:
-                elapsed_ticks_us = device_time.ticks_diff(
-                    device_time.ticks_us(), elapsed_time_anchor_us
+            self.logic.run_frame()
+            profiler.frame_done(self.logic.phase)
+            if self.logic.exit_requested:
+                return
+
+            deadline_us = device_time.ticks_add(deadline_us, target_tick_length_us)
+            # Nothing to draw or poll while the game waits - sleep it through
+            idle_ms = self.logic.idle_ms()
+            if idle_ms > 0:
+                idle_deadline_us = device_time.ticks_add(
+                    device_time.ticks_us(), idle_ms * 1000
+                )
+                if device_time.ticks_diff(idle_deadline_us, deadline_us) > 0:
+                    deadline_us = idle_deadline_us
+
+            wait_us = device_time.ticks_diff(deadline_us, device_time.ticks_us())
+            if wait_us > 0 and profiler.collect_if_idle(self.logic, wait_us):
+                # Collected in the wait - what is left of it
+                wait_us = device_time.ticks_diff(deadline_us, device_time.ticks_us())
+            if wait_us > 0:
+                device_time.sleep_us(wait_us)
+            elif wait_us < 0 and self.pacing == PACING_SKIP:
+                # Missed - the next frame waits for the next deadline on the
+                # grid, the ones passed are dropped
+                skipped = -wait_us // target_tick_length_us + 1
+                profiler.frames_skipped(skipped)
+                deadline_us = device_time.ticks_add(
+                    deadline_us, skipped * target_tick_length_us
+                )
+                device_time.sleep_us(
+                    device_time.ticks_diff(deadline_us, device_time.ticks_us())
                 )
-                print(f"fps:{1_000_000 / (elapsed_ticks_us / elapsed_frame_count)}")
-                elapsed_frame_count = 0
-                elapsed_time_anchor_us = device_time.ticks_us()
+            elif -wait_us > max_late_us:
+                # Too far behind - drop the missed frames and start afresh
+                profiler.frames_skipped(-wait_us // target_tick_length_us)
+                deadline_us = device_time.ticks_us()
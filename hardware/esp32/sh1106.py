@@ -0,0 +1,118 @@
+# MicroPython SH1106 OLED driver, I2C and SPI interfaces - the SSD1306
+# driver's drawing and buses with the SH1106's display memory layout
+
+from micropython import const
+from hardware.esp32.ssd1306 import (
+    SSD1306,
+    I2CInterface,
+    SPIInterface,
+    SET_CONTRAST,
+    SET_ENTIRE_ON,
+    SET_NORM_INV,
+    SET_DISP,
+    SET_DISP_START_LINE,
+    SET_SEG_REMAP,
+    SET_MUX_RATIO,
+    SET_COM_OUT_DIR,
+    SET_DISP_OFFSET,
+    SET_COM_PIN_CFG,
+    SET_DISP_CLK_DIV,
+    SET_PRECHARGE,
+    SET_VCOM_DESEL,
+)
+
+# register definitions
+SET_PAGE = const(0xB0)
+SET_COL_LOW = const(0x00)
+SET_COL_HIGH = const(0x10)
+SET_DC_DC = const(0xAD)
+
+# Columns of display memory - 128 wide panels show the middle ones
+RAM_WIDTH = 132
+
+
+class SH1106(SSD1306):
+    # No horizontal addressing mode - data writes stop at the end of a page,
+    # so frames are sent page by page, each after its page and column are
+    # set. No hardware scrolling either
+    def column_offset(self):
+        return (RAM_WIDTH - self.width) // 2
+
+    def init_display(self):
+        # Page, column low and high nibble - filled in place
+        self.page_cmds = bytearray(3)
+        self.write_cmds(
+            bytes(
+                (
+                    SET_DISP | 0x00,  # off
+                    # resolution and layout
+                    SET_DISP_CLK_DIV,
+                    0x80,
+                    SET_MUX_RATIO,
+                    self.height - 1,
+                    SET_DISP_OFFSET,
+                    0x00,
+                    SET_DISP_START_LINE | 0x00,
+                    SET_SEG_REMAP | 0x01,  # column addr 131 mapped to SEG0
+                    SET_COM_OUT_DIR | 0x08,  # scan from COM[N] to COM0
+                    SET_COM_PIN_CFG,
+                    0x02 if self.width > 2 * self.height else 0x12,
+                    # driving scheme - the DC-DC converter replaces the
+                    # SSD1306's charge pump
+                    SET_DC_DC,
+                    0x8A if self.external_vcc else 0x8B,
+                    SET_PRECHARGE,
+                    0x22 if self.external_vcc else 0xF1,
+                    SET_VCOM_DESEL,
+                    0x35,
+                    # display
+                    SET_CONTRAST,
+                    0xFF,  # maximum
+                    SET_ENTIRE_ON,  # output follows RAM contents
+                    SET_NORM_INV,  # not inverted
+                    SET_DISP | 0x01,  # on
+                )
+            )
+        )
+        self.center_text("loading...", None, None, 1)
+        self.show()
+
+    def show(self):
+        self.show_window(0, self.width - 1, 0, self.pages - 1)
+
+    def show_window(self, x0, x1, page0, page1, view=None):
+        # See SSD1306.show_window - a write per page
+        if view is None:
+            view = self.view
+        width = self.width
+        page_cmds = self.page_cmds
+        col = x0 + self.col_offset
+        page_cmds[1] = SET_COL_LOW | (col & 0x0F)
+        page_cmds[2] = SET_COL_HIGH | (col >> 4)
+        for page in range(page0, page1 + 1):
+            page_cmds[0] = SET_PAGE | page
+            self.write_cmds(page_cmds)
+            start = page * width
+            self.write_data(view[start + x0 : start + x1 + 1])
+
+    def scroll(self, direction, start_page, end_page, frames=5, vertical_offset=0):
+        return False
+
+    def stop_scroll(self):
+        pass
+
+
+class SH1106_I2C(SH1106):
+    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
+        self.i2c = i2c
+        super().__init__(width, height, external_vcc, I2CInterface(i2c, addr))
+
+
+class SH1106_SPI(SH1106):
+    def __init__(
+        self, width, height, spi, dc, res, cs, external_vcc=False, shared=False
+    ):
+        self.spi = spi
+        super().__init__(
+            width, height, external_vcc, SPIInterface(spi, dc, res, cs, shared)
+        )
@@ -22,54 +22,88 @@ SET_DISP_CLK_DIV = const(0xD5)
 SET_PRECHARGE = const(0xD9)
 SET_VCOM_DESEL = const(0xDB)
 SET_CHARGE_PUMP = const(0x8D)
+SET_HSCROLL = const(0x26)  # | direction - 0x26 right, 0x27 left
+SET_VHSCROLL = const(0x29)  # + direction - 0x29 right, 0x2A left
+SET_VSCROLL_AREA = const(0xA3)
+SET_SCROLL_OFF = const(0x2E)
+SET_SCROLL_ON = const(0x2F)
+
+# Scroll step intervals (display frames) as the controller encodes them
+SCROLL_FRAME_CODES = {5: 0, 64: 1, 128: 2, 256: 3, 3: 4, 4: 5, 25: 6, 2: 7}
 
 
 # Subclassing FrameBuffer provides support for graphics primitives
 # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
+# Panel drivers (this and sh1106.SH1106) send through an interface - the bus
+# the controller is on, see I2CInterface and SPIInterface
 class SSD1306(framebuf.FrameBuffer):
-    def __init__(self, width, height, external_vcc):
+    def __init__(self, width, height, external_vcc, interface=None):
+        if interface is not None:
+            # Bound once - no extra call per write
+            self.interface = interface
+            self.write_cmd = interface.write_cmd
+            self.write_cmds = interface.write_cmds
+            self.write_data = interface.write_data
         self.width = width
         self.height = height
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
+        self.view = memoryview(self.buffer)
+        # Sent as one batch each - filled in place
+        self.window_cmds = bytearray(6)
+        self.window_cmds[0] = SET_COL_ADDR
+        self.window_cmds[3] = SET_PAGE_ADDR
+        self.contrast_cmds = bytearray(2)
+        self.contrast_cmds[0] = SET_CONTRAST
+        self.col_offset = self.column_offset()
+        # Allocated the first time a background is saved
+        self.background = None
+        self.background_key = None
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.init_display()
 
+    def column_offset(self):
+        # displays with width of 64 pixels are shifted by 32
+        return 32 if self.width == 64 else 0
+
     def init_display(self):
-        for cmd in (
-            SET_DISP | 0x00,  # off
-            # address setting
-            SET_MEM_ADDR,
-            0x00,  # horizontal
-            # resolution and layout
-            SET_DISP_START_LINE | 0x00,
-            SET_SEG_REMAP | 0x01,  # column addr 127 mapped to SEG0
-            SET_MUX_RATIO,
-            self.height - 1,
-            SET_COM_OUT_DIR | 0x08,  # scan from COM[N] to COM0
-            SET_DISP_OFFSET,
-            0x00,
-            SET_COM_PIN_CFG,
-            0x02 if self.width > 2 * self.height else 0x12,
-            # timing and driving scheme
-            SET_DISP_CLK_DIV,
-            0x80,
-            SET_PRECHARGE,
-            0x22 if self.external_vcc else 0xF1,
-            SET_VCOM_DESEL,
-            0x30,  # 0.83*Vcc
-            # display
-            SET_CONTRAST,
-            0xFF,  # maximum
-            SET_ENTIRE_ON,  # output follows RAM contents
-            SET_NORM_INV,  # not inverted
-            # charge pump
-            SET_CHARGE_PUMP,
-            0x10 if self.external_vcc else 0x14,
-            SET_DISP | 0x01,
-        ):  # on
-            self.write_cmd(cmd)
+        self.write_cmds(
+            bytes(
+                (
+                    SET_DISP | 0x00,  # off
+                    # address setting
+                    SET_MEM_ADDR,
+                    0x00,  # horizontal
+                    # resolution and layout
+                    SET_DISP_START_LINE | 0x00,
+                    SET_SEG_REMAP | 0x01,  # column addr 127 mapped to SEG0
+                    SET_MUX_RATIO,
+                    self.height - 1,
+                    SET_COM_OUT_DIR | 0x08,  # scan from COM[N] to COM0
+                    SET_DISP_OFFSET,
+                    0x00,
+                    SET_COM_PIN_CFG,
+                    0x02 if self.width > 2 * self.height else 0x12,
+                    # timing and driving scheme
+                    SET_DISP_CLK_DIV,
+                    0x80,
+                    SET_PRECHARGE,
+                    0x22 if self.external_vcc else 0xF1,
+                    SET_VCOM_DESEL,
+                    0x30,  # 0.83*Vcc
+                    # display
+                    SET_CONTRAST,
+                    0xFF,  # maximum
+                    SET_ENTIRE_ON,  # output follows RAM contents
+                    SET_NORM_INV,  # not inverted
+                    # charge pump
+                    SET_CHARGE_PUMP,
+                    0x10 if self.external_vcc else 0x14,
+                    SET_DISP | 0x01,  # on
+                )
+            )
+        )
         self.center_text("loading...", None, None, 1)
         self.show()
 
@@ -80,27 +114,100 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_DISP | 0x01)
 
     def contrast(self, contrast):
-        self.write_cmd(SET_CONTRAST)
-        self.write_cmd(int(contrast))
+        self.contrast_cmds[1] = int(contrast)
+        self.write_cmds(self.contrast_cmds)
 
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
+    # Hardware scrolling - see GameDisplay.scroll
+    def scroll(self, direction, start_page, end_page, frames=5, vertical_offset=0):
+        frame_code = SCROLL_FRAME_CODES[frames]
+        if vertical_offset:
+            cmds = (
+                # The scroll has to be off while it is set up
+                SET_SCROLL_OFF,
+                # The whole screen rolls
+                SET_VSCROLL_AREA,
+                0,
+                self.height,
+                SET_VHSCROLL + direction,
+                0x00,
+                start_page,
+                frame_code,
+                end_page,
+                vertical_offset,
+                SET_SCROLL_ON,
+            )
+        else:
+            cmds = (
+                SET_SCROLL_OFF,
+                SET_HSCROLL | direction,
+                0x00,
+                start_page,
+                frame_code,
+                end_page,
+                0x00,
+                0xFF,
+                SET_SCROLL_ON,
+            )
+        self.write_cmds(bytes(cmds))
+        return True
+
+    def stop_scroll(self):
+        self.write_cmd(SET_SCROLL_OFF)
+
     def show(self):
-        x0 = 0
-        x1 = self.width - 1
-        if self.width == 64:
-            # displays with width of 64 pixels are shifted by 32
-            x0 += 32
-            x1 += 32
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
+        self.set_window()
         self.write_data(self.buffer)
 
+    def show_bands(self, dirty_x0, dirty_x1):
+        # Bands are pages - only their dirty columns are sent
+        for page in range(self.pages):
+            if dirty_x0[page] <= dirty_x1[page]:
+                self.show_window(dirty_x0[page], dirty_x1[page], page, page)
+
+    def show_window(self, x0, x1, page0, page1, view=None):
+        # Sends columns x0..x1 of pages page0..page1 - straight from the
+        # frame buffer (or a copy of it in view), page by page unless the
+        # rows are whole
+        self.set_window(x0, x1, page0, page1)
+        width = self.width
+        if view is None:
+            view = self.view
+        if x0 == 0 and x1 == width - 1:
+            self.write_data(view[page0 * width : (page1 + 1) * width])
+            return
+        for page in range(page0, page1 + 1):
+            start = page * width
+            self.write_data(view[start + x0 : start + x1 + 1])
+
+    def set_window(self, x0=0, x1=None, page0=0, page1=None):
+        # The whole screen by default - data writes fill the window page by
+        # page from the top left, so a frame can also be written in chunks
+        window_cmds = self.window_cmds
+        window_cmds[1] = x0 + self.col_offset
+        window_cmds[2] = (self.width - 1 if x1 is None else x1) + self.col_offset
+        window_cmds[4] = page0
+        window_cmds[5] = self.pages - 1 if page1 is None else page1
+        self.write_cmds(window_cmds)
+
+    # Static background layer - see GameDisplay
+    def save_background(self, key):
+        if self.background is None:
+            self.background = bytearray(len(self.buffer))
+        self.background[:] = self.buffer
+        self.background_key = key
+
+    def draw_background(self, key):
+        if key != self.background_key:
+            return False
+        self.buffer[:] = self.background
+        return True
+
+    def clear_background(self):
+        self.background_key = None
+
     # Assumes 8x8 pixel font
     def center_text(self, string, x, y, col):
         strlen = len(string) * 8
@@ -118,26 +225,30 @@ class SSD1306(framebuf.FrameBuffer):
         buf_dest.blit(buf_src, x, y)
 
 
-class SSD1306_I2C(SSD1306):
-    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
+class I2CInterface:
+    def __init__(self, i2c, addr=0x3C):
         self.i2c = i2c
         self.addr = addr
         self.temp = bytearray(2)
         self.write_list = [b"\x40", None]  # Co=0, D/C#=1
-        super().__init__(width, height, external_vcc)
+        self.cmds_list = [b"\x00", None]  # Co=0, D/C#=0 - a run of commands
 
     def write_cmd(self, cmd):
         self.temp[0] = 0x80  # Co=1, D/C#=0
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
 
+    def write_cmds(self, cmds):
+        self.cmds_list[1] = cmds
+        self.i2c.writevto(self.addr, self.cmds_list)
+
     def write_data(self, buf):
         self.write_list[1] = buf
         self.i2c.writevto(self.addr, self.write_list)
 
 
-class SSD1306_SPI(SSD1306):
-    def __init__(self, width, height, spi, dc, res, cs, external_vcc=False):
+class SPIInterface:
+    def __init__(self, spi, dc, res, cs, shared=False):
         self.rate = 10 * 1024 * 1024
         dc.init(dc.OUT, value=0)
         res.init(res.OUT, value=0)
@@ -146,6 +257,11 @@ class SSD1306_SPI(SSD1306):
         self.dc = dc
         self.res = res
         self.cs = cs
+        # Set up once - unless other devices on the bus may set it up their
+        # way, then before every transfer
+        self.shared = shared
+        spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cmd = bytearray(1)
         import time
 
         self.res(1)
@@ -153,20 +269,40 @@ class SSD1306_SPI(SSD1306):
         self.res(0)
         time.sleep_ms(10)
         self.res(1)
-        super().__init__(width, height, external_vcc)
 
     def write_cmd(self, cmd):
-        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
-        self.cs(1)
+        self.cmd[0] = cmd
+        self.write_cmds(self.cmd)
+
+    def write_cmds(self, cmds):
+        # One chip select for the lot
+        if self.shared:
+            self.spi.init(baudrate=self.rate, polarity=0, phase=0)
         self.dc(0)
         self.cs(0)
-        self.spi.write(bytearray([cmd]))
+        self.spi.write(cmds)
         self.cs(1)
 
     def write_data(self, buf):
-        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
-        self.cs(1)
+        if self.shared:
+            self.spi.init(baudrate=self.rate, polarity=0, phase=0)
         self.dc(1)
         self.cs(0)
         self.spi.write(buf)
         self.cs(1)
+
+
+class SSD1306_I2C(SSD1306):
+    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
+        self.i2c = i2c
+        super().__init__(width, height, external_vcc, I2CInterface(i2c, addr))
+
+
+class SSD1306_SPI(SSD1306):
+    def __init__(
+        self, width, height, spi, dc, res, cs, external_vcc=False, shared=False
+    ):
+        self.spi = spi
+        super().__init__(
+            width, height, external_vcc, SPIInterface(spi, dc, res, cs, shared)
+        )
@@ -0,0 +1,316 @@
+import sys
+import time
+
+# Stand-ins for MicroPython's machine module, and the framebuf and
+# micropython modules the drivers import, so the device's drivers run on
+# CPython. The buses record every transaction with the time it takes on the
+# wire at their clock - what a frame costs to send:
+#   from hardware.headless import fake_machine
+#   fake_machine.install()
+#   from hardware.esp32.ssd1306 import SSD1306_I2C
+#   i2c = fake_machine.SoftI2C(freq=4000000)
+#   display = SSD1306_I2C(128, 64, i2c)
+#   i2c.reset()
+#   display.show()
+#   print(i2c.transactions, i2c.bytes, i2c.wire_us)
+# Nothing is drawn - the frame buffer stays blank, what is sent does not
+# depend on the pixels
+
+# A byte takes 8 clocks on I2C plus the ACK, SPI only the 8
+I2C_BYTE_CLOCKS = 9
+SPI_BYTE_CLOCKS = 8
+# Start and stop conditions take about a clock each
+I2C_START_STOP_CLOCKS = 2
+
+
+class Bus:
+    def __init__(self, freq: int, keep_log: bool = False) -> None:
+        self.freq = freq
+        # (bytes, wire us) of every transaction when kept
+        self.log = [] if keep_log else None
+        self.reset()
+
+    def reset(self):
+        self.transactions = 0
+        self.bytes = 0
+        self.wire_us = 0
+        if self.log is not None:
+            self.log.clear()
+
+    def record(self, nbytes: int):
+        wire_us = self.wire_time_us(nbytes)
+        self.transactions += 1
+        self.bytes += nbytes
+        self.wire_us += wire_us
+        if self.log is not None:
+            self.log.append((nbytes, wire_us))
+
+    def wire_time_us(self, nbytes: int):
+        return 0
+
+
+class I2C(Bus):
+    # Devices answering a scan - the SSD1306 by default
+    def __init__(
+        self,
+        id=0,
+        *,
+        scl=None,
+        sda=None,
+        freq: int = 400000,
+        devices=(0x3C,),
+        keep_log: bool = False,
+    ) -> None:
+        self.devices = list(devices)
+        super().__init__(freq, keep_log)
+
+    def wire_time_us(self, nbytes: int):
+        # The address byte leads every transaction
+        clocks = (nbytes + 1) * I2C_BYTE_CLOCKS + I2C_START_STOP_CLOCKS
+        return clocks * 1_000_000 / self.freq
+
+    def scan(self):
+        return self.devices
+
+    def writeto(self, addr: int, buf, stop: bool = True):
+        self.record(len(buf))
+        # ACKs received
+        return len(buf)
+
+    def writevto(self, addr: int, vector, stop: bool = True):
+        nbytes = 0
+        for buf in vector:
+            nbytes += len(buf)
+        self.record(nbytes)
+        return nbytes
+
+
+class SoftI2C(I2C):
+    # Modelled at its nominal clock - bit banging may not reach it
+    pass
+
+
+class SPI(Bus):
+    def __init__(
+        self,
+        id=1,
+        baudrate: int = 1000000,
+        polarity: int = 0,
+        phase: int = 0,
+        *,
+        sck=None,
+        mosi=None,
+        miso=None,
+        keep_log: bool = False,
+    ) -> None:
+        super().__init__(baudrate, keep_log)
+        self.inits = 0
+
+    def reset(self):
+        super().reset()
+        self.inits = 0
+
+    def init(self, baudrate: int = None, polarity: int = 0, phase: int = 0, **kwargs):
+        self.inits += 1
+        if baudrate is not None:
+            self.freq = baudrate
+
+    def wire_time_us(self, nbytes: int):
+        return nbytes * SPI_BYTE_CLOCKS * 1_000_000 / self.freq
+
+    def write(self, buf):
+        self.record(len(buf))
+
+
+class SoftSPI(SPI):
+    pass
+
+
+class Pin:
+    IN = 1
+    OUT = 3
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 2
+    IRQ_RISING = 1
+
+    def __init__(self, id, mode: int = -1, pull: int = -1, value: int = None):
+        self.id = id
+        # Inputs with a pull up idle high - like a released button
+        self.level = 1 if pull == Pin.PULL_UP else 0
+        self.handler = None
+        self.trigger = 0
+        self.changes = 0
+        self.init(mode, pull, value)
+
+    def init(self, mode: int = -1, pull: int = -1, value: int = None):
+        if value is not None:
+            self.level = value
+
+    def value(self, value: int = None):
+        if value is None:
+            return self.level
+        self.drive(value)
+
+    def __call__(self, value: int = None):
+        return self.value(value)
+
+    def on(self):
+        self.drive(1)
+
+    def off(self):
+        self.drive(0)
+
+    def irq(self, handler=None, trigger: int = IRQ_FALLING | IRQ_RISING):
+        self.handler = handler
+        self.trigger = trigger
+
+    def drive(self, value: int):
+        # Sets the level from the outside (a button) or the driver - edges
+        # call the irq handler
+        value = 1 if value else 0
+        if value == self.level:
+            return
+        self.level = value
+        self.changes += 1
+        edge = Pin.IRQ_RISING if value else Pin.IRQ_FALLING
+        if self.handler is not None and self.trigger & edge:
+            self.handler(self)
+
+
+class PWM:
+    def __init__(self, pin: Pin, freq: int = 0, duty_u16: int = 0):
+        self.pin = pin
+        self.init(freq, duty_u16)
+
+    def init(self, freq: int = 0, duty_u16: int = 0):
+        self._freq = freq
+        self._duty_u16 = duty_u16
+
+    def freq(self, value: int = None):
+        if value is None:
+            return self._freq
+        self._freq = value
+
+    def duty_u16(self, value: int = None):
+        if value is None:
+            return self._duty_u16
+        self._duty_u16 = value
+
+    def deinit(self):
+        self._duty_u16 = 0
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    # Never fires by itself - fire() runs the callback
+    def __init__(self, id: int = -1):
+        self.id = id
+        self.callback = None
+
+    def init(self, mode: int = PERIODIC, freq=None, period=None, callback=None):
+        self.callback = callback
+
+    def deinit(self):
+        self.callback = None
+
+    def fire(self):
+        if self.callback is not None:
+            self.callback(self)
+
+
+class FrameBuffer:
+    # framebuf.FrameBuffer without the drawing
+    def __init__(self, buffer, width: int, height: int, format: int, stride=None):
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+        self.format = format
+
+    def fill(self, c):
+        pass
+
+    def pixel(self, x, y, c=None):
+        return 0
+
+    def hline(self, x, y, w, c):
+        pass
+
+    def vline(self, x, y, h, c):
+        pass
+
+    def line(self, x1, y1, x2, y2, c):
+        pass
+
+    def rect(self, x, y, w, h, c, f=False):
+        pass
+
+    def fill_rect(self, x, y, w, h, c):
+        pass
+
+    def text(self, s, x, y, c=1):
+        pass
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        pass
+
+    def scroll(self, xstep, ystep):
+        pass
+
+
+def const(value):
+    return value
+
+
+def ticks_ms():
+    return time.perf_counter_ns() // 1_000_000
+
+
+def ticks_us():
+    return time.perf_counter_ns() // 1000
+
+
+def ticks_diff(a, b):
+    return a - b
+
+
+def ticks_add(a, b):
+    return a + b
+
+
+def sleep_ms(ms):
+    time.sleep(ms / 1000)
+
+
+def sleep_us(us):
+    time.sleep(us / 1_000_000)
+
+
+def new_module(name: str, **attrs):
+    module = type(sys)(name)
+    for attr, value in attrs.items():
+        setattr(module, attr, value)
+    return module
+
+
+def install():
+    # Makes "import machine", "import framebuf" and "from micropython import
+    # const" find the stand-ins, and gives time the MicroPython functions the
+    # drivers and the device engine use
+    sys.modules["machine"] = sys.modules[__name__]
+    sys.modules["framebuf"] = new_module(
+        "framebuf", FrameBuffer=FrameBuffer, MONO_VLSB=0, MONO_HLSB=3, MONO_HMSB=4
+    )
+    sys.modules["micropython"] = new_module("micropython", const=const)
+    for name, func in (
+        ("ticks_ms", ticks_ms),
+        ("ticks_us", ticks_us),
+        ("ticks_diff", ticks_diff),
+        ("ticks_add", ticks_add),
+        ("sleep_ms", sleep_ms),
+        ("sleep_us", sleep_us),
+    ):
+        if not hasattr(time, name):
+            setattr(time, name, func)
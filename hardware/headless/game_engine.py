@@ -0,0 +1,98 @@
+from game_device import GameDevice, GameDisplay, GameTime, GameButton, GameAudio
+
+
+# Runs games without a screen, speaker or wall clock - used for benchmarks
+# and fast-forwarded simulations. Works on CPython and MicroPython's unix port.
+class HeadlessGameDisplay(GameDisplay):
+    def __init__(self, width: int = 128, height: int = 64):
+        self.width = width
+        self.height = height
+        self.background_key = None
+
+    def invert(self, is_on):
+        pass
+
+    # No pixels - only which background is saved, so games draw as they do
+    # on a screen
+    def save_background(self, key: int):
+        self.background_key = key
+
+    def draw_background(self, key: int) -> bool:
+        return key == self.background_key
+
+    def clear_background(self):
+        self.background_key = None
+
+
+class SimulatedTime(GameTime):
+    # A clock that only moves when the engine advances it - a frame takes
+    # no real time so simulations run as fast as the logic allows
+    def __init__(self, start_ms: int = 0) -> None:
+        self.now_ms = start_ms
+
+    def sleep_ms(self, ms):
+        self.now_ms += ms
+
+    def ticks_ms(self):
+        return self.now_ms
+
+    def ticks_us(self):
+        return self.now_ms * 1000
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+    def tick(self, fps):
+        self.now_ms += 1000 // fps
+
+
+class HeadlessButton(GameButton):
+    def __init__(self, time: GameTime = None) -> None:
+        self._value = 1
+        self.time = time
+        self._changed_at_ms = 0
+
+    def set_value(self, value):
+        if value != self._value and self.time is not None:
+            self._changed_at_ms = self.time.ticks_ms()
+        self._value = value
+
+    def value(self):
+        return self._value
+
+    def changed_at_ms(self):
+        if self.time is None:
+            return None
+        return self._changed_at_ms
+
+
+class GameEngine:
+    def __init__(self, fps: int = 24, width: int = 128, height: int = 64) -> None:
+        self.fps = fps
+        self.display = HeadlessGameDisplay(width, height)
+        self.time = SimulatedTime()
+        self.button = HeadlessButton(self.time)
+        self.audio = GameAudio()
+        self.device = GameDevice(self.time, self.display, self.button, self.audio)
+
+    def load(self, logic_gen):
+        self.logic = logic_gen(self.device)
+        self.logic.load()
+
+    def step(self):
+        self.logic.run_frame()
+        # Fast-forward the clock while the game waits
+        idle_ms = self.logic.idle_ms()
+        if idle_ms > 1000 // self.fps:
+            self.time.sleep_ms(idle_ms)
+        else:
+            self.time.tick(self.fps)
+
+    def run(self, max_frames: int = None):
+        self.running = True
+        frames = 0
+        while self.running and (max_frames is None or frames < max_frames):
+            self.step()
+            frames += 1
+            if self.logic.exit_requested:
+                return
@@ -2,13 +2,84 @@ from array import array
 import math
 import pygame
 from sys import exit
+import threading
 from typing import Type
-from game_device import GameDevice, GameDisplay, GameTime, GameButton, GameAudio
+from game_device import (
+    SCROLL_LEFT,
+    GameDevice,
+    GameDisplay,
+    GameTime,
+    GameButton,
+    GameAudio,
+)
+from async_loop import AsyncGameLoop, sleep_ms
 from game_logic import BaseGameLogic
 
+FPS = 30
+INPUT_POLL_MS = 10
+# How often the SSD1306 refreshes itself with the driver's clock settings -
+# hardware scroll steps are counted in these frames
+DISPLAY_FRAME_HZ = 88
+
+
+class BackgroundPresenter:
+    # Presents frames on a worker thread - show() only copies the frame into
+    # the back buffer, so scaling, the grid and the flip stay out of the game
+    # tick like on the device. A frame still waiting when the next one comes
+    # is replaced and counted as dropped
+    def __init__(self, display: "MockGameDisplay") -> None:
+        self.display = display
+        size = (display.width, display.height)
+        self.back_buffer = pygame.Surface(size)
+        self.front_buffer = pygame.Surface(size)
+        # (inverted, contrast level) of the frame in the back buffer
+        self.back_state = None
+        self.pending = False
+        self.running = True
+        self.frames_dropped = 0
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, buffer, inverted, contrast_level):
+        with self.condition:
+            if self.pending:
+                self.frames_dropped += 1
+            self.back_buffer.blit(buffer, (0, 0))
+            self.back_state = (inverted, contrast_level)
+            self.pending = True
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                self.back_buffer, self.front_buffer = (
+                    self.front_buffer,
+                    self.back_buffer,
+                )
+                inverted, contrast_level = self.back_state
+                self.pending = False
+            self.display.present(self.front_buffer, inverted, contrast_level)
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.thread.join()
+
 
 class MockGameDisplay(GameDisplay):
-    def __init__(self, width: int = 128, height: int = 64, scale: int = 5):
+    def __init__(
+        self,
+        width: int = 128,
+        height: int = 64,
+        scale: int = 5,
+        threaded: bool = False,
+    ):
         self.scale = scale
         self.width = width
         self.height = height
@@ -24,6 +95,18 @@ class MockGameDisplay(GameDisplay):
         self.contrast_mask = pygame.Surface([width, height])
         self.inverted = False
         self.contrast_level = 255
+        self.grid = None
+        self.background = pygame.Surface([width, height])
+        self.background_key = None
+        self.frames_shown = 0
+        # Hardware scroll emulation - the frame shown when it started and
+        # (start ms, direction, start page, end page, frames, vertical offset)
+        self.scroll_source = pygame.Surface([width, height])
+        self.scroll_buffer = pygame.Surface([width, height])
+        self.scroll_state = None
+        self.scroll_steps = 0
+        # Presents on a worker thread when set - see BackgroundPresenter
+        self.presenter = BackgroundPresenter(self) if threaded else None
         pygame.display.set_caption("Game Engine")
 
     def invert(self, is_on):
@@ -33,17 +116,78 @@ class MockGameDisplay(GameDisplay):
         self.contrast_level = int(min(max(0, contrast), 255))
 
     def show(self):
-        to_apply = self.buffer
-        if self.inverted:
+        self.send(self.buffer)
+
+    def send(self, surface):
+        if self.presenter is not None:
+            self.presenter.submit(surface, self.inverted, self.contrast_level)
+        else:
+            self.present(surface, self.inverted, self.contrast_level)
+
+    def scroll(self, direction, start_page, end_page, frames=5, vertical_offset=0):
+        # Moves the last frame shown like the SSD1306 - the engine calls
+        # refresh_scroll() every frame to present its steps
+        self.scroll_source.blit(self.buffer, (0, 0))
+        self.scroll_state = (
+            pygame.time.get_ticks(),
+            direction,
+            start_page,
+            end_page,
+            frames,
+            vertical_offset,
+        )
+        self.scroll_steps = 0
+        return True
+
+    def stop_scroll(self):
+        # The last step stays on screen until a frame is shown
+        self.scroll_state = None
+
+    def refresh_scroll(self):
+        if self.scroll_state is None:
+            return
+        started_ms, direction, start_page, end_page, frames, vertical_offset = (
+            self.scroll_state
+        )
+        steps = (
+            (pygame.time.get_ticks() - started_ms) * DISPLAY_FRAME_HZ // (1000 * frames)
+        )
+        if steps == self.scroll_steps:
+            return
+        self.scroll_steps = steps
+
+        source = self.scroll_source
+        scrolled = self.scroll_buffer
+        scrolled.blit(source, (0, 0))
+        width = self.width
+        shift = steps % width
+        if direction == SCROLL_LEFT:
+            shift = -shift
+        if shift:
+            # The pages move and wrap around
+            y = start_page * 8
+            band = pygame.Rect(0, y, width, (end_page - start_page + 1) * 8)
+            scrolled.blit(source, (shift, y), band)
+            scrolled.blit(
+                source, (shift - width if shift > 0 else shift + width, y), band
+            )
+        rows = steps * vertical_offset % self.height
+        if rows:
+            # Rolls up - the scrolled pages with the rest of the screen
+            rolled = scrolled.copy()
+            scrolled.blit(rolled, (0, -rows))
+            scrolled.blit(rolled, (0, self.height - rows))
+        self.send(scrolled)
+
+    def present(self, to_apply, inverted, contrast_level):
+        if inverted:
             self.inv_mask.fill(self.colors[1])
             self.inv_mask.blit(to_apply, (0, 0), None, pygame.BLEND_SUB)
             to_apply = self.inv_mask
 
-        if self.contrast_level < 255:
+        if contrast_level < 255:
             # factor = self.contrast_level / 255
-            self.contrast_mask.fill(
-                (self.contrast_level, self.contrast_level, self.contrast_level)
-            )
+            self.contrast_mask.fill((contrast_level, contrast_level, contrast_level))
             self.contrast_mask.blit(to_apply, (0, 0), None, pygame.BLEND_MULT)
             to_apply = self.contrast_mask
 
@@ -54,12 +198,46 @@ class MockGameDisplay(GameDisplay):
 
         # Pseudo pixel grid - for fun
         if self.scale > 4:
-            for i in range(0, self.screen.get_width()):
-                for j in range(0, self.screen.get_height()):
-                    if i % self.scale == 0 or j % self.scale == 0:
-                        self.screen.set_at((i, j), self.colors[0])
+            if self.grid is None:
+                self.grid = self.make_grid()
+            self.screen.blit(self.grid, (0, 0))
 
         pygame.display.flip()
+        self.frames_shown += 1
+
+    def make_grid(self):
+        # Lines on every scaled pixel edge - the rest is see-through
+        screen_w, screen_h = self.screen.get_size()
+        grid = pygame.Surface((screen_w, screen_h))
+        grid.fill(self.colors[1])
+        grid.set_colorkey(self.colors[1])
+        for x in range(0, screen_w, self.scale):
+            pygame.draw.line(grid, self.colors[0], (x, 0), (x, screen_h - 1))
+        for y in range(0, screen_h, self.scale):
+            pygame.draw.line(grid, self.colors[0], (0, y), (screen_w - 1, y))
+        return grid
+
+    def close(self):
+        if self.presenter is not None:
+            self.presenter.stop()
+            print(
+                "frames shown:{} dropped:{}".format(
+                    self.frames_shown, self.presenter.frames_dropped
+                )
+            )
+
+    def save_background(self, key: int):
+        self.background.blit(self.buffer, (0, 0))
+        self.background_key = key
+
+    def draw_background(self, key: int) -> bool:
+        if key != self.background_key:
+            return False
+        self.buffer.blit(self.background, (0, 0))
+        return True
+
+    def clear_background(self):
+        self.background_key = None
 
     def fill(self, col):
         self.buffer.fill(self.colors[col])
@@ -137,13 +315,21 @@ class MockTime(GameTime):
 class MockButton(GameButton):
     def __init__(self) -> None:
         self._value = 1
+        self._changed_at_ms = 0
 
     def set_value(self, value):
+        # Key events are handled as they arrive - stamp them then rather
+        # than at the next frame
+        if value != self._value:
+            self._changed_at_ms = pygame.time.get_ticks()
         self._value = value
 
     def value(self):
         return self._value
 
+    def changed_at_ms(self):
+        return self._changed_at_ms
+
 
 AUDIO_BIT_DEPTH = 8
 AUDIO_SAMPLE_RATE = 5512
@@ -210,12 +396,16 @@ class MockGameAudio(GameAudio):
         self.sounds.append(sound)
         return len(self.sounds) - 1
 
+    def unload_melodies(self):
+        pygame.mixer.stop()
+        self.sounds.clear()
+
 
 class GameEngine:
-    def __init__(self) -> None:
+    def __init__(self, threaded_show: bool = False) -> None:
         self.audio = MockGameAudio(mute=False)
         pygame.init()
-        self.display = MockGameDisplay(128, 64, 3)
+        self.display = MockGameDisplay(128, 64, 3, threaded_show)
         self.time = MockTime()
         self.button = MockButton()
         self.device = GameDevice(self.time, self.display, self.button, self.audio)
@@ -227,25 +417,61 @@ class GameEngine:
         self.logic = logic_gen(self.device)
         self.logic.load()
 
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    self.button.set_value(0)
+                elif event.key == pygame.K_ESCAPE:
+                    self.running = False
+            if event.type == pygame.KEYUP:
+                if event.key == pygame.K_SPACE:
+                    self.button.set_value(1)
+
     def run(self):
         self.running = True
 
         while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        self.button.set_value(0)
-                    elif event.key == pygame.K_ESCAPE:
-                        self.running = False
-                if event.type == pygame.KEYUP:
-                    if event.key == pygame.K_SPACE:
-                        self.button.set_value(1)
+            self.handle_events()
+
+            # Drop the frame rate while the game waits - events keep coming
+            idle_ms = self.logic.idle_ms()
+            if idle_ms > 1000 // FPS:
+                self.time.tick(1000 // idle_ms)
+            else:
+                self.time.tick(FPS)
 
-            self.time.tick(30)
+            self.logic.run_frame()
+            self.display.refresh_scroll()
+            if self.logic.exit_requested:
+                # Back to the launcher - the window stays
+                return
 
-            self.logic.game_tick()
+        self.display.close()
+        pygame.quit()
+        exit()
 
+
+class AsyncGameEngine(GameEngine):
+    # Runs the game on the same task loop as the device's AsyncGameEngine
+    # (async_loop.py) - for checking games behave the same on it. The mixer
+    # plays melodies by itself, so there is no audio task
+    async def input_task(self):
+        while self.running:
+            self.handle_events()
+            self.display.refresh_scroll()
+            await sleep_ms(INPUT_POLL_MS)
+        self.loop.running = False
+
+    def run(self):
+        self.running = True
+        self.loop = AsyncGameLoop(self.logic, self.display, self.time, FPS)
+        self.loop.run(self.input_task())
+        if self.logic.exit_requested:
+            # Back to the launcher - the window stays
+            return
+        self.display.close()
         pygame.quit()
         exit()
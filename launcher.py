@@ -0,0 +1,186 @@
+import gc
+import os
+import sys
+
+from game_device import GameDevice
+from game_logic import BaseGameLogic
+from profiler import boot_profiler
+
+try:
+    # MicroPython only
+    from gc import mem_free
+except ImportError:
+    mem_free = None
+
+# Every directory under it with a game.py is a game
+GAMES_DIR = "games"
+GAMES_PACKAGE = "games"
+# Holding the button this long in a game returns to the launcher - outside
+# its "play" phases, where a hold is a move (BaseGameLogic.run_frame)
+EXIT_HOLD_MS = 5000
+# A press held this long picks the game - shorter ones move to the next
+SELECT_HOLD_MS = 700
+
+MENU_TITLE_Y = 2
+MENU_ITEMS_Y = 16
+MENU_ITEM_PAD = 10
+MENU_ITEMS_X = 20
+
+
+def find_games(games_dir: str = GAMES_DIR):
+    names = []
+    for name in os.listdir(games_dir):
+        if name[0] in "._":
+            continue
+        try:
+            os.stat(games_dir + "/" + name + "/game.py")
+        except OSError:
+            continue
+        names.append(name)
+    names.sort()
+    return names
+
+
+def free_heap():
+    # None off the device
+    if mem_free is None:
+        return None
+    gc.collect()
+    return mem_free()
+
+
+class LauncherMenu(BaseGameLogic):
+    # The games by name - a short press moves to the next one, a long one
+    # picks it (once released, so the game doesn't start with it held)
+    def __init__(self, device: GameDevice, games) -> None:
+        super().__init__(device)
+        self.games = games
+        self.selected = None
+
+    def load(self):
+        self.phase = "menu"
+        self.selector_index = 0
+        # The press that left the last game may still be held
+        self.ignore_press = self.device.button.value() == 0
+        self.press_start_ms = None
+        self.redraw = True
+
+    def game_tick(self):
+        time = self.device.time
+        now = time.ticks_ms()
+        pressed = self.device.button.value() == 0
+        if self.ignore_press:
+            self.ignore_press = pressed
+        elif pressed:
+            if self.press_start_ms is None:
+                self.press_start_ms = now
+            elif self.selected is None:
+                if time.ticks_diff(now, self.press_start_ms) >= SELECT_HOLD_MS:
+                    self.selected = self.games[self.selector_index]
+                    self.redraw = True
+        elif self.press_start_ms is not None:
+            self.press_start_ms = None
+            if self.selected is not None:
+                self.exit_requested = True
+                return
+            self.selector_index = (self.selector_index + 1) % len(self.games)
+            self.redraw = True
+
+        if self.redraw:
+            self.redraw = False
+            self.draw()
+
+    def gc_allowed(self):
+        # Waiting for a press - not while one is timed
+        return self.press_start_ms is None
+
+    def draw(self):
+        display = self.device.display
+        display.fill(0)
+        display.center_text("Games", None, MENU_TITLE_Y, 1)
+        rows = (display.height - MENU_ITEMS_Y) // MENU_ITEM_PAD
+        first = max(0, self.selector_index - rows + 1)
+        y = MENU_ITEMS_Y
+        for index in range(first, min(len(self.games), first + rows)):
+            name = self.games[index]
+            display.text(name, MENU_ITEMS_X, y, 1)
+            if index == self.selector_index:
+                marker = "*" if self.selected is not None else ">"
+                display.text(marker, MENU_ITEMS_X - 12, y, 1)
+            y += MENU_ITEM_PAD
+        display.show()
+
+
+class Launcher:
+    # Runs the menu and the games it picks on one engine, one at a time. A
+    # game is imported when picked and unloaded when it exits - its modules
+    # leave sys.modules and the heap is collected, so the next game has the
+    # RAM to itself:
+    #   Launcher(GameEngine()).run()
+    # A game module can define unload() to drop what its modules cache
+    # beyond their own lifetime
+    def __init__(self, engine, games_dir: str = GAMES_DIR) -> None:
+        self.engine = engine
+        self.games = find_games(games_dir)
+
+    def run(self):
+        engine = self.engine
+        while True:
+            engine.load(lambda device: LauncherMenu(device, self.games))
+            boot_profiler.mark("menu load")
+            engine.run()
+            selected = engine.logic.selected
+            engine.logic = None
+            if selected is None:
+                # The engine was stopped
+                return
+            self.play(selected)
+
+    def play(self, name: str):
+        engine = self.engine
+        heap_before = free_heap()
+        # Timed up to the game's first frame, like the boot
+        boot_profiler.start(name)
+        module = __import__(
+            GAMES_PACKAGE + "." + name + ".game", None, None, ["GameLogic"]
+        )
+        boot_profiler.mark("import")
+        engine.load(module.GameLogic)
+        boot_profiler.mark("load")
+        del module
+        engine.logic.exit_hold_ms = EXIT_HOLD_MS
+        print("{} running - hold the button while not playing to exit".format(name))
+        engine.run()
+        engine.logic = None
+        self.reset_device(engine.device)
+        self.unload(name)
+        heap_after = free_heap()
+        if heap_before is not None:
+            print(
+                "{} unloaded - heap free before:{} after:{}".format(
+                    name, heap_before, heap_after
+                )
+            )
+
+    def reset_device(self, device: GameDevice):
+        # What a game may leave behind on the device
+        display = device.display
+        display.stop_scroll()
+        display.clear_background()
+        display.invert(0)
+        display.contrast(255)
+        device.audio.unload_melodies()
+
+    def unload(self, name: str):
+        package = GAMES_PACKAGE + "." + name
+        game_module = sys.modules.get(package + ".game")
+        if game_module is not None and hasattr(game_module, "unload"):
+            game_module.unload()
+        for module_name in list(sys.modules):
+            if module_name == package or module_name.startswith(package + "."):
+                del sys.modules[module_name]
+        # Imported submodules are also attributes of their package
+        games_package = sys.modules.get(GAMES_PACKAGE)
+        if games_package is not None and hasattr(games_package, name):
+            delattr(games_package, name)
+        gc.collect()
@@ -1,9 +1,19 @@
+from profiler import boot_profiler
+
+# Timed from here to the launcher's first frame - printed and kept in boot.log
+boot_profiler.start("boot")
+
 from hardware.esp32.game_engine import GameEngine
 
-Game = __import__("games.duel.game", globals(), locals(), ["GameLogic"])
+boot_profiler.mark("import game_engine")
+from launcher import Launcher
+
+boot_profiler.mark("import launcher")
 
 if __name__ == "__main__":
     print("Game Running")
     engine = GameEngine()
-    engine.load(Game.GameLogic)
-    engine.run()
+    boot_profiler.mark("hardware init")
+    launcher = Launcher(engine)
+    boot_profiler.mark("find games")
+    launcher.run()
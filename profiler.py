@@ -0,0 +1,298 @@
+import gc
+import sys
+import time
+
+try:
+    # MicroPython only
+    from gc import mem_alloc, mem_free
+except ImportError:
+    mem_alloc = None
+    mem_free = None
+
+try:
+    # MicroPython only
+    from time import ticks_us, ticks_diff
+except ImportError:
+
+    def ticks_us():
+        return time.perf_counter_ns() // 1000
+
+    def ticks_diff(a, b):
+        return a - b
+
+
+# Upper bounds (us) of the frame start jitter histogram buckets - the last
+# bucket takes everything above
+JITTER_BUCKETS_US = (250, 500, 1000, 2000, 4000, 8000)
+
+# A collection is run in a frame's slack (see MemoryMonitor.collect_if_idle)
+# once this much was allocated since the last one - and only with this much
+# slack, what a collection of the ESP32's heap takes
+IDLE_GC_MIN_ALLOC_BYTES = 8192
+IDLE_GC_MIN_SLACK_US = 10000
+
+# The last boot's profile on the device - game starts are appended to it
+BOOT_LOG_FILE = "boot.log"
+
+
+class BootProfiler:
+    # Times the phases of a start up - imports, hardware set up, loading -
+    # up to the first frame shown, then prints them and writes them to the
+    # log file:
+    #   boot_profiler.start("boot")
+    #   import ...
+    #   boot_profiler.mark("imports")
+    # The first frame is noted by the FrameProfiler of the engine running it.
+    # Marks do nothing while no start up is being profiled
+    def __init__(self, log_file: str = BOOT_LOG_FILE) -> None:
+        self.log_file = log_file
+        self.log_mode = "w"
+        self.running = False
+        self.name = None
+        self.phases = []
+
+    def start(self, name: str):
+        self.name = name
+        self.running = True
+        self.phases.clear()
+        self.start_us = self.last_us = ticks_us()
+        if name == "boot" and sys.platform == "esp32":
+            # The clock starts at reset - the interpreter and boot.py ran
+            self.phases.append(("reset", self.start_us))
+            self.start_us = 0
+
+    def mark(self, phase: str):
+        # Ends the phase - it took the time since the last mark
+        if not self.running:
+            return
+        now_us = ticks_us()
+        self.phases.append((phase, ticks_diff(now_us, self.last_us)))
+        self.last_us = now_us
+
+    def first_frame(self):
+        if not self.running:
+            return
+        self.mark("first frame")
+        self.running = False
+        self.report()
+
+    def lines(self):
+        lines = ["{} phases (ms):".format(self.name)]
+        for phase, phase_us in self.phases:
+            lines.append("  {}: {:.1f}".format(phase, phase_us / 1000))
+        lines.append(
+            "{} to first frame: {:.1f} ms".format(
+                self.name, ticks_diff(self.last_us, self.start_us) / 1000
+            )
+        )
+        return lines
+
+    def report(self):
+        lines = self.lines()
+        for line in lines:
+            print(line)
+        if self.log_file is None:
+            return
+        try:
+            with open(self.log_file, self.log_mode) as f:
+                f.write("\n".join(lines) + "\n")
+            self.log_mode = "a"
+        except OSError as e:
+            print("boot log not written:", e)
+
+
+boot_profiler = BootProfiler()
+
+
+class MemoryMonitor:
+    # Samples the heap once per frame - the allocations of each frame are
+    # counted under the game's phase (logic.phase), collections are found
+    # by the heap shrinking and timed. Lives as long as its engine, across
+    # games - engines start over when loading one:
+    #   memory.reset_phases()
+    #   memory.resync()
+    #   logic.load()
+    #   memory.sample("load")
+    # Off MicroPython only collections and their pauses are counted
+    def __init__(self, time) -> None:
+        self.time = time
+        # Per phase [frames, allocated bytes, collections]
+        self.phases = {}
+        self.gc_start_us = 0
+        if mem_alloc is None:
+            # CPython - get notified by the collector itself
+            gc.callbacks.append(self.on_gc)
+        self.reset_window()
+        self.resync()
+
+    def on_gc(self, phase, info):
+        if phase == "start":
+            self.gc_start_us = self.time.ticks_us()
+        else:
+            self.collected(self.time.ticks_diff(self.time.ticks_us(), self.gc_start_us))
+
+    def reset_window(self):
+        self.window_collections = 0
+        self.window_idle_collections = 0
+        self.window_alloc_bytes = 0
+        self.window_max_pause_us = 0
+        self.window_pause_us = 0
+        self.window_min_free = mem_free() if mem_free is not None else 0
+
+    def reset_phases(self):
+        self.phases.clear()
+
+    def resync(self):
+        # What was allocated since the last sample is not counted
+        if mem_alloc is not None:
+            self.last_mem_alloc = mem_alloc()
+            self.collected_alloc = self.last_mem_alloc
+
+    def collected(self, pause_us: int):
+        self.window_collections += 1
+        self.window_pause_us += pause_us
+        if pause_us > self.window_max_pause_us:
+            self.window_max_pause_us = pause_us
+
+    def sample(self, phase, frame_us: int = 0):
+        # Counts what was allocated since the last sample under phase. A
+        # collection found here paused the frame - on MicroPython the
+        # frame's time (frame_us) stands for the pause
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = [0, 0, 0]
+        stats[0] += 1
+        if mem_alloc is None:
+            return
+        curr_mem_alloc = mem_alloc()
+        if curr_mem_alloc < self.last_mem_alloc:
+            # The heap only shrinks when a collection ran since the last one
+            self.collected(frame_us)
+            self.collected_alloc = curr_mem_alloc
+            stats[2] += 1
+        else:
+            alloc_bytes = curr_mem_alloc - self.last_mem_alloc
+            self.window_alloc_bytes += alloc_bytes
+            stats[1] += alloc_bytes
+        self.last_mem_alloc = curr_mem_alloc
+        curr_mem_free = mem_free()
+        if curr_mem_free < self.window_min_free:
+            self.window_min_free = curr_mem_free
+
+    def collect_if_idle(self, logic, slack_us: int):
+        # Collects while the game says one goes unnoticed (logic.gc_allowed)
+        # and the frame has the slack for it - rather than have the heap
+        # fill up and the collection land mid-action. Returns whether it did
+        if mem_alloc is None or slack_us < IDLE_GC_MIN_SLACK_US:
+            return False
+        if mem_alloc() - self.collected_alloc < IDLE_GC_MIN_ALLOC_BYTES:
+            return False
+        if not logic.gc_allowed():
+            return False
+        time = self.time
+        start_us = time.ticks_us()
+        gc.collect()
+        self.collected(time.ticks_diff(time.ticks_us(), start_us))
+        self.window_idle_collections += 1
+        self.resync()
+        return True
+
+    def report(self):
+        print(
+            f"gc:{self.window_collections}"
+            f" idle:{self.window_idle_collections}"
+            f" pause(us) max:{self.window_max_pause_us}"
+            f" total:{self.window_pause_us}"
+            + (f" heap free min:{self.window_min_free}" if mem_free else "")
+        )
+        if mem_alloc is not None:
+            print(
+                "alloc/frame by phase "
+                + " ".join(
+                    f"{phase}:{stats[1] // stats[0]}(gc:{stats[2]})"
+                    for phase, stats in self.phases.items()
+                )
+            )
+
+
+class FrameProfiler:
+    def __init__(self, time, report_every_frames: int = 200, memory=None) -> None:
+        self.time = time
+        self.report_every_frames = report_every_frames
+        # The engine's monitor - kept across its games
+        self.memory = memory if memory is not None else MemoryMonitor(time)
+        self.jitter_counts = [0] * (len(JITTER_BUCKETS_US) + 1)
+        self.frame_start_us = None
+        # The start up being profiled ends with the first frame
+        self.startup = boot_profiler if boot_profiler.running else None
+        self.reset_window()
+
+    def reset_window(self):
+        self.frame_count = 0
+        self.window_skipped_frames = 0
+        self.window_max_jitter_us = 0
+        jitter_counts = self.jitter_counts
+        for i in range(len(jitter_counts)):
+            jitter_counts[i] = 0
+        self.memory.reset_window()
+        self.memory.resync()
+        self.anchor_us = self.time.ticks_us()
+
+    def frame_started(self, late_us: int):
+        # How far from its deadline a frame started - early or late
+        self.frame_start_us = self.time.ticks_us()
+        if late_us < 0:
+            late_us = -late_us
+        bucket = 0
+        for bound_us in JITTER_BUCKETS_US:
+            if late_us <= bound_us:
+                break
+            bucket += 1
+        self.jitter_counts[bucket] += 1
+        if late_us > self.window_max_jitter_us:
+            self.window_max_jitter_us = late_us
+
+    def frames_skipped(self, count: int):
+        self.window_skipped_frames += count
+
+    def frame_done(self, phase=None):
+        # phase - what the game did in the frame (logic.phase)
+        self.frame_count += 1
+        if self.startup is not None:
+            self.startup.first_frame()
+            self.startup = None
+
+        if self.frame_start_us is None:
+            frame_us = 0
+        else:
+            frame_us = self.time.ticks_diff(self.time.ticks_us(), self.frame_start_us)
+        self.memory.sample(phase, frame_us)
+
+        if self.frame_count == self.report_every_frames:
+            self.report()
+            # Start a fresh window - also excludes the report's own allocations
+            self.reset_window()
+
+    def collect_if_idle(self, logic, slack_us: int):
+        return self.memory.collect_if_idle(logic, slack_us)
+
+    def report(self):
+        time = self.time
+        elapsed_us = time.ticks_diff(time.ticks_us(), self.anchor_us)
+        print(
+            f"fps:{1_000_000 / (elapsed_us / self.frame_count)}"
+            f" alloc/frame:{self.memory.window_alloc_bytes // self.frame_count}"
+        )
+        self.memory.report()
+        if self.window_max_jitter_us or self.window_skipped_frames:
+            jitter_counts = self.jitter_counts
+            print(
+                "jitter(us) "
+                + " ".join(
+                    f"<={bound_us}:{jitter_counts[i]}"
+                    for i, bound_us in enumerate(JITTER_BUCKETS_US)
+                )
+                + f" >{JITTER_BUCKETS_US[-1]}:{jitter_counts[-1]}"
+                f" max:{self.window_max_jitter_us}"
+                f" skipped:{self.window_skipped_frames}"
+            )
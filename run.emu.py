@@ -1,8 +1,22 @@
-from hardware.pygame.game_engine import GameEngine
+import sys
 
-Game = __import__("games.duel.game", globals(), locals(), ["GameLogic"])
+from hardware.pygame.game_engine import AsyncGameEngine, GameEngine
+from launcher import Launcher
 
 if __name__ == "__main__":
-    engine = GameEngine()
-    engine.load(Game.GameLogic)
-    engine.run()
+    # A game name (a directory under games/) runs it right away - the
+    # launcher picks one otherwise
+    # --async runs the game on the task loop the device can use (async_loop.py)
+    # --threaded-show presents frames on a worker thread
+    threaded_show = "--threaded-show" in sys.argv
+    names = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if "--async" in sys.argv:
+        engine = AsyncGameEngine(threaded_show)
+    else:
+        engine = GameEngine(threaded_show)
+    if names:
+        Game = __import__("games." + names[0] + ".game", None, None, ["GameLogic"])
+        engine.load(Game.GameLogic)
+        engine.run()
+    else:
+        Launcher(engine).run()
@@ -0,0 +1,233 @@
+# Retained drawing - entities keep sprites in a scene and update their
+# positions each frame instead of drawing. The scene redraws only what changed
+# since the last frame (or nothing at all) and tells the display which parts
+# of the screen to send.
+
+# Sprite kinds - what data holds
+SPRITE_BLIT = 0  # a display buffer (GameDisplayAsset.buffer)
+SPRITE_RECT = 1  # nothing - a filled rect
+SPRITE_TEXT = 2  # the string - 8x8 pixel font
+
+# Dirty areas are tracked per band of 8 rows - a display page on the device
+BAND_HEIGHT = 8
+
+
+class Sprite:
+    __slots__ = (
+        "kind",
+        "z",
+        "data",
+        "x",
+        "y",
+        "w",
+        "h",
+        "visible",
+        "drawn_data",
+        "drawn_x",
+        "drawn_y",
+        "drawn_w",
+        "drawn_h",
+        "drawn_visible",
+        "redraw",
+    )
+
+    def __init__(self, kind: int, z: int, data=None, w: int = 0, h: int = 0):
+        self.kind = kind
+        # Higher z draws on top
+        self.z = z
+        self.data = data
+        self.x = 0
+        self.y = 0
+        self.w = w
+        self.h = h
+        self.visible = False
+        # What the screen shows - compared with the above on render
+        self.drawn_data = None
+        self.drawn_x = 0
+        self.drawn_y = 0
+        self.drawn_w = 0
+        self.drawn_h = 0
+        self.drawn_visible = False
+        self.redraw = False
+
+    def show_at(self, x: int, y: int):
+        self.x = x
+        self.y = y
+        self.visible = True
+
+    def set_text(self, text: str):
+        # Changes are found by identity - keep the drawn string when equal
+        if text == self.data:
+            return
+        self.data = text
+        self.w = len(text) * 8
+        self.h = 8
+
+    def set_asset(self, asset):
+        self.data = asset.buffer
+        self.w = asset.w
+        self.h = asset.h
+
+    def is_shown(self):
+        return self.visible and self.w > 0 and self.h > 0
+
+    def was_shown(self):
+        return self.drawn_visible and self.drawn_w > 0 and self.drawn_h > 0
+
+    def changed(self):
+        if self.is_shown() != self.was_shown():
+            return True
+        if not self.visible:
+            return False
+        return (
+            self.x != self.drawn_x
+            or self.y != self.drawn_y
+            or self.w != self.drawn_w
+            or self.h != self.drawn_h
+            or self.data is not self.drawn_data
+        )
+
+    def commit(self):
+        self.drawn_data = self.data
+        self.drawn_x = self.x
+        self.drawn_y = self.y
+        self.drawn_w = self.w
+        self.drawn_h = self.h
+        self.drawn_visible = self.visible
+
+
+class Scene:
+    def __init__(self, display) -> None:
+        self.display = display
+        self.width = display.width
+        self.bands = (display.height + BAND_HEIGHT - 1) // BAND_HEIGHT
+        # Sorted by z
+        self.sprites = []
+        # Dirty columns of each band - first > last when the band is clean
+        self.dirty_x0 = [0] * self.bands
+        self.dirty_x1 = [0] * self.bands
+        self.invalidate()
+
+    def add(self, sprite: Sprite):
+        # After the sprites with the same z - they draw in the order added
+        i = len(self.sprites)
+        while i > 0 and self.sprites[i - 1].z > sprite.z:
+            i -= 1
+        self.sprites.insert(i, sprite)
+        sprite.drawn_visible = False
+
+    def remove(self, sprite: Sprite):
+        if sprite in self.sprites:
+            self.sprites.remove(sprite)
+            if sprite.was_shown():
+                self.mark(
+                    sprite.drawn_x, sprite.drawn_y, sprite.drawn_w, sprite.drawn_h
+                )
+
+    def clear(self):
+        self.sprites.clear()
+        self.invalidate()
+
+    def invalidate(self):
+        # Redraw everything - after the screen was drawn outside the scene
+        for band in range(self.bands):
+            self.dirty_x0[band] = 0
+            self.dirty_x1[band] = self.width - 1
+
+    def reset_dirty(self):
+        for band in range(self.bands):
+            self.dirty_x0[band] = self.width
+            self.dirty_x1[band] = -1
+
+    def mark(self, x: int, y: int, w: int, h: int):
+        x0 = x if x > 0 else 0
+        x1 = x + w - 1
+        if x1 >= self.width:
+            x1 = self.width - 1
+        if x1 < x0:
+            return
+        first_band = y // BAND_HEIGHT
+        if first_band < 0:
+            first_band = 0
+        last_band = (y + h - 1) // BAND_HEIGHT
+        if last_band >= self.bands:
+            last_band = self.bands - 1
+        dirty_x0 = self.dirty_x0
+        dirty_x1 = self.dirty_x1
+        for band in range(first_band, last_band + 1):
+            if x0 < dirty_x0[band]:
+                dirty_x0[band] = x0
+            if x1 > dirty_x1[band]:
+                dirty_x1[band] = x1
+
+    def overlaps_dirty(self, x: int, y: int, w: int, h: int):
+        first_band = max(0, y // BAND_HEIGHT)
+        last_band = min(self.bands - 1, (y + h - 1) // BAND_HEIGHT)
+        x1 = x + w - 1
+        for band in range(first_band, last_band + 1):
+            if x <= self.dirty_x1[band] and x1 >= self.dirty_x0[band]:
+                return True
+        return False
+
+    def render(self):
+        # Returns False when nothing changed - the frame can be skipped
+        sprites = self.sprites
+        for sprite in sprites:
+            if sprite.changed():
+                if sprite.was_shown():
+                    self.mark(
+                        sprite.drawn_x, sprite.drawn_y, sprite.drawn_w, sprite.drawn_h
+                    )
+                if sprite.is_shown():
+                    self.mark(sprite.x, sprite.y, sprite.w, sprite.h)
+                    sprite.redraw = True
+                sprite.commit()
+
+        dirty_x0 = self.dirty_x0
+        dirty_x1 = self.dirty_x1
+        band = 0
+        while band < self.bands and dirty_x1[band] < dirty_x0[band]:
+            band += 1
+        if band == self.bands:
+            return False
+
+        # A sprite redrawn over the dirty area can reach out of it - grow the
+        # area until it holds every sprite it touches, so those are redrawn
+        # in z order too
+        growing = True
+        while growing:
+            growing = False
+            for sprite in sprites:
+                if (
+                    not sprite.redraw
+                    and sprite.is_shown()
+                    and self.overlaps_dirty(sprite.x, sprite.y, sprite.w, sprite.h)
+                ):
+                    sprite.redraw = True
+                    self.mark(sprite.x, sprite.y, sprite.w, sprite.h)
+                    growing = True
+
+        display = self.display
+        for band in range(self.bands):
+            if dirty_x0[band] <= dirty_x1[band]:
+                display.fill_rect(
+                    dirty_x0[band],
+                    band * BAND_HEIGHT,
+                    dirty_x1[band] - dirty_x0[band] + 1,
+                    BAND_HEIGHT,
+                    0,
+                )
+        for sprite in sprites:
+            if sprite.redraw:
+                kind = sprite.kind
+                if kind == SPRITE_BLIT:
+                    display.blit(sprite.data, sprite.x, sprite.y)
+                elif kind == SPRITE_RECT:
+                    display.fill_rect(sprite.x, sprite.y, sprite.w, sprite.h, 1)
+                else:
+                    display.text(sprite.data, sprite.x, sprite.y, 1)
+                sprite.redraw = False
+
+        display.show_bands(dirty_x0, dirty_x1)
+        self.reset_dirty()
+        return True
@@ -0,0 +1,92 @@
+# Times what the device does before each game's first frame - the game's
+# import, its load() and the first frame - on a headless device, started and
+# unloaded by the launcher as on the device. Also the slowest of the frames
+# after it, where whatever a game defers to lands. Run from the repo root:
+#   micropython -m tools.bench_boot [runs] [game]
+#   python -m tools.bench_boot [runs] [game]
+# The unix port times the imports as the device runs them (the bytecode
+# compiler included) - only at its CPU's speed
+import sys
+
+from profiler import BootProfiler, ticks_us, ticks_diff
+
+boot_profile = BootProfiler(None)
+boot_profile.start("boot")
+
+from hardware.headless.game_engine import GameEngine
+
+boot_profile.mark("import engine")
+from launcher import Launcher
+
+boot_profile.mark("import launcher")
+
+# Frames timed after the first one
+LATER_FRAMES = 100
+
+
+def bench(launcher: Launcher, name: str, runs: int):
+    engine = launcher.engine
+    profile = BootProfiler(None)
+    # Per phase - in the order timed
+    phase_names = []
+    phase_totals_us = []
+    slowest_later_us = 0
+    for _ in range(runs):
+        profile.start(name)
+        module = __import__("games." + name + ".game", None, None, ["GameLogic"])
+        profile.mark("import")
+        engine.load(module.GameLogic)
+        profile.mark("load")
+        del module
+        engine.step()
+        profile.mark("first frame")
+        for _ in range(LATER_FRAMES):
+            frame_start_us = ticks_us()
+            engine.step()
+            frame_us = ticks_diff(ticks_us(), frame_start_us)
+            if frame_us > slowest_later_us:
+                slowest_later_us = frame_us
+
+        for i, (phase, phase_us) in enumerate(profile.phases):
+            if i == len(phase_names):
+                phase_names.append(phase)
+                phase_totals_us.append(0)
+            phase_totals_us[i] += phase_us
+        engine.logic = None
+        launcher.reset_device(engine.device)
+        launcher.unload(name)
+
+    return phase_names, phase_totals_us, slowest_later_us
+
+
+def main(runs: int, names):
+    engine = GameEngine()
+    launcher = Launcher(engine)
+    boot_profile.mark("engine and launcher")
+    if names is None:
+        names = launcher.games
+    results = [(name, bench(launcher, name, runs)) for name in names]
+
+    # After everything the games print
+    print("boot (once):")
+    for phase, phase_us in boot_profile.phases:
+        print("  {}: {:.1f} ms".format(phase, phase_us / 1000))
+    for name, (phase_names, phase_totals_us, slowest_later_us) in results:
+        print("{} (mean of {} runs):".format(name, runs))
+        total_us = 0
+        for phase, phase_total_us in zip(phase_names, phase_totals_us):
+            total_us += phase_total_us
+            print("  {}: {:.1f} ms".format(phase, phase_total_us / runs / 1000))
+        print("  to first frame: {:.1f} ms".format(total_us / runs / 1000))
+        print(
+            "  slowest of the next {} frames: {:.1f} ms".format(
+                LATER_FRAMES, slowest_later_us / 1000
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+        [sys.argv[2]] if len(sys.argv) > 2 else None,
+    )
@@ -0,0 +1,91 @@
+# Measures what each game's frames cost to send to the display - the SSD1306
+# driver runs against the recording buses of hardware/headless/fake_machine.py
+# while the game plays on a headless device with a random button.
+# Run from the repo root:
+#   python -m tools.bench_bus [game] [frames] [seed]
+import contextlib
+import io
+import sys
+import random
+
+from hardware.headless import fake_machine
+
+fake_machine.install()
+
+from hardware.esp32.ssd1306 import SSD1306_I2C, SSD1306_SPI
+from hardware.headless.game_engine import GameEngine
+
+GAMES = {
+    "duel": "games.duel.game",
+    "morse": "games.morse.game",
+}
+
+# (name, makes the display and returns the bus it sends on)
+BUSES = (
+    (
+        "SoftI2C 4MHz",
+        lambda: SSD1306_I2C(128, 64, fake_machine.SoftI2C(freq=4_000_000)),
+    ),
+    ("I2C 400kHz", lambda: SSD1306_I2C(128, 64, fake_machine.I2C(freq=400_000))),
+    (
+        "SPI 10MHz",
+        lambda: SSD1306_SPI(
+            128,
+            64,
+            fake_machine.SPI(baudrate=10 * 1024 * 1024),
+            fake_machine.Pin(16),
+            fake_machine.Pin(17),
+            fake_machine.Pin(5),
+        ),
+    ),
+)
+
+
+def display_bus(display):
+    if hasattr(display, "i2c"):
+        return display.i2c
+    return display.spi
+
+
+def bench(game: str, frames: int, seed: int):
+    module = __import__(GAMES[game], None, None, ["GameLogic"])
+    for name, make_display in BUSES:
+        random.seed(seed)
+        engine = GameEngine()
+        display = make_display()
+        engine.display = engine.device.display = display
+        bus = display_bus(display)
+        frame = 0
+        # Only the numbers - not what the games print
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine.load(module.GameLogic)
+            bus.reset()
+            # Held and released for a random number of frames
+            while frame < frames:
+                engine.button.set_value(1 - engine.button.value())
+                for _ in range(random.randint(1, 40)):
+                    engine.step()
+                    frame += 1
+
+        wire_ms = bus.wire_us / 1000
+        print(
+            "{} {}: transactions/frame:{:.1f} bytes/frame:{:.0f} "
+            "wire ms/frame:{:.2f} bus bound fps:{:.0f}".format(
+                game,
+                name,
+                bus.transactions / frame,
+                bus.bytes / frame,
+                wire_ms / frame,
+                frame * 1000 / wire_ms if wire_ms else 0,
+            )
+        )
+
+
+if __name__ == "__main__":
+    games = [sys.argv[1]] if len(sys.argv) > 1 and sys.argv[1] != "all" else GAMES
+    for game in games:
+        bench(
+            game,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 3000,
+            int(sys.argv[3]) if len(sys.argv) > 3 else 0,
+        )
@@ -0,0 +1,57 @@
+# Measures the per-tick cost of duel (play + move + draw) on a headless device
+# Run from the repo root:
+#   python -m tools.bench_duel_tick [ticks] [seed]
+#   micropython -m tools.bench_duel_tick [ticks] [seed]
+# tools/bench_duel_tick_ref.sh runs it on the float physics it replaced too
+import sys
+import random
+
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:
+    from time import perf_counter_ns
+
+    def ticks_us():
+        return perf_counter_ns() // 1000
+
+    def ticks_diff(a, b):
+        return a - b
+
+
+from hardware.headless.game_engine import GameEngine
+from games.duel.game import GameLogic
+from games.duel.simulation import start_bot_round, is_round_over
+
+
+def bench(ticks: int, seed: int):
+    random.seed(seed)
+    engine = GameEngine()
+    engine.load(GameLogic)
+    logic = engine.logic
+    start_bot_round(logic)
+
+    tick_times_us = []
+    rounds = 1
+    for _ in range(ticks):
+        tick_start_us = ticks_us()
+        logic.game_tick()
+        tick_times_us.append(ticks_diff(ticks_us(), tick_start_us))
+        engine.time.tick(engine.fps)
+        if is_round_over(logic):
+            start_bot_round(logic)
+            rounds += 1
+
+    tick_times_us.sort()
+    total_us = sum(tick_times_us)
+    print(f"ticks:{ticks} rounds:{rounds}")
+    print(f"mean us/tick:{total_us / ticks}")
+    print(f"p50 us/tick:{tick_times_us[ticks // 2]}")
+    print(f"p99 us/tick:{tick_times_us[ticks * 99 // 100]}")
+    print(f"max us/tick:{tick_times_us[-1]}")
+
+
+if __name__ == "__main__":
+    bench(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 0,
+    )
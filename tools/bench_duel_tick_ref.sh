@@ -0,0 +1,34 @@
+#!/bin/sh
+# Runs tools/bench_duel_tick.py on duel as it was before its physics moved to
+# 8.8 fixed point (floats), right after it and on the working tree - the same
+# workload on the same interpreter. Run from the repo root:
+#   tools/bench_duel_tick_ref.sh [ticks] [seed]
+#   MICROPYTHON=python tools/bench_duel_tick_ref.sh [ticks] [seed]
+# The float tree is the parent of the commit adding the benchmark, with the
+# benchmark and the headless backend it runs on taken from that commit
+set -e
+
+MICROPYTHON=${MICROPYTHON:-micropython}
+TICKS=${1:-5000}
+SEED=${2:-0}
+
+BENCH_REV=$(git log --diff-filter=A --format=%H -- tools/bench_duel_tick.py | tail -1)
+REF_DIR=$(mktemp -d)
+trap 'rm -rf "$REF_DIR"' EXIT
+
+bench_rev() {
+    # bench_rev <label> <tree rev>
+    rm -rf "$REF_DIR"/*
+    git archive "$2" | tar -x -C "$REF_DIR"
+    git archive "$BENCH_REV" \
+        tools/bench_duel_tick.py \
+        hardware/headless/game_engine.py \
+        games/duel/simulation.py | tar -x -C "$REF_DIR"
+    echo "$1 ($(git rev-parse --short "$2")):"
+    (cd "$REF_DIR" && "$MICROPYTHON" -m tools.bench_duel_tick "$TICKS" "$SEED")
+}
+
+bench_rev floats "$BENCH_REV^"
+bench_rev "fixed point" "$BENCH_REV"
+echo "working tree:"
+"$MICROPYTHON" -m tools.bench_duel_tick "$TICKS" "$SEED"
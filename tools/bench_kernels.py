@@ -0,0 +1,267 @@
+# Checks that duel's native kernels (games/duel/kernels_native.py) agree with
+# the plain Python ones (kernels_python.py) and times both, and that the
+# native melody timer callback (tim_cb) plays melodies as written. Run from
+# the repo root:
+#   micropython -m tools.bench_kernels [calls] [seed]
+#   python -m tools.bench_kernels [calls] [seed]
+# Exits with 1 on a disagreement. Only MicroPython's unix port compiles the
+# native kernels to machine code - CPython checks the two copies of their
+# source agree and times the same code twice. tim_cb is run on the machine
+# stand-ins (hardware/headless/fake_machine.py), played by PwmGameAudio and
+# fired by its timer - where they don't install it is skipped
+import sys
+import random
+
+from profiler import ticks_us, ticks_diff
+from hardware.headless.game_engine import GameEngine
+from games.duel.ufos import Ufo, UFO_TYPES_COUNT
+from games.duel import sound
+from games.duel import kernels_python
+from accel import MICROPYTHON
+
+try:
+    from games.duel import kernels_native
+except SyntaxError as e:
+    # A port without the native emitter
+    print("native kernels unavailable:", e)
+    kernels_native = None
+
+FIELD_START = 6
+FIELD_END = 122
+UFOS = 8
+MOVE_STEPS = 400
+# Random melodies played into each other - (octave, note, beats) notes
+MELODIES = 40
+MAX_MELODY_NOTES = 8
+MAX_NOTE_BEATS = 4
+
+
+def random_rect():
+    x1 = random.randint(-10, 130)
+    y1 = random.randint(-10, 70)
+    return (x1, y1, x1 + random.randint(0, 12), y1 + random.randint(0, 12))
+
+
+def make_ufos(engine, seed: int):
+    # The same UFOs for every call with the seed - some captured
+    random.seed(seed)
+    ufos = []
+    for i in range(UFOS):
+        ufo = Ufo(engine.device, FIELD_START, FIELD_END, 0)
+        ufo.reset(
+            FIELD_START,
+            FIELD_END,
+            random.randint(8, 56),
+            random.randrange(UFO_TYPES_COUNT),
+            1 if random.random() < 0.5 else -1,
+        )
+        if i % 4 == 3:
+            ufo.set_captured()
+        ufos.append(ufo)
+    return ufos
+
+
+def ufo_state(ufo):
+    return (ufo.x, ufo.y, ufo.fx, ufo.dead)
+
+
+def check_parity(engine, seed: int):
+    # Every disagreement found - empty when they agree
+    failures = []
+    python_ufos = make_ufos(engine, seed)
+    native_ufos = make_ufos(engine, seed)
+    for step in range(MOVE_STEPS):
+        for python_ufo, native_ufo in zip(python_ufos, native_ufos):
+            kernels_python.ufo_move(python_ufo)
+            kernels_native.ufo_move(native_ufo)
+            if ufo_state(python_ufo) != ufo_state(native_ufo):
+                failures.append(
+                    "ufo_move step {}: {} != {}".format(
+                        step, ufo_state(python_ufo), ufo_state(native_ufo)
+                    )
+                )
+        engine.time.tick(engine.fps)
+
+    ufos = make_ufos(engine, seed)
+    ufos[0].dead = True
+    for _ in range(MOVE_STEPS):
+        rect = random_rect()
+        for ufo in ufos:
+            expected = kernels_python.ufo_check_hit(ufo, rect)
+            if kernels_native.ufo_check_hit(ufo, rect) != expected:
+                failures.append("ufo_check_hit {} {}".format(ufo_state(ufo), rect))
+        x1, y1, x2, y2 = random_rect()
+        expected = kernels_python.rect_hit(x1, y1, x2, y2, rect)
+        if kernels_native.rect_hit(x1, y1, x2, y2, rect) != expected:
+            failures.append("rect_hit {} {}".format((x1, y1, x2, y2), rect))
+    return failures
+
+
+def random_melody():
+    # Octave 0 is a rest. Notes last a beat or more, as in the games
+    return [
+        (
+            random.randint(0, 7),
+            random.randrange(12),
+            random.randint(1, MAX_NOTE_BEATS),
+        )
+        for _ in range(random.randint(1, MAX_MELODY_NOTES))
+    ]
+
+
+def melody_beats(audio, melody):
+    # The frequency to sound each beat - 0 for silence
+    beats = []
+    for octave, note, note_beats in melody:
+        beats.extend([audio.note_to_freq(octave, note)] * note_beats)
+    return beats
+
+
+def check_tim_cb(seed: int):
+    # Plays melodies - alone, interrupting one another and queued behind
+    # one that can't be interrupted - and compares what the speaker sounds
+    # each beat with the notes. None when the stand-ins don't install
+    try:
+        from hardware.headless import fake_machine
+
+        fake_machine.install()
+        from hardware.esp32 import game_engine
+    except Exception as e:
+        print("tim_cb not checked:", e)
+        return None
+
+    audio = game_engine.PwmGameAudio()
+    volume_duty = game_engine.pwm_volume_duty
+
+    def play_beats(beats: int):
+        pwm = game_engine.speaker_pwm
+        played = []
+        for _ in range(beats):
+            game_engine.tim0.fire()
+            duty = pwm.duty_u16()
+            if duty == 0:
+                played.append(0)
+            elif duty == volume_duty:
+                played.append(pwm.freq())
+            else:
+                played.append(-duty)
+        return played
+
+    random.seed(seed)
+    failures = []
+    melodies = [
+        sound.INTRO_MELODY,
+        sound.SHOOT_MELODY,
+        sound.HIT_MELODY,
+        sound.CAPTURE_UFO_MELODY,
+    ]
+    melodies.extend(random_melody() for _ in range(MELODIES))
+    for i, melody in enumerate(melodies):
+        first = audio.load_melody(melody)
+        first_beats = melody_beats(audio, melody)
+        second_melody = random_melody()
+        second = audio.load_melody(second_melody)
+        second_beats = melody_beats(audio, second_melody)
+        cut = random.randrange(len(first_beats))
+        for case, interruptable, expected in (
+            ("alone", True, first_beats + [0]),
+            ("interrupted", True, first_beats[:cut] + second_beats + [0]),
+            ("queued", False, first_beats + second_beats + [0]),
+        ):
+            audio.play(first, interruptable)
+            played = play_beats(cut)
+            if case != "alone":
+                audio.play(second)
+            played += play_beats(len(expected) - cut)
+            if played != expected:
+                failures.append(
+                    "tim_cb melody {} {}: {} != {}".format(i, case, played, expected)
+                )
+    audio.unload_melodies()
+    game_engine.stop_audio_timer()
+    return failures
+
+
+def time_kernels(kernels, engine, calls: int, seed: int):
+    # us per call of each kernel
+    ufos = make_ufos(engine, seed)
+    ufo_move = kernels.ufo_move
+    ufo_check_hit = kernels.ufo_check_hit
+    rect_hit = kernels.rect_hit
+    rect = (60, 28, 64, 36)
+    ufo = ufos[0]
+    results = {}
+
+    start_us = ticks_us()
+    for _ in range(calls):
+        ufo_move(ufo)
+    results["ufo_move"] = ticks_diff(ticks_us(), start_us) / calls
+
+    start_us = ticks_us()
+    for _ in range(calls):
+        ufo_check_hit(ufo, rect)
+    results["ufo_check_hit"] = ticks_diff(ticks_us(), start_us) / calls
+
+    start_us = ticks_us()
+    for _ in range(calls):
+        rect_hit(40, 50, 80, 56, rect)
+    results["rect_hit"] = ticks_diff(ticks_us(), start_us) / calls
+    return results
+
+
+def main(calls: int, seed: int):
+    engine = GameEngine()
+    failures = []
+    if kernels_native is not None:
+        failures = check_parity(engine, seed)
+        for failure in failures[:10]:
+            print("MISMATCH", failure)
+        print(
+            "parity{}: {}".format(
+                "" if MICROPYTHON else " (source only, not native off MicroPython)",
+                "{} mismatches".format(len(failures)) if failures else "ok",
+            )
+        )
+
+    tim_cb_failures = check_tim_cb(seed)
+    if tim_cb_failures is not None:
+        for failure in tim_cb_failures[:10]:
+            print("MISMATCH", failure)
+        print(
+            "tim_cb: {}".format(
+                "{} mismatches".format(len(tim_cb_failures))
+                if tim_cb_failures
+                else "ok"
+            )
+        )
+        failures += tim_cb_failures
+
+    python_us = time_kernels(kernels_python, engine, calls, seed)
+    native_us = (
+        time_kernels(kernels_native, engine, calls, seed)
+        if kernels_native is not None
+        else None
+    )
+    print("{:<16}{:>12}{:>12}{:>9}".format("kernel", "python us", "native us", "x"))
+    for name in ("ufo_move", "ufo_check_hit", "rect_hit"):
+        if native_us is None:
+            print("{:<16}{:>12.3f}{:>12}{:>9}".format(name, python_us[name], "-", "-"))
+        else:
+            print(
+                "{:<16}{:>12.3f}{:>12.3f}{:>9.2f}".format(
+                    name,
+                    python_us[name],
+                    native_us[name],
+                    python_us[name] / native_us[name] if native_us[name] else 0,
+                )
+            )
+    return not failures
+
+
+if __name__ == "__main__":
+    ok = main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 0,
+    )
+    if not ok:
+        sys.exit(1)
@@ -0,0 +1,62 @@
+# Counts the SPI traffic of SSD1306_SPI frames on the recording bus of
+# hardware/headless/fake_machine.py - bus set ups, chip select transactions
+# and bytes for whole and partial frames. Run from the repo root:
+#   python -m tools.bench_ssd1306_spi [frames]
+import sys
+from time import perf_counter_ns
+
+from hardware.headless import fake_machine
+
+fake_machine.install()
+
+from hardware.esp32.ssd1306 import SSD1306_SPI
+
+
+def report(name, frames, spi, cs, elapsed_us):
+    # Every transaction drives chip select low and back high
+    print(
+        "{} inits/frame:{} transactions/frame:{} writes/frame:{} "
+        "bytes/frame:{} wire us/frame:{:.1f} us/frame:{}".format(
+            name,
+            spi.inits / frames,
+            cs.changes / 2 / frames,
+            spi.transactions / frames,
+            spi.bytes / frames,
+            spi.wire_us / frames,
+            elapsed_us / frames,
+        )
+    )
+
+
+def bench(frames: int, shared: bool):
+    spi = fake_machine.SPI()
+    cs = fake_machine.Pin(5)
+    display = SSD1306_SPI(
+        128, 64, spi, fake_machine.Pin(16), fake_machine.Pin(17), cs, shared=shared
+    )
+    bands = display.pages
+    # A duel frame - a ship and a UFO moved
+    dirty_x0 = [display.width] * bands
+    dirty_x1 = [-1] * bands
+    dirty_x0[1] = dirty_x0[6] = 40
+    dirty_x1[1] = dirty_x1[6] = 71
+
+    label = "shared" if shared else "own"
+    for name, frame in (
+        ("show", display.show),
+        ("show_bands", lambda: display.show_bands(dirty_x0, dirty_x1)),
+    ):
+        spi.reset()
+        cs.changes = 0
+        start_ns = perf_counter_ns()
+        for _ in range(frames):
+            display.contrast(255)
+            frame()
+        elapsed_us = (perf_counter_ns() - start_ns) // 1000
+        report(label + " " + name, frames, spi, cs, elapsed_us)
+
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    bench(frames, False)
+    bench(frames, True)
@@ -4,15 +4,30 @@ mpremote \
     + cp main.py :main.py\
     + cp game_logic.py :game_logic.py\
     + cp game_device.py :game_device.py\
+    + cp profiler.py :profiler.py\
+    + cp async_loop.py :async_loop.py\
+    + cp scene.py :scene.py\
+    + cp launcher.py :launcher.py\
+    + cp accel.py :accel.py\
     + cp -r hardware/esp32/game_engine.py :\
     + cp -r hardware/esp32/ssd1306.py :\
+    + cp -r hardware/esp32/sh1106.py :\
+    + cp -r hardware/esp32/async_engine.py :\
     + cp -r games/duel/bars.py :\
     + cp -r games/duel/bot_player.py :\
+    + cp -r games/duel/config.py :\
     + cp -r games/duel/env.py :\
+    + cp -r games/duel/fixed.py :\
     + cp -r games/duel/game.py :\
+    + cp -r games/duel/kernels.py :\
+    + cp -r games/duel/kernels_native.py :\
+    + cp -r games/duel/kernels_python.py :\
     + cp -r games/duel/missile.py :\
     + cp -r games/duel/player.py :\
+    + cp -r games/duel/pool.py :\
+    + cp -r games/duel/skill.py :\
     + cp -r games/duel/sound.py :\
+    + cp -r games/duel/targeting.py :\
     + cp -r games/duel/ufos.py :\
     + cp -r games/duel/assets :\
     + reset
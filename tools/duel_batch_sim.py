@@ -0,0 +1,594 @@
+# Plays thousands of headless bot vs bot duel rounds in lockstep with NumPy.
+# Every piece of per-match state (players, missiles, UFOs, bot controllers)
+# lives in arrays with one column per match, and each game tick advances all
+# matches at once with the same rules as Player.play/move, Ufo.move,
+# GameLogic.hit_player/hit_ufo and ComputerController.play.
+# Meant for parameter sweeps - use tools.duel_tournament for exact rounds.
+# Run from the repo root:
+#   python -m tools.duel_batch_sim --rounds 2000
+import argparse
+import json
+import time
+
+import numpy as np
+
+from game_device import load_sprite_bytes
+from games.duel.env import GAME_ROOT_DIR
+from games.duel.fixed import FP_SHIFT, FP_ONE, FP_HALF, to_fp
+from games.duel.game import (
+    FIELD_WIDTH,
+    MAX_UFOS_IN_GAME,
+)
+from games.duel.player import (
+    PLAYER_BASE_POWER_POINTS,
+    PLAYER_BASE_LENGTH_PX,
+    PLAYER_MIN_BASE_LENGTH_PX,
+    PST_INIT,
+    PST_DEFENSIVE,
+    PST_STOPPED,
+    PST_CHARGING,
+    PST_FIRING,
+    PST_EXPLODED,
+)
+from games.duel.missile import DEFAULT_MISSILE_BLAST_RADIUS
+from games.duel.config import config
+from games.duel.ufos import (
+    UfoTypes,
+    UFO_TYPES_COUNT,
+    UFO_TYPES_CONFIG,
+    UFO_TYPES_CUMM_PROBS,
+    UFO_CONFIG_SPEED,
+    UFO_CONFIG_TTL,
+    UFO_CONFIG_WOBBLE_AMPLITUDE,
+    UFO_CONFIG_WOBBLE_PERIOD,
+    WOBBLE_LUT,
+    WOBBLE_LUT_SIZE,
+)
+from games.duel.bot_player import (
+    _MAX_IDLE_TIME_MS,
+    _STATE_IDLE,
+    _STATE_SHOOTING,
+    _STATE_EVADING,
+)
+from games.duel.targeting import SHOT_SETUP_TICKS
+from games.duel.simulation import (
+    ROUND_WINNER_NONE,
+    ROUND_WINNER_TOP,
+    ROUND_WINNER_BOTTOM,
+)
+from tools.duel_tournament import LEVELS, summarize, print_summary
+
+SCREEN_WIDTH = 128
+SCREEN_HEIGHT = 64
+FPS = 24
+# Same tick length as the headless engine's simulated clock
+TICK_MS = 1000 // FPS
+
+FIELD_START = (SCREEN_WIDTH - FIELD_WIDTH) // 2
+FIELD_END = SCREEN_WIDTH - FIELD_START
+UFO_SIZE = 8
+UFO_HALF_SIZE = UFO_SIZE // 2
+UFO_SPAWN_Y = SCREEN_HEIGHT // 2
+BLAST_RADIUS = DEFAULT_MISSILE_BLAST_RADIUS
+PLAYER_HEIGHT = load_sprite_bytes(GAME_ROOT_DIR + "/assets/ship-hull.pbm")[2]
+
+# Player rows - the bot player plays the top side, the demo bot the bottom one
+TOP = 0
+BOTTOM = 1
+PLAYER_Y = np.array([0, SCREEN_HEIGHT - 1])
+PLAYER_DIRECTION = np.array([1, -1])
+
+NO_UFO = -1
+NO_STATE = -1
+
+UFO_CUMM_PROBS = np.array([prob for _, prob in UFO_TYPES_CUMM_PROBS])
+UFO_FVX = np.array([to_fp(tc[UFO_CONFIG_SPEED]) for tc in UFO_TYPES_CONFIG])
+UFO_TTL_MS = np.array([tc[UFO_CONFIG_TTL] for tc in UFO_TYPES_CONFIG])
+UFO_WOBBLE_AMPLITUDE = np.array(
+    [tc[UFO_CONFIG_WOBBLE_AMPLITUDE] for tc in UFO_TYPES_CONFIG]
+)
+UFO_WOBBLE_PERIOD = np.array([tc[UFO_CONFIG_WOBBLE_PERIOD] for tc in UFO_TYPES_CONFIG])
+WOBBLE = np.array(WOBBLE_LUT)
+
+# Arrays holding one column (last axis) per match - compacted together
+MATCH_ARRAYS = (
+    "match_ids",
+    "power",
+    "width",
+    "charge_time_fp",
+    "fx",
+    "fvx",
+    "state",
+    "state_ticks",
+    "moved_after_shot",
+    "missile",
+    "missile_x",
+    "missile_fy",
+    "missile_fvy",
+    "ufo_type",
+    "ufo_captured_ms",
+    "ufo_dead",
+    "ufos",
+    "ufos_type",
+    "ufos_fx",
+    "ufos_fvx",
+    "ufos_y",
+    "last_ufo_spawn_ms",
+    "bot_state",
+    "bot_state_start_ms",
+    "bot_next_state",
+    "bot_response_started_ms",
+    "vision",
+    "base_perplexity",
+    "perplexity_offset",
+    "response_ms",
+    "response_ticks",
+    "ufo_hits",
+)
+
+
+class BatchDuel:
+    def __init__(self, top_levels, bottom_levels, seed: int = 0):
+        # One match per entry of top_levels/bottom_levels. Balance constants
+        # are taken from the game config as it is now
+        self.charge_time_per_power_fp = to_fp(
+            config.charge_to_fire_wait_per_power_game_ticks
+        )
+        self.missile_speed = config.base_missile_speed
+        self.ufo_spawn_chance = config.ufo_spawn_chance
+        self.ufo_min_time_between_spawns_ms = config.ufo_min_time_between_spawns_ms
+        self.rng = np.random.default_rng(seed)
+        levels = np.array([top_levels, bottom_levels])
+        count = levels.shape[1]
+        self.count = count
+        self.levels = levels
+        self.tick = 0
+        self.match_ids = np.arange(count)
+
+        # Players - shape (2, matches)
+        shape = (2, count)
+        self.power = np.full(shape, PLAYER_BASE_POWER_POINTS)
+        self.width = np.zeros(shape, dtype=np.int64)
+        self.charge_time_fp = np.zeros(shape, dtype=np.int64)
+        self.update_power()
+        self.fx = np.full(shape, (FIELD_WIDTH // 2) << FP_SHIFT)
+        self.fvx = np.repeat(
+            (to_fp(config.player_initial_speed_px_f) * PLAYER_DIRECTION)[:, None],
+            count,
+            1,
+        )
+        self.state = np.full(shape, PST_INIT)
+        self.state_ticks = np.zeros(shape, dtype=np.int64)
+        self.moved_after_shot = np.ones(shape, dtype=bool)
+        self.missile = np.zeros(shape, dtype=bool)
+        self.missile_x = np.zeros(shape, dtype=np.int64)
+        self.missile_fy = np.zeros(shape, dtype=np.int64)
+        self.missile_fvy = np.zeros(shape, dtype=np.int64)
+        # Captured UFO
+        self.ufo_type = np.full(shape, NO_UFO)
+        self.ufo_captured_ms = np.zeros(shape, dtype=np.int64)
+        self.ufo_dead = np.zeros(shape, dtype=bool)
+
+        # Flying UFOs - shape (slots, matches)
+        ufo_shape = (MAX_UFOS_IN_GAME, count)
+        self.ufos = np.zeros(ufo_shape, dtype=bool)
+        self.ufos_type = np.zeros(ufo_shape, dtype=np.int64)
+        self.ufos_fx = np.zeros(ufo_shape, dtype=np.int64)
+        self.ufos_fvx = np.zeros(ufo_shape, dtype=np.int64)
+        self.ufos_y = np.full(ufo_shape, UFO_SPAWN_Y)
+        self.last_ufo_spawn_ms = np.zeros(count, dtype=np.int64)
+
+        # Bot controllers - one per player
+        self.bot_state = np.full(shape, _STATE_IDLE)
+        self.bot_state_start_ms = np.zeros(shape, dtype=np.int64)
+        self.bot_next_state = np.full(shape, NO_STATE)
+        self.bot_response_started_ms = np.zeros(shape, dtype=np.int64)
+        skills = np.array(config.skill_levels)[levels]
+        self.vision = skills[..., 0].copy()
+        self.response_ms = skills[..., 1].copy()
+        self.base_perplexity = skills[..., 2].copy()
+        self.perplexity_offset = self.base_perplexity - 1
+        # Only anticipating bots aim ahead - the tick length never changes here
+        self.response_ticks = skills[..., 3] * (self.response_ms // TICK_MS)
+
+        # Per match stats
+        self.ufo_hits = np.zeros((2, UFO_TYPES_COUNT, count), dtype=np.int64)
+        self.winners = np.full(count, ROUND_WINNER_NONE)
+        self.round_ticks = np.zeros(count, dtype=np.int64)
+        self.round_ufo_hits = np.zeros((2, UFO_TYPES_COUNT, count), dtype=np.int64)
+
+    def update_power(self):
+        self.width = np.maximum(
+            PLAYER_MIN_BASE_LENGTH_PX,
+            PLAYER_BASE_LENGTH_PX * self.power // PLAYER_BASE_POWER_POINTS,
+        )
+        self.charge_time_fp = self.power * self.charge_time_per_power_fp
+
+    def is_ufo_type(self, p, compare_type, to_type):
+        # ComputerController.is_ufo_type - a perplexed bot confuses types
+        return (compare_type != NO_UFO) & (
+            compare_type == (to_type + self.perplexity_offset[p]) % UFO_TYPES_COUNT
+        )
+
+    def bounce_fx(self, p, ticks):
+        # Sub-pixel x after `ticks` more Player.move calls. Bounces are
+        # modelled as mirror reflections - Player.move clamps to the edge -
+        # so this may be off by a single tick's movement after a bounce
+        half_width = self.width[p] // 2
+        limit_start = (FIELD_START + half_width) << FP_SHIFT
+        limit_end = (FIELD_END - half_width) << FP_SHIFT
+        span = limit_end - limit_start
+        fvx = np.where(self.ufo_type[p] == UfoTypes.SLOW, self.fvx[p] >> 2, self.fvx[p])
+        offset = np.mod(self.fx[p] - limit_start + fvx * ticks, np.maximum(2 * span, 1))
+        bounced = limit_start + np.where(offset <= span, offset, 2 * span - offset)
+        return np.where(self.state[p] == PST_DEFENSIVE, bounced, self.fx[p])
+
+    def bot_targets(self, p):
+        # TargetingSolver.prepare_shot plus on_target_player/on_target_ufo
+        o = 1 - p
+        response_ticks = self.response_ticks[p]
+        shot_x = np.where(
+            response_ticks > 0,
+            self.bounce_fx(p, response_ticks) >> FP_SHIFT,
+            self.fx[p] >> FP_SHIFT,
+        )
+        rapid = self.ufo_type[p] == UfoTypes.RAPID_FIRE
+        charge_time = np.where(
+            rapid, self.charge_time_fp[p] // 3, self.charge_time_fp[p]
+        )
+        charge_ticks = (charge_time + FP_ONE - 1) >> FP_SHIFT
+        fire_ticks = response_ticks + SHOT_SETUP_TICKS + charge_ticks
+        speed = np.where(rapid, self.missile_speed * 2, self.missile_speed)
+        vision = self.vision[p]
+
+        distance = min(abs(PLAYER_Y[o] - PLAYER_Y[p]), SCREEN_HEIGHT)
+        hit_ticks = fire_ticks + (distance + speed - 1) // speed
+        target_x = (self.bounce_fx(o, hit_ticks) >> FP_SHIFT) + vision
+        on_target = np.abs(shot_x - target_x) < 6
+
+        for slot in range(MAX_UFOS_IN_GAME):
+            ufo_type = self.ufos_type[slot]
+            wanted = (
+                self.is_ufo_type(p, ufo_type, UfoTypes.POWER)
+                | self.is_ufo_type(p, ufo_type, UfoTypes.RAPID_FIRE)
+                | self.is_ufo_type(p, ufo_type, UfoTypes.SHIELD)
+            )
+            distance = np.minimum(
+                np.abs(self.ufos_y[slot] - PLAYER_Y[p]), SCREEN_HEIGHT
+            )
+            hit_ticks = fire_ticks + (distance + speed - 1) // speed
+            target_x = (
+                self.ufos_fx[slot] + self.ufos_fvx[slot] * hit_ticks
+            ) >> FP_SHIFT
+            in_field = (target_x >= FIELD_START) & (target_x <= FIELD_END - UFO_SIZE)
+            on_target |= (
+                self.ufos[slot]
+                & wanted
+                & in_field
+                & (np.abs(shot_x - (target_x + vision)) < 2)
+            )
+        return on_target
+
+    def bot_play(self, p, now):
+        # ComputerController.play - returns the button state for the player
+        o = 1 - p
+        state = self.bot_state[p]
+        next_state = state.copy()
+        other_missile = self.missile[o]
+        self_ufo_type = self.ufo_type[p]
+        has_missile = self.missile[p]
+        free = self.bot_next_state[p] == NO_STATE
+
+        idle = free & (state == _STATE_IDLE)
+        threat = (
+            idle & other_missile & ~self.is_ufo_type(p, self_ufo_type, UfoTypes.SHIELD)
+        )
+        next_state[threat] = _STATE_EVADING
+        idle &= ~threat
+        bored = idle & (now - self.bot_state_start_ms[p] > _MAX_IDLE_TIME_MS)
+        next_state[bored] = _STATE_SHOOTING
+        idle &= ~bored
+        if idle.any():
+            next_state[idle & self.bot_targets(p)] = _STATE_SHOOTING
+
+        shooting = free & (state == _STATE_SHOOTING)
+        shot = (
+            shooting
+            & has_missile
+            & ~self.is_ufo_type(p, self_ufo_type, UfoTypes.RAPID_FIRE)
+        )
+        # update_dynamic_skills after every shot
+        self.perplexity_offset[p] = np.where(
+            shot, now % self.base_perplexity[p], self.perplexity_offset[p]
+        )
+        self.vision[p] = np.where(shot, -self.vision[p], self.vision[p])
+        next_state[shot] = _STATE_IDLE
+        # The controllers never record their last shot - so "recently" is
+        # measured from the start of the round
+        give_up = shooting & ~has_missile & other_missile & (now < 1500)
+        next_state[give_up] = _STATE_EVADING
+
+        evading = free & (state == _STATE_EVADING)
+        next_state[evading & ~other_missile] = _STATE_IDLE
+
+        # Response time
+        responding = self.response_ms[p] > 0
+        waited = (
+            responding
+            & ~free
+            & (now - self.bot_response_started_ms[p] > self.response_ms[p])
+        )
+        next_state[waited] = self.bot_next_state[p][waited]
+        self.bot_next_state[p][waited] = NO_STATE
+        wait = responding & free & (next_state != state)
+        self.bot_next_state[p][wait] = next_state[wait]
+        next_state[wait] = state[wait]
+        self.bot_response_started_ms[p][wait] = now
+
+        self.bot_state_start_ms[p][next_state != state] = now
+        self.bot_state[p] = next_state
+
+        # Act
+        half_hit_width = self.width[p] // 2 + BLAST_RADIUS
+        self_x = self.fx[p] >> FP_SHIFT
+        other_missile_x = self.missile_x[o] + self.vision[p]
+        safe = (other_missile_x < self_x - half_hit_width) | (
+            other_missile_x > self_x + half_hit_width
+        )
+        return (next_state == _STATE_SHOOTING) | (
+            (next_state == _STATE_EVADING) & other_missile & safe
+        )
+
+    def player_play(self, p, button):
+        # Player.play
+        state = self.state[p]
+        self.state_ticks[p] += 1
+        rapid = self.ufo_type[p] == UfoTypes.RAPID_FIRE
+        next_state = np.full(self.count, PST_DEFENSIVE)
+
+        stop = button & ((state == PST_DEFENSIVE) | (state == PST_FIRING))
+        next_state[stop] = PST_STOPPED
+        stopped = button & (state == PST_STOPPED)
+        can_charge = ~self.missile[p] & (self.moved_after_shot[p] | rapid)
+        next_state[stopped] = np.where(can_charge, PST_CHARGING, PST_STOPPED)[stopped]
+        charging = button & (state == PST_CHARGING)
+        charge_time = np.maximum(
+            np.where(rapid, self.charge_time_fp[p] // 3, self.charge_time_fp[p]), 1
+        )
+        charged = (self.state_ticks[p] << (FP_SHIFT * 2)) // charge_time >= FP_ONE
+        next_state[charging] = np.where(charged, PST_FIRING, PST_CHARGING)[charging]
+        self.moved_after_shot[p] |= ~button
+        next_state[self.power[p] == 0] = PST_EXPLODED
+
+        self.state_ticks[p][next_state != state] = 0
+        self.state[p] = next_state
+
+        firing = next_state == PST_FIRING
+        self.moved_after_shot[p] &= ~firing
+        self.missile[p] |= firing
+        self.missile_x[p][firing] = (self.fx[p] >> FP_SHIFT)[firing]
+        self.missile_fy[p][firing] = PLAYER_Y[p] << FP_SHIFT
+        speed = np.where(rapid, self.missile_speed * 2, self.missile_speed)
+        self.missile_fvy[p][firing] = (to_fp(1) * speed * PLAYER_DIRECTION[p])[firing]
+
+        # Keep only live captured UFOs
+        released = self.ufo_dead[p] & (self.ufo_type[p] != NO_UFO)
+        self.ufo_type[p][released] = NO_UFO
+
+    def player_move(self, p, now):
+        # Player.move - exploded players freeze along with their missile/UFO
+        alive = self.state[p] != PST_EXPLODED
+        defensive = self.state[p] == PST_DEFENSIVE
+        half_width = self.width[p] // 2
+        limit_start = (FIELD_START + half_width) << FP_SHIFT
+        limit_end = (FIELD_END - half_width) << FP_SHIFT
+        fvx = self.fvx[p]
+        speed = np.where(self.ufo_type[p] == UfoTypes.SLOW, fvx >> 2, fvx)
+        fx = np.where(defensive, self.fx[p] + speed, self.fx[p])
+        at_start = defensive & (fx <= limit_start)
+        at_end = defensive & (fx >= limit_end)
+        self.fx[p] = np.where(at_start, limit_start, np.where(at_end, limit_end, fx))
+        self.fvx[p] = np.where(at_start | at_end, -fvx, fvx)
+
+        moving = self.missile[p] & alive
+        self.missile_fy[p] += np.where(moving, self.missile_fvy[p], 0)
+        missile_y = self.missile_fy[p] >> FP_SHIFT
+        self.missile[p] &= ~(moving & ((missile_y <= 0) | (missile_y >= SCREEN_HEIGHT)))
+
+        captured = alive & (self.ufo_type[p] != NO_UFO)
+        expired = now - self.ufo_captured_ms[p] > UFO_TTL_MS[self.ufo_type[p]]
+        self.ufo_dead[p] |= captured & expired
+
+    def missile_rect(self, shooter):
+        x = self.missile_x[shooter]
+        y = self.missile_fy[shooter] >> FP_SHIFT
+        return (x - BLAST_RADIUS, y - BLAST_RADIUS, x + BLAST_RADIUS, y + BLAST_RADIUS)
+
+    def hit_player(self, shooter, target):
+        # GameLogic.hit_player with Player.check_hit
+        x1, y1, x2, y2 = self.missile_rect(shooter)
+        player_x = self.fx[target] >> FP_SHIFT
+        half_width = self.width[target] // 2
+        if target == TOP:
+            player_y1, player_y2 = 0, PLAYER_HEIGHT
+        else:
+            player_y1, player_y2 = PLAYER_Y[target] - PLAYER_HEIGHT, PLAYER_Y[target]
+        hit = (
+            self.missile[shooter]
+            & (self.state[target] != PST_EXPLODED)
+            & (self.ufo_type[target] != UfoTypes.SHIELD)
+            & (y2 >= player_y1)
+            & (y1 <= player_y2)
+            & (x2 >= player_x - half_width)
+            & (x1 <= player_x + half_width)
+        )
+        self.power[target] -= hit
+        self.missile[shooter] &= ~hit
+
+    def hit_ufo(self, shooter, slot, now):
+        # GameLogic.hit_ufo with Ufo.check_hit
+        x1, y1, x2, y2 = self.missile_rect(shooter)
+        ufo_x = self.ufos_fx[slot] >> FP_SHIFT
+        ufo_y = self.ufos_y[slot]
+        hit = (
+            self.missile[shooter]
+            & self.ufos[slot]
+            & (y2 >= ufo_y)
+            & (y1 <= ufo_y + UFO_SIZE)
+            & (x2 >= ufo_x - UFO_HALF_SIZE)
+            & (x1 <= ufo_x + UFO_HALF_SIZE)
+        )
+        if not hit.any():
+            return
+        ufo_type = self.ufos_type[slot]
+        power = ufo_type == UfoTypes.POWER
+        instant = hit & (power | (ufo_type == UfoTypes.DAMAGE))
+        captured = hit & ~instant
+        self.power[shooter] += np.where(instant, np.where(power, 1, -1), 0)
+        self.ufo_type[shooter] = np.where(
+            instant, NO_UFO, np.where(captured, ufo_type, self.ufo_type[shooter])
+        )
+        self.ufo_captured_ms[shooter][captured] = now
+        self.ufo_dead[shooter] &= ~captured
+        # Captured UFOs leave the field too
+        self.ufos[slot] &= ~hit
+        self.missile[shooter] &= ~hit
+        matches = np.nonzero(hit)[0]
+        self.ufo_hits[shooter, ufo_type[matches], matches] += 1
+
+    def spawn_ufos(self, now):
+        # GameLogic.spawn_ufos
+        ufo_count = self.ufos.sum(axis=0)
+        last_spawn = self.last_ufo_spawn_ms
+        eligible = (ufo_count < MAX_UFOS_IN_GAME) & (
+            (now - last_spawn > self.ufo_min_time_between_spawns_ms) | (last_spawn == 0)
+        )
+        spawn_prob = np.power(self.ufo_spawn_chance, ufo_count + 1)
+        spawn = eligible & (self.rng.random(self.count) < spawn_prob)
+        matches = np.nonzero(spawn)[0]
+        if len(matches) == 0:
+            return
+        # First free slot
+        slots = np.argmin(self.ufos, axis=0)[matches]
+        ufo_types = np.minimum(
+            np.searchsorted(UFO_CUMM_PROBS, self.rng.random(len(matches))),
+            UFO_TYPES_COUNT - 1,
+        )
+        direction = np.where(self.rng.random(len(matches)) < 0.5, 1, -1)
+        x = np.where(direction == 1, FIELD_START, FIELD_END - UFO_SIZE)
+        last_spawn[matches] = now
+        self.ufos[slots, matches] = True
+        self.ufos_type[slots, matches] = ufo_types
+        self.ufos_fx[slots, matches] = x << FP_SHIFT
+        self.ufos_fvx[slots, matches] = UFO_FVX[ufo_types] * direction
+        self.ufos_y[slots, matches] = UFO_SPAWN_Y
+
+    def move_ufos(self, slot, now):
+        # Ufo.move, the hits and the out of bounds check of GameLogic.move
+        ufos = self.ufos[slot]
+        fx = self.ufos_fx[slot] + np.where(ufos, self.ufos_fvx[slot], 0)
+        self.ufos_fx[slot] = fx
+        ufo_type = self.ufos_type[slot]
+        wobble = WOBBLE[(fx // UFO_WOBBLE_PERIOD[ufo_type]) % WOBBLE_LUT_SIZE]
+        self.ufos_y[slot] = UFO_SPAWN_Y + (
+            (UFO_WOBBLE_AMPLITUDE[ufo_type] * wobble + FP_HALF) >> FP_SHIFT
+        )
+        self.hit_ufo(BOTTOM, slot, now)
+        self.hit_ufo(TOP, slot, now)
+        x = fx >> FP_SHIFT
+        self.ufos[slot] &= (x >= FIELD_START) & (x <= FIELD_END - UFO_SIZE)
+
+    def finish_rounds(self):
+        # GameLogic.play ends the round once either player exploded
+        exploded = self.state == PST_EXPLODED
+        over = exploded[TOP] | exploded[BOTTOM]
+        if not over.any():
+            return
+        ids = self.match_ids[over]
+        self.winners[ids] = np.where(
+            exploded[TOP][over] & exploded[BOTTOM][over],
+            ROUND_WINNER_NONE,
+            np.where(exploded[TOP][over], ROUND_WINNER_BOTTOM, ROUND_WINNER_TOP),
+        )
+        self.round_ticks[ids] = self.tick + 1
+        self.round_ufo_hits[..., ids] = self.ufo_hits[..., over]
+        self.keep(~over)
+
+    def keep(self, mask):
+        # Drop finished matches - the remaining ticks only pay for live ones
+        for name in MATCH_ARRAYS:
+            setattr(self, name, getattr(self, name)[..., mask])
+        self.count = len(self.match_ids)
+
+    def step(self):
+        now = self.tick * TICK_MS
+        self.finish_rounds()
+        if self.count:
+            # Same order as GameLogic.play and GameLogic.move
+            for p in (BOTTOM, TOP):
+                self.player_play(p, self.bot_play(p, now))
+            self.spawn_ufos(now)
+            for p in (BOTTOM, TOP):
+                self.player_move(p, now)
+            self.hit_player(BOTTOM, TOP)
+            self.hit_player(TOP, BOTTOM)
+            for slot in range(MAX_UFOS_IN_GAME):
+                self.move_ufos(slot, now)
+            self.update_power()
+        self.tick += 1
+
+    def run(self, max_ticks: int):
+        while self.count and self.tick < max_ticks:
+            self.step()
+        # Rounds still going are draws
+        self.round_ticks[self.match_ids] = self.tick
+        self.round_ufo_hits[..., self.match_ids] = self.ufo_hits
+        self.keep(np.zeros(self.count, dtype=bool))
+
+    def results(self):
+        # Same shape as tools.duel_tournament.play_match results
+        top_levels, bottom_levels = self.levels
+        return [
+            (
+                int(top_levels[i]),
+                int(bottom_levels[i]),
+                int(self.winners[i]),
+                int(self.round_ticks[i]),
+                self.round_ufo_hits[TOP, :, i].tolist(),
+                self.round_ufo_hits[BOTTOM, :, i].tolist(),
+            )
+            for i in range(len(self.winners))
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duel bot vs bot batch simulation")
+    parser.add_argument("--rounds", type=int, default=1000, help="rounds per pair")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args()
+
+    pairs = [(a, b) for a in LEVELS for b in LEVELS]
+    top_levels = np.repeat([a for a, _ in pairs], args.rounds)
+    bottom_levels = np.repeat([b for _, b in pairs], args.rounds)
+    batch = BatchDuel(top_levels, bottom_levels, args.seed)
+
+    start = time.time()
+    batch.run(args.max_ticks)
+    elapsed = time.time() - start
+    results = batch.results()
+    summary = summarize(results)
+
+    print_summary(summary)
+    print(
+        f"{len(results)} rounds in lockstep in {elapsed:.1f}s"
+        f" ({len(results) / elapsed:.1f} rounds/s, {batch.tick} ticks)"
+    )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# Explores duel balance constants (games/duel/config.py) with headless bot vs
+# bot rounds on all cores and ranks the parameter points by how close they get
+# to a target win rate and round length. Results are cached on disk per
+# parameter point, so re-runs only play the new points - delete the cache
+# directory after changing the game rules.
+# Parameters are config names, with indices for nested values, e.g.:
+#   python -m tools.duel_sweep --param ufo_spawn_chance=0.03,0.05,0.08 \
+#       --param base_missile_speed=2,3,4
+#   python -m tools.duel_sweep --search random --samples 30 \
+#       --param ufo_spawn_chance=0.02:0.1 --param skill_levels.3.1=100:400
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import time
+
+from games.duel.bot_player import BOT_SKILL_LEVEL_NAMES, BotSkillLevels
+from games.duel.config import config
+from games.duel.simulation import (
+    run_bot_round,
+    ROUND_WINNER_TOP,
+    ROUND_WINNER_BOTTOM,
+)
+from hardware.headless.game_engine import GameEngine
+from tools.duel_tournament import percentile, run_jobs
+
+DEFAULT_CACHE_DIR = ".duel_sweep_cache"
+
+
+def parse_value(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_param(spec: str):
+    # name=v1,v2,... (a list of values) or name=low:high (a range)
+    name, _, values = spec.partition("=")
+    if not values:
+        raise argparse.ArgumentTypeError(f"expected name=values, got {spec}")
+    if ":" in values:
+        low, high = values.split(":")
+        return name, (parse_value(low), parse_value(high))
+    return name, [parse_value(value) for value in values.split(",")]
+
+
+def replace_item(container, indices, value):
+    # Copy of a (nested) list/tuple with a single item replaced
+    index = int(indices[0])
+    items = list(container)
+    if len(indices) == 1:
+        items[index] = value
+    else:
+        items[index] = replace_item(items[index], indices[1:], value)
+    return type(container)(items)
+
+
+def apply_overrides(overrides):
+    config.reset()
+    for path, value in overrides.items():
+        name, *indices = path.split(".")
+        if indices:
+            value = replace_item(getattr(config, name), indices, value)
+        config.update(**{name: value})
+
+
+def grid_points(params):
+    for name, values in params:
+        if isinstance(values, tuple):
+            raise SystemExit(f"{name}: grid search needs a list of values")
+    names = [name for name, _ in params]
+    for values in itertools.product(*(values for _, values in params)):
+        yield dict(zip(names, values))
+
+
+def random_points(params, samples: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(samples):
+        point = {}
+        for name, values in params:
+            if isinstance(values, list):
+                point[name] = rng.choice(values)
+            elif isinstance(values[0], int) and isinstance(values[1], int):
+                point[name] = rng.randint(*values)
+            else:
+                point[name] = round(rng.uniform(*values), 4)
+        yield point
+
+
+def point_key(overrides, args):
+    # Everything the outcome depends on - except the game code itself
+    key = {
+        "overrides": overrides,
+        "top": args.top,
+        "bottom": args.bottom,
+        "rounds": args.rounds,
+        "seed": args.seed,
+        "max_ticks": args.max_ticks,
+    }
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def load_cached(cache_dir: str, key: str):
+    try:
+        with open(os.path.join(cache_dir, key + ".json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def store_cached(cache_dir: str, key: str, result):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, key + ".json")
+    # Write then rename - an interrupted run never leaves a truncated entry
+    with open(path + ".tmp", "w") as f:
+        json.dump(result, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def play_sweep_round(job):
+    point_index, overrides, top_level, bottom_level, seed, max_ticks = job
+    apply_overrides(overrides)
+    random.seed(seed)
+    winner, ticks, _, _ = run_bot_round(top_level, bottom_level, max_ticks)
+    return (point_index, winner, ticks)
+
+
+def summarize_point(overrides, outcomes):
+    rounds = len(outcomes)
+    ticks = sorted(ticks for _, ticks in outcomes)
+    top_wins = sum(1 for winner, _ in outcomes if winner == ROUND_WINNER_TOP)
+    bottom_wins = sum(1 for winner, _ in outcomes if winner == ROUND_WINNER_BOTTOM)
+    return {
+        "overrides": overrides,
+        "top_win_rate": top_wins / rounds,
+        "bottom_win_rate": bottom_wins / rounds,
+        "draw_rate": (rounds - top_wins - bottom_wins) / rounds,
+        "mean_ticks": sum(ticks) / rounds,
+        "p50_ticks": percentile(ticks, 50),
+    }
+
+
+def score(result, target_win_rate: float, target_ticks: int):
+    # Lower is better - win rate and relative round length errors weigh the same
+    return abs(result["top_win_rate"] - target_win_rate) + (
+        abs(result["mean_ticks"] - target_ticks) / target_ticks
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duel balance parameter sweep")
+    parser.add_argument(
+        "--param",
+        type=parse_param,
+        action="append",
+        required=True,
+        help="name=v1,v2,... or name=low:high (random search only)",
+    )
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--samples", type=int, default=20, help="random points")
+    parser.add_argument("--top", type=int, default=BotSkillLevels.HARD)
+    parser.add_argument("--bottom", type=int, default=BotSkillLevels.NORMAL)
+    parser.add_argument("--rounds", type=int, default=50, help="rounds per point")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--target-win-rate", type=float, default=0.6)
+    parser.add_argument("--target-round-s", type=float, default=60)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--show", type=int, default=10, help="best points shown")
+    parser.add_argument("--json", help="also write all results to this file")
+    args = parser.parse_args()
+
+    if args.search == "grid":
+        points = list(grid_points(args.param))
+    else:
+        points = list(random_points(args.param, args.samples, args.seed))
+    # Fail on unknown names before spending time on simulations
+    for overrides in points:
+        apply_overrides(overrides)
+    config.reset()
+
+    results = [None] * len(points)
+    keys = [point_key(overrides, args) for overrides in points]
+    jobs = []
+    for point_index, overrides in enumerate(points):
+        results[point_index] = load_cached(args.cache_dir, keys[point_index])
+        if results[point_index] is None:
+            # Every point plays the same seeds - differences come from the
+            # parameters rather than luck
+            for round_index in range(args.rounds):
+                jobs.append(
+                    (
+                        point_index,
+                        overrides,
+                        args.top,
+                        args.bottom,
+                        args.seed + round_index,
+                        args.max_ticks,
+                    )
+                )
+    cached_count = sum(1 for result in results if result is not None)
+    print(f"{len(points)} points, {cached_count} cached, {len(jobs)} rounds to play")
+
+    start = time.time()
+    if jobs:
+        outcomes = [[] for _ in points]
+        for point_index, winner, ticks in run_jobs(
+            jobs, args.workers, worker_fn=play_sweep_round
+        ):
+            outcomes[point_index].append((winner, ticks))
+        for point_index, overrides in enumerate(points):
+            if results[point_index] is None:
+                result = summarize_point(overrides, outcomes[point_index])
+                store_cached(args.cache_dir, keys[point_index], result)
+                results[point_index] = result
+    elapsed = time.time() - start
+
+    target_ticks = int(args.target_round_s * GameEngine().fps)
+    ranked = sorted(
+        results, key=lambda result: score(result, args.target_win_rate, target_ticks)
+    )
+    print(
+        f"{BOT_SKILL_LEVEL_NAMES[args.top]} (top) v"
+        f" {BOT_SKILL_LEVEL_NAMES[args.bottom]} (bottom) - target win rate"
+        f" {args.target_win_rate * 100:.0f}%, {target_ticks} ticks per round"
+    )
+    print(f"{'score':>7} {'win':>6} {'draw':>6} {'ticks':>7}  parameters")
+    for result in ranked[: args.show]:
+        print(
+            f"{score(result, args.target_win_rate, target_ticks):>7.3f}"
+            f" {result['top_win_rate'] * 100:>5.1f}%"
+            f" {result['draw_rate'] * 100:>5.1f}%"
+            f" {result['mean_ticks']:>7.0f}  {result['overrides']}"
+        )
+    print(f"{len(jobs)} rounds on {args.workers} workers in {elapsed:.1f}s")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(ranked, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# Plays headless bot vs bot duel rounds between every pair of skill levels
+# on all cores and reports win rates, round lengths and UFO hits.
+# Run from the repo root:
+#   python -m tools.duel_tournament --rounds 200 --workers 8
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from games.duel.bot_player import BOT_SKILL_LEVEL_NAMES, MAX_BOT_SKILL_LEVEL
+from games.duel.simulation import (
+    run_bot_round,
+    ROUND_WINNER_TOP,
+    ROUND_WINNER_BOTTOM,
+)
+from games.duel.ufos import UFO_TYPES_COUNT
+
+UFO_TYPE_NAMES = ["shield", "rapid", "power", "slow", "damage"]
+LEVELS = list(range(MAX_BOT_SKILL_LEVEL + 1))
+
+
+def silence_worker():
+    # The game logs every round - keep the workers quiet
+    sys.stdout = open(os.devnull, "w")
+
+
+def play_match(job):
+    top_level, bottom_level, seed, max_ticks = job
+    random.seed(seed)
+    winner, ticks, top_ufo_hits, bottom_ufo_hits = run_bot_round(
+        top_level, bottom_level, max_ticks
+    )
+    return (top_level, bottom_level, winner, ticks, top_ufo_hits, bottom_ufo_hits)
+
+
+def build_jobs(rounds_per_pair: int, seed: int, max_ticks: int):
+    # Every ordered pair - each level plays both the top and the bottom side.
+    # Seeds depend only on the job index so results do not depend on the
+    # number of workers
+    jobs = []
+    for top_level in LEVELS:
+        for bottom_level in LEVELS:
+            for _ in range(rounds_per_pair):
+                jobs.append((top_level, bottom_level, seed + len(jobs), max_ticks))
+    return jobs
+
+
+def run_jobs(jobs, workers: int, worker_fn=play_match):
+    # Small chunks keep all cores busy even though round lengths vary a lot
+    chunk_size = max(1, len(jobs) // (workers * 16))
+    with Pool(workers, initializer=silence_worker) as pool:
+        return list(pool.imap_unordered(worker_fn, jobs, chunk_size))
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, len(sorted_values) * pct // 100)]
+
+
+def summarize(results):
+    levels_count = len(LEVELS)
+    wins = [[0] * levels_count for _ in LEVELS]
+    games = [[0] * levels_count for _ in LEVELS]
+    draws = 0
+    round_ticks = [[[] for _ in LEVELS] for _ in LEVELS]
+    ufo_hits = [[0] * UFO_TYPES_COUNT for _ in LEVELS]
+    rounds_played = [0] * levels_count
+
+    for top_level, bottom_level, winner, ticks, top_hits, bottom_hits in results:
+        games[top_level][bottom_level] += 1
+        games[bottom_level][top_level] += 1
+        if winner == ROUND_WINNER_TOP:
+            wins[top_level][bottom_level] += 1
+        elif winner == ROUND_WINNER_BOTTOM:
+            wins[bottom_level][top_level] += 1
+        else:
+            draws += 1
+        round_ticks[top_level][bottom_level].append(ticks)
+        rounds_played[top_level] += 1
+        rounds_played[bottom_level] += 1
+        for ufo_type in range(UFO_TYPES_COUNT):
+            ufo_hits[top_level][ufo_type] += top_hits[ufo_type]
+            ufo_hits[bottom_level][ufo_type] += bottom_hits[ufo_type]
+
+    win_rates = [
+        [wins[a][b] / games[a][b] if games[a][b] else None for b in LEVELS]
+        for a in LEVELS
+    ]
+    round_lengths = {}
+    for a in LEVELS:
+        for b in LEVELS:
+            ticks = sorted(round_ticks[a][b])
+            round_lengths[f"{a}v{b}"] = {
+                "mean": sum(ticks) / len(ticks) if ticks else 0,
+                "p10": percentile(ticks, 10),
+                "p50": percentile(ticks, 50),
+                "p90": percentile(ticks, 90),
+            }
+    ufo_hits_per_round = [
+        [hits / rounds_played[level] if rounds_played[level] else 0 for hits in row]
+        for level, row in enumerate(ufo_hits)
+    ]
+    return {
+        "win_rates": win_rates,
+        "draws": draws,
+        "round_lengths": round_lengths,
+        "ufo_hits_per_round": ufo_hits_per_round,
+    }
+
+
+def print_summary(summary):
+    names = [BOT_SKILL_LEVEL_NAMES[level] for level in LEVELS]
+    print("Win rate (row vs column):")
+    print("        " + "".join(f"{name:>8}" for name in names))
+    for level, row in enumerate(summary["win_rates"]):
+        cells = "".join(
+            f"{rate * 100:>7.1f}%" if rate is not None else f"{'-':>8}" for rate in row
+        )
+        print(f"{names[level]:>8}{cells}")
+    print(f"Draws (max ticks reached): {summary['draws']}")
+
+    print("Round length in ticks (top v bottom: mean / p10 / p50 / p90):")
+    for a in LEVELS:
+        for b in LEVELS:
+            lengths = summary["round_lengths"][f"{a}v{b}"]
+            print(
+                f"  {names[a]:>6} v {names[b]:<6}"
+                f" {lengths['mean']:>8.0f} {lengths['p10']:>6}"
+                f" {lengths['p50']:>6} {lengths['p90']:>6}"
+            )
+
+    print("UFO hits per round:")
+    print("        " + "".join(f"{name:>8}" for name in UFO_TYPE_NAMES))
+    for level, row in enumerate(summary["ufo_hits_per_round"]):
+        print(f"{names[level]:>8}" + "".join(f"{hits:>8.2f}" for hits in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duel bot vs bot tournament")
+    parser.add_argument("--rounds", type=int, default=100, help="rounds per pair")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args()
+
+    jobs = build_jobs(args.rounds, args.seed, args.max_ticks)
+    start = time.time()
+    results = run_jobs(jobs, args.workers)
+    elapsed = time.time() - start
+    summary = summarize(results)
+
+    print_summary(summary)
+    print(
+        f"{len(jobs)} rounds on {args.workers} workers in {elapsed:.1f}s"
+        f" ({len(jobs) / elapsed:.1f} rounds/s)"
+    )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()